@@ -0,0 +1,188 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from matching import MatchEngine, Roster
+from store import Collection, Record, Store
+
+
+TOP_PERFORMERS = 3
+SKILLS_IN_DEMAND = 3
+TRAINING_CANDIDATES = 3
+# Composite used to rank top performers (quality is on a 0-5 scale)
+COMPLETION_WEIGHT = 0.4
+ON_TIME_WEIGHT = 0.4
+QUALITY_WEIGHT = 0.2
+
+
+def needs_rework(task: Record) -> bool:
+    """Supervisor flagged the work for retraining or rated its quality below 3"""
+    review = (task.get("feedback") or {}).get("supervisorFeedback") or {}
+    rating = review.get("qualityRating")
+    return bool(review.get("needsRetraining")) or (rating is not None and rating < 3)
+
+
+class PerformanceColumns:
+    """Performance records as per-employee vectors plus an employee x skill usage matrix"""
+
+    def __init__(self, records: List[Record], columns: Dict[str, int]):
+        n = len(records)
+        self.ids = [r.get("employeeId") or r.get("employee_id") for r in records]
+        self.completion = np.array([r.get("completionRate") or 0 for r in records], dtype=np.float64)
+        self.on_time = np.array([r.get("onTimeDeliveryRate") or 0 for r in records], dtype=np.float64)
+        self.quality = np.array([r.get("qualityScore") or 0 for r in records], dtype=np.float64)
+        self.completed = np.array([r.get("tasksCompleted") or 0 for r in records], dtype=np.float64)
+        self.usage = np.zeros((n, len(columns)), dtype=np.float64)
+        for row, record in enumerate(records):
+            for used in record.get("skillsUsed") or ():
+                col = columns.get(used.get("skillId"))
+                if col is not None:
+                    self.usage[row, col] = used.get("count") or 0
+
+
+# ---------------- Analytics Engine ----------------
+class AnalyticsEngine:
+    """
+    Workforce analytics and skill gaps derived from the live store.
+
+    Skill demand counts open (not completed) tasks requiring each skill and is
+    kept up to date by a task listener, so it never rescans the task list.
+    Supply and overall utilization (mean current workload) come from the
+    matching roster; per-skill utilization and top performers come from the
+    performance records. Results are cached on the versions of the
+    collections they read and only recomputed after one of them changes.
+    """
+
+    def __init__(self, store: Store, engine: MatchEngine):
+        self.store = store
+        self.engine = engine
+        self._demand: Counter = Counter()
+        self._rework = 0
+        # What each task adds: (skills it keeps in demand, needs rework)
+        self._contributions: Dict[Any, Tuple[Tuple[str, ...], bool]] = {}
+        self._performance: Optional[PerformanceColumns] = None
+        self._performance_version = -1
+        self._performance_roster: Optional[Roster] = None
+        self._cache: Dict[str, Any] = {}
+        self._cache_version: Tuple[int, ...] = ()
+        store.tasks.subscribe(self._on_task)
+        self.rebuild()
+
+    @staticmethod
+    def _contribution(task: Optional[Record]) -> Optional[Tuple[Tuple[str, ...], bool]]:
+        if task is None:
+            return None
+        open_skills = () if task.get("status") == "completed" else tuple(task.get("requiredSkills") or ())
+        return open_skills, needs_rework(task)
+
+    def _move(self, key: Any, task: Optional[Record]) -> None:
+        before = self._contributions.pop(key, None)
+        after = self._contribution(task)
+        if before is not None:
+            self._demand.subtract(before[0])
+            self._rework -= before[1]
+        if after is not None:
+            self._demand.update(after[0])
+            self._rework += after[1]
+            self._contributions[key] = after
+
+    def _on_task(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self.rebuild()
+        else:
+            self._move(key, new)
+
+    def rebuild(self) -> None:
+        """Recount demand and rework from every task"""
+        self._demand = Counter()
+        self._rework = 0
+        self._contributions = {}
+        tasks = self.store.tasks
+        for task in tasks.all():
+            self._move(tasks.key_of(task), task)
+
+    def version(self) -> Tuple[int, ...]:
+        """Versions of the collections the results are computed from"""
+        store = self.store
+        return store.tasks.version, store.users.version, store.skills.version, store.performance.version
+
+    def _performance_columns(self, roster: Roster) -> PerformanceColumns:
+        """Rebuilt after performance changes, or when a new roster renumbers the skill columns"""
+        version = self.store.performance.version
+        if self._performance is None or version != self._performance_version or roster is not self._performance_roster:
+            self._performance = PerformanceColumns(self.store.performance.all(), roster.columns)
+            self._performance_version = version
+            self._performance_roster = roster
+        return self._performance
+
+    def _compute(self) -> Dict[str, Any]:
+        roster = self.engine.roster()
+        perf = self._performance_columns(roster)
+        columns = roster.columns
+
+        demand = np.zeros(len(columns), dtype=np.int64)
+        for skill_id, count in self._demand.items():
+            col = columns.get(skill_id)
+            if col is not None and count > 0:
+                demand[col] = count
+        supply = roster.has.sum(axis=0)
+        gap = np.maximum(demand - supply, 0)
+        # Share of the work done by a skill's users that needed that skill
+        users_work = (perf.completed[:, None] * (perf.usage > 0)).sum(axis=0)
+        used = perf.usage.sum(axis=0)
+        utilization = np.minimum(np.divide(used * 100.0, users_work, out=np.zeros_like(used), where=users_work > 0), 100)
+
+        skill_gaps = []
+        for skill in self.store.skills.all():
+            col = columns.get(skill.get("id"))
+            skill_gaps.append({
+                "skillId": skill.get("id"),
+                "skillName": skill.get("name"),
+                "demand": int(demand[col]),
+                "supply": int(supply[col]),
+                "gap": int(gap[col]),
+                "utilization": int(np.floor(utilization[col] + 0.5)),
+            })
+
+        ranked = sorted(skill_gaps, key=lambda s: (-s["gap"], -s["demand"], s["skillId"]))
+        in_demand = [s["skillId"] for s in ranked[:SKILLS_IN_DEMAND] if s["demand"] > 0]
+
+        composite = perf.completion * COMPLETION_WEIGHT + perf.on_time * ON_TIME_WEIGHT + perf.quality * 20 * QUALITY_WEIGHT
+        top = np.lexsort((np.arange(len(composite)), -composite))[:TOP_PERFORMERS]
+
+        training = []
+        for skill_id in in_demand:
+            lacking = np.flatnonzero(~roster.has[:, columns[skill_id]])
+            # The least loaded employees have the most room to train
+            lacking = lacking[np.argsort(roster.workload[lacking], kind="stable")][:TRAINING_CANDIDATES]
+            training.append({"skillId": skill_id, "employeeIds": [roster.employees[r].get("id") for r in lacking]})
+
+        workload = roster.workload
+        return {
+            "skillGaps": skill_gaps,
+            "analytics": {
+                "overallUtilization": int(np.floor(float(workload.mean()) + 0.5)) if len(workload) else 0,
+                "skillUtilization": skill_gaps,
+                "topPerformers": [perf.ids[r] for r in top],
+                "skillsInDemand": in_demand,
+                "reworkIncidents": self._rework,
+                "trainingNeeded": training,
+            },
+        }
+
+    def _results(self) -> Dict[str, Any]:
+        if self.version() != self._cache_version:
+            # The demand counter is only stable while writers are held off
+            with self.store.lock:
+                version = self.version()
+                if version != self._cache_version:
+                    self._cache = self._compute()
+                    self._cache_version = version
+        return self._cache
+
+    def analytics(self) -> Dict[str, Any]:
+        return self._results()["analytics"]
+
+    def skill_gaps(self) -> List[Record]:
+        return self._results()["skillGaps"]
@@ -1,8 +1,13 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, ValidationError
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime
+import atexit
+import json
+import os
 
 
 # Import from data.mockData
@@ -12,30 +17,97 @@ from data.mockData import (
     mockSkills,
     mockDailyReports,
     mockEmployeePerformance,
-    mockSkillGaps,
-    mockWorkforceAnalytics,
     mockTrainingSuggestions
 )
 
-from flask import Flask, jsonify, request
-from data.mockData import mockTasks
+from events import HEARTBEAT_SECONDS, EventBus, Subscriber, attach_task_events, format_sse
+from analytics import AnalyticsEngine
+from archive import KEEP_DAYS, Archiver, TaskArchive
+from heatmap import HeatmapCube
+from leaderboard import METRICS, Leaderboard
+from assignment import BatchPlanner
+from ids import IdGenerator, worker_id
+from matching import MatchEngine
+from metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from performance import PerformanceBook
+from query import MAX_PAGE_SIZE, InvalidCursor, run_query, split_param
+from reports import ReportBook
+from responses import EncodedCache, FastJSONResponse, HTTPCachingMiddleware, dumps, etag_for, join_object
+from storage import ChangeFeed, SQLiteStorage, Storage, attach_storage, open_storage
+from store import Collection, Store
 
-app = Flask(__name__)
+# orjson renders responses when it is installed
+app = FastAPI(title="Optiwork API", version="1.0.0", default_response_class=FastJSONResponse)
 
-@app.route('/api/tasks', methods=['GET'])
-def get_tasks():
-    return jsonify(mockTasks)
 
-@app.route('/api/tasks', methods=['POST'])
-def update_tasks():
-    # Here we receive updated tasks (like status change)
-    updated_tasks = request.json
-    with open('data/mockData.py', 'w') as f:
-        f.write(f"mockTasks = {updated_tasks}")
-    return jsonify({"message": "Tasks updated successfully"})
+# ---------------- HTTP Caching ----------------
+def collection_etag(name: str) -> Callable[[], str]:
+    return lambda: etag_for(store.epoch, store.collections[name].version)
 
 
-app = FastAPI(title="Optiwork API", version="1.0.0")
+def reports_etag() -> str:
+    # Reports change at midnight too (overdue counts)
+    report_book.refresh()
+    return etag_for(store.epoch, store.reports.version)
+
+
+def performance_etag() -> str:
+    # Performance windows move at midnight too
+    performance_book.refresh()
+    return etag_for(store.epoch, store.performance.version)
+
+
+def leaderboard_etag() -> str:
+    performance_book.refresh()
+    return etag_for(store.epoch, (store.performance.version, store.users.version))
+
+
+def bootstrap_etag() -> str:
+    report_book.refresh()
+    performance_book.refresh()
+    versions = (
+        *(collection.version for collection in store.served.values()),
+        *analytics_engine.version(),
+        training_version,
+    )
+    return etag_for(store.epoch, versions)
+
+
+# ETags of the dashboard's polled endpoints, checked before their handlers run
+VALIDATORS: Dict[str, Callable[[], str]] = {
+    "/bootstrap": bootstrap_etag,
+    "/bootstrap/employee/": bootstrap_etag,
+    "/users": collection_etag("users"),
+    "/tasks": collection_etag("tasks"),
+    "/skills": collection_etag("skills"),
+    "/performance": performance_etag,
+    "/reports": reports_etag,
+    "/analytics": lambda: etag_for(store.epoch, analytics_engine.version()),
+    "/skill-gaps": lambda: etag_for(store.epoch, analytics_engine.version()),
+    "/heatmap": lambda: etag_for(store.epoch, (store.tasks.version, store.users.version, store.skills.version)),
+    "/leaderboard": leaderboard_etag,
+    "/training-suggestions": lambda: etag_for(store.epoch, training_version),
+}
+
+# Live work data must be revalidated on every poll (a 304 is cheap); rollups
+# may be reused briefly and reference data for longer
+CACHE_POLICIES: Dict[str, str] = {
+    "/bootstrap": "private, no-cache",
+    "/bootstrap/employee/": "private, no-cache",
+    "/users": "private, no-cache",
+    "/tasks": "private, no-cache",
+    "/reports": "private, no-cache",
+    "/performance": "private, max-age=30",
+    "/analytics": "private, max-age=30",
+    "/skill-gaps": "private, max-age=30",
+    "/heatmap": "private, max-age=30",
+    "/leaderboard": "private, max-age=30",
+    "/skills": "private, max-age=300",
+    "/training-suggestions": "private, max-age=300",
+}
+
+# Added before CORS so it runs inside it and 304s still carry CORS headers
+app.add_middleware(HTTPCachingMiddleware, validators=VALIDATORS, policies=CACHE_POLICIES)
 
 
 # ---------------- CORS Configuration ----------------
@@ -50,24 +122,92 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Added last so it is outermost: latency includes CORS, caching and compression
+app.add_middleware(MetricsMiddleware)
+
 
 # ---------------- In-Memory Data Storage ----------------
-# Create deep copies to prevent modification of original mock data
-def deep_copy_list(data):
-    """Helper to create deep copies of list data"""
-    return [item.copy() if isinstance(item, dict) else item for item in data]
+def seed_store(target: Store) -> None:
+    """Load the mock datasets into the indexed store"""
+    target.load(
+        users=mockUsers,
+        tasks=mockTasks,
+        skills=mockSkills,
+        reports=mockDailyReports,
+        performance=mockEmployeePerformance,
+    )
+
+
+def open_store(storage: Storage) -> Store:
+    """Load the store from storage, seeding it from the mock data on first boot"""
+    target = Store()
+    if storage.is_empty():
+        attach_storage(target, storage)
+        seed_store(target)
+    else:
+        target.load(**storage.load())
+        attach_storage(target, storage)
+    return target
+
+
+# SQLite file by default; OPTIWORK_DB=:memory: keeps everything in process memory.
+# The file is shared by every worker process (uvicorn --workers N) unless OPTIWORK_SHARED=0
+storage = open_storage(
+    os.environ.get("OPTIWORK_DB", os.path.join(os.path.dirname(__file__), "optiwork.db")),
+    shared=os.environ.get("OPTIWORK_SHARED", "1") != "0",
+)
+atexit.register(storage.close)
+seen_changes = storage.last_seq()
+store = open_store(storage)
+# Replay the other workers' writes into this worker's store
+feed = ChangeFeed(store, storage, seen_changes) if isinstance(storage, SQLiteStorage) and storage.origin else None
+if feed is not None:
+    atexit.register(feed.close)
+
+# Time-ordered task ids, unique across worker processes: workers sharing a
+# database each reserve a distinct worker number in it
+task_ids = IdGenerator(worker_id(storage.claim_worker if feed is not None else None))
 
+bus = EventBus()
+attach_task_events(store, bus)
 
-USERS = deep_copy_list(mockUsers)
-TASKS = deep_copy_list(mockTasks)
-SKILLS = deep_copy_list(mockSkills)
-REPORTS = deep_copy_list(mockDailyReports)
-PERFORMANCE = deep_copy_list(mockEmployeePerformance)
-SKILL_GAPS = deep_copy_list(mockSkillGaps)
-ANALYTICS = mockWorkforceAnalytics.copy() if isinstance(mockWorkforceAnalytics, dict) else mockWorkforceAnalytics
-TRAINING = deep_copy_list(mockTrainingSuggestions)
+matcher = MatchEngine(store)
+
+# Materialized daily reports, kept current by task changes
+report_book = ReportBook(store)
+
+# Employee performance rows, kept current by task changes
+performance_book = PerformanceBook(store)
+
+analytics_engine = AnalyticsEngine(store, matcher)
+
+# OPTIWORK_ARCHIVE names a directory for completed tasks older than
+# OPTIWORK_ARCHIVE_DAYS; they move there, one compressed file per month
+archive_dir = os.environ.get("OPTIWORK_ARCHIVE")
+task_archive = TaskArchive(archive_dir) if archive_dir else None
+
+# Weekday x hour productivity cube, kept current by task changes; archived tasks are read back on rebuild
+heatmap_cube = HeatmapCube(store, task_archive)
+
+# Employees ranked per metric, re-ranked one at a time as performance changes
+leaderboard = Leaderboard(store)
+
+archiver = None
+if task_archive is not None:
+    archiver = Archiver(store, task_archive, keep_days=int(os.environ.get("OPTIWORK_ARCHIVE_DAYS", KEEP_DAYS)))
+    archiver.run()
+    atexit.register(archiver.close)
+
+# Read-only: never mutated, only replaced, so it shares the mock list
+TRAINING = mockTrainingSuggestions
+# Bumped whenever TRAINING is replaced
+training_version = 0
+
+# Encoded bodies of the full-collection endpoints, reused until their data changes
+encoded = EncodedCache()
 
 
 # ---------------- Pydantic Models ----------------
@@ -93,6 +233,69 @@ class TaskIn(BaseModel):
     requiredSkills: Optional[List[str]] = []
 
 
+class MatchRequest(BaseModel):
+    requiredSkills: List[str] = []
+    startTime: Optional[str] = None
+    limit: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+
+
+class PlanRequest(BaseModel):
+    taskIds: List[str] = []
+    tasks: List[Dict[str, Any]] = []
+    workloadCap: float = Field(100, gt=0)
+    minSkillMatch: float = Field(0, ge=0, le=100)
+    apply: bool = False
+
+
+# ---------------- Encoded Responses ----------------
+def cached_json(name: str, version: Any, build: Callable[[], Any]) -> Response:
+    """
+    The body `build()` returns, encoded once per `version`; ETags and 304s
+    are handled by HTTPCachingMiddleware before the endpoint runs
+    """
+    return Response(encoded.get(name, version, build), media_type="application/json")
+
+
+def cached_collection(collection: Collection) -> Response:
+    return cached_json(collection.name, collection.version, collection.all)
+
+
+def collection_fragment(collection: Collection) -> bytes:
+    return encoded.get(collection.name, collection.version, collection.all)
+
+
+# ---------------- Query Helpers ----------------
+def query_collection(
+    collection: Collection,
+    equals: Dict[str, Optional[List[str]]],
+    ranges: Optional[Dict[str, Any]] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[str] = None,
+    key_field: str = "id",
+):
+    """
+    Run an indexed list query; the next page cursor goes in X-Next-Cursor.
+    The unfiltered list is served from the encoded response cache.
+    """
+    ranges = ranges or {}
+    filtered = any(v is not None for v in equals.values()) or \
+        any(bound != (None, None) for bound in ranges.values())
+    if not filtered and cursor is None and limit is None and fields is None:
+        return cached_collection(collection)
+    try:
+        records, next_cursor = run_query(
+            collection, equals, ranges, cursor, limit, split_param(fields), key_field
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Stored records are plain JSON values; skip jsonable_encoder's walk
+    response = FastJSONResponse(records)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
 # ---------------- Root Endpoint ----------------
 @app.get("/")
 def root():
@@ -107,22 +310,37 @@ def root():
             "tasks": "/tasks",
             "skills": "/skills",
             "reports": "/reports",
-            "analytics": "/analytics"
+            "analytics": "/analytics",
+            "bootstrap": "/bootstrap",
+            "sync": "/sync",
+            "stream": "/stream"
         }
     }
 
 
 # ---------------- User Endpoints ----------------
 @app.get("/users")
-def list_users():
-    """Get all users"""
-    return USERS
+def list_users(
+    role: Optional[str] = None,
+    department: Optional[str] = None,
+    shift: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+):
+    """Get users, optionally filtered, paginated and projected"""
+    equals = {
+        "role": split_param(role),
+        "department": split_param(department),
+        "shift": split_param(shift),
+    }
+    return query_collection(store.users, equals, cursor=cursor, limit=limit, fields=fields)
 
 
 @app.get("/users/{user_id}")
 def get_user(user_id: str):
     """Get specific user by ID"""
-    user = next((u for u in USERS if u.get("id") == user_id), None)
+    user = store.users.get(user_id)
     if user:
         return user
     raise HTTPException(status_code=404, detail="User not found")
@@ -141,71 +359,273 @@ def login(credentials: Dict[str, str]):
     if not username or not password:
         raise HTTPException(status_code=400, detail="Username and password required")
     
-    # Search for user by id, employeeId, or email
-    for user in USERS:
-        if username in [user.get("id"), user.get("employeeId"), user.get("email")]:
-            # Check password
-            if user.get("password") == password:
-                return {"ok": True, "user": user}
-            else:
-                raise HTTPException(status_code=401, detail="Invalid password")
-    
-    raise HTTPException(status_code=401, detail="User not found")
+    # Indexed lookup by id, employeeId, or email; unknown users cost a full verify
+    # too and get the same answer, so neither timing nor wording reveals who exists
+    user, ok = store.authenticate(username, password)
+    if user is None or not ok:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return {"ok": True, "user": user}
 
 
 # ---------------- Task Endpoints ----------------
 @app.get("/tasks")
-def list_tasks():
-    """Get all tasks"""
-    return TASKS
+def list_tasks(
+    status: Optional[str] = None,
+    assignedTo: Optional[str] = None,
+    priority: Optional[str] = None,
+    dueDate: Optional[str] = None,
+    dueFrom: Optional[str] = None,
+    dueTo: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+):
+    """
+    Get tasks, optionally filtered, paginated and projected.
+    Filters take comma-separated values; dueFrom/dueTo bound dueDate inclusively.
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page.
+    """
+    equals = {
+        "status": split_param(status),
+        "assignedTo": split_param(assignedTo),
+        "priority": split_param(priority),
+        "dueDate": split_param(dueDate),
+    }
+    ranges = {"dueDate": (dueFrom, dueTo)}
+    return query_collection(store.tasks, equals, ranges, cursor, limit, fields)
+
+
+@app.get("/tasks/archive")
+def list_archived_tasks(
+    dueFrom: Optional[str] = None,
+    dueTo: Optional[str] = None,
+    status: Optional[str] = None,
+    assignedTo: Optional[str] = None,
+    priority: Optional[str] = None,
+):
+    """
+    Archived tasks due in [dueFrom, dueTo], by due date. Only the monthly
+    archive files the range overlaps are read; empty when archiving is off.
+    """
+    if task_archive is None:
+        return FastJSONResponse([])
+    equals = {
+        "status": split_param(status),
+        "assignedTo": split_param(assignedTo),
+        "priority": split_param(priority),
+    }
+    return FastJSONResponse(task_archive.query(dueFrom, dueTo, equals))
+
+
+@app.post("/tasks/match")
+def match_task(request: MatchRequest):
+    """
+    Rank employees for a task: skill match 40%, workload 30%, performance 20%,
+    shift availability 10 points. Returns the top `limit` with reasons.
+    """
+    return matcher.match(request.requiredSkills, request.startTime, request.limit)
+
+
+@app.post("/tasks/plan")
+def plan_tasks(request: PlanRequest):
+    """
+    Assign a whole backlog at once under workload caps and shift windows.
+    Plans the given taskIds (or inline tasks); with neither, every pending
+    unassigned task. With apply=true the stored tasks are updated.
+    """
+    if request.tasks:
+        tasks = request.tasks
+    elif request.taskIds:
+        tasks = [store.tasks.get(task_id) for task_id in request.taskIds]
+        if None in tasks:
+            missing = [i for i, t in zip(request.taskIds, tasks) if t is None]
+            raise HTTPException(status_code=404, detail=f"Tasks not found: {', '.join(missing)}")
+    else:
+        unassigned = set(store.tasks.keys_for("assignedTo", None)) | set(store.tasks.keys_for("assignedTo", ""))
+        tasks = [t for t in store.tasks.find("status", "pending") if t.get("id") in unassigned]
+
+    planner = BatchPlanner(matcher, request.workloadCap, request.minSkillMatch)
+    planned = {t.get("id") for t in tasks}
+    for date in {t.get("dueDate") for t in tasks}:
+        planner.reserve(
+            t for t in store.tasks.find("dueDate", date)
+            if t.get("id") not in planned and t.get("status") != "completed"
+        )
+    plan = planner.plan(tasks)
+    if request.apply and not request.tasks:
+        with store.batch():
+            for assignment in plan["assignments"]:
+                store.tasks.update(assignment["taskId"], {"assignedTo": assignment["employeeId"]})
+    plan["applied"] = request.apply and not request.tasks
+    return plan
 
 
 @app.get("/tasks/{task_id}")
 def get_task(task_id: str):
     """Get specific task by ID"""
-    task = next((t for t in TASKS if t.get("id") == task_id), None)
+    task = store.tasks.get(task_id)
     if task:
         return task
     raise HTTPException(status_code=404, detail="Task not found")
 
 
-@app.post("/tasks")
-def create_task(task_data: Dict[str, Any]):
-    """Create a new task"""
+def new_task_record(task_data: Dict[str, Any], task_id: str) -> Dict[str, Any]:
     new_task = task_data.copy()
-    new_task["id"] = str(int(datetime.utcnow().timestamp() * 1000))
+    new_task["id"] = task_id
     new_task["status"] = "pending"
     new_task["completedAt"] = None
-    TASKS.append(new_task)
     return new_task
 
 
-@app.patch("/tasks/{task_id}")
-def update_task(task_id: str, changes: Dict[str, Any]):
-    """Update an existing task"""
-    task = next((t for t in TASKS if t.get("id") == task_id), None)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    # Update task fields
-    task.update(changes)
+def task_changes(task: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+    # The primary key is not editable; it would desync the indexes
+    changes = {k: v for k, v in changes.items() if k != "id"}
     
     # Auto-set completedAt if status is completed
     if changes.get("status") == "completed" and not task.get("completedAt"):
-        task["completedAt"] = datetime.utcnow().isoformat()
-    
-    return task
+        changes["completedAt"] = datetime.utcnow().isoformat()
+    return changes
+
+
+@app.post("/tasks")
+def create_task(task_data: Dict[str, Any]):
+    """Create a new task"""
+    return store.tasks.insert(new_task_record(task_data, task_ids.next_id()))
+
+
+@app.patch("/tasks/{task_id}")
+def update_task(task_id: str, changes: Dict[str, Any]):
+    """Update an existing task"""
+    # Under the writer lock so the task cannot change between reading and updating it
+    with store.lock:
+        task = store.tasks.get(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return store.tasks.update(task_id, task_changes(task, changes))
+
+
+# ---------------- Batch Task Endpoints ----------------
+def parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return exc
+
+
+async def read_batch(request: Request) -> List[Any]:
+    """
+    Items of a JSON array body, or of an application/x-ndjson body parsed line
+    by line as it streams in. A line that is not valid JSON becomes its error.
+    """
+    if "ndjson" not in request.headers.get("content-type", ""):
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        return items
+
+    items: List[Any] = []
+    pending = b""
+    async for chunk in request.stream():
+        *lines, pending = (pending + chunk).split(b"\n")
+        items.extend(parse_line(line) for line in lines if line.strip())
+    if pending.strip():
+        items.append(parse_line(pending))
+    return items
+
+
+def validation_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'item'}: {e['msg']}" for e in error.errors())
+    return f"Invalid JSON: {error}"
+
+
+def validate_task(item: Any) -> Optional[str]:
+    """None if the item is a valid TaskIn, else why not"""
+    if isinstance(item, Exception):
+        return validation_message(item)
+    if not isinstance(item, dict):
+        return "Each item must be a JSON object"
+    try:
+        TaskIn.model_validate(item)
+    except ValidationError as exc:
+        return validation_message(exc)
+    return None
+
+
+def batch_response(results: List[Dict[str, Any]]) -> JSONResponse:
+    failed = sum(1 for r in results if not r["ok"])
+    # Plain JSON values already; skip jsonable_encoder's walk over thousands of results
+    return JSONResponse({"ok": failed == 0, "succeeded": len(results) - failed, "failed": failed, "results": results})
+
+
+@app.post("/tasks:batch")
+async def create_tasks_batch(request: Request):
+    """
+    Create many tasks from a JSON array or NDJSON body.
+    Items are validated in one pass and the valid ones are written in one
+    store batch and storage commit; results are reported per item.
+    """
+    items = await read_batch(request)
+    results: List[Dict[str, Any]] = []
+    valid = []
+    for index, item in enumerate(items):
+        error = validate_task(item)
+        results.append({"index": index, "ok": error is None, **({"error": error} if error else {})})
+        if error is None:
+            valid.append((index, item))
+
+    def apply():
+        new_ids = task_ids.next_ids(len(valid))
+        with store.batch():
+            for (index, item), task_id in zip(valid, new_ids):
+                results[index]["id"] = store.tasks.insert(new_task_record(item, task_id))["id"]
+
+    await run_in_threadpool(apply)
+    return batch_response(results)
+
+
+@app.patch("/tasks:batch")
+async def update_tasks_batch(request: Request):
+    """
+    Apply many task updates; each item is {"id": ..., **changes}.
+    The updated task must still validate as a TaskIn. All updates are applied
+    in one store batch and storage commit; results are reported per item.
+    """
+    items = await read_batch(request)
+    results: List[Dict[str, Any]] = []
+
+    def apply():
+        with store.batch():
+            for index, item in enumerate(items):
+                task_id = item.get("id") if isinstance(item, dict) else None
+                task = store.tasks.get(str(task_id)) if task_id is not None else None
+                if isinstance(item, dict) and task is None:
+                    error = "Task not found" if task_id is not None else "id: Field required"
+                else:
+                    error = validate_task(item if task is None else {**task, **item})
+                result = {"index": index, "ok": error is None}
+                if task_id is not None:
+                    result["id"] = str(task_id)
+                if error is None:
+                    store.tasks.update(str(task_id), task_changes(task, item))
+                else:
+                    result["error"] = error
+                results.append(result)
+
+    await run_in_threadpool(apply)
+    return batch_response(results)
 
 
 @app.delete("/tasks/{task_id}")
 def delete_task(task_id: str):
     """Delete a task"""
-    global TASKS
-    task = next((t for t in TASKS if t.get("id") == task_id), None)
+    task = store.tasks.delete(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    TASKS = [t for t in TASKS if t.get("id") != task_id]
     return {"ok": True, "message": "Task deleted"}
 
 
@@ -213,13 +633,13 @@ def delete_task(task_id: str):
 @app.get("/skills")
 def list_skills():
     """Get all skills"""
-    return SKILLS
+    return cached_collection(store.skills)
 
 
 @app.get("/skills/{skill_id}")
 def get_skill(skill_id: str):
     """Get specific skill by ID"""
-    skill = next((s for s in SKILLS if s.get("id") == skill_id), None)
+    skill = store.skills.get(skill_id)
     if skill:
         return skill
     raise HTTPException(status_code=404, detail="Skill not found")
@@ -229,13 +649,14 @@ def get_skill(skill_id: str):
 @app.get("/reports")
 def list_reports():
     """Get all daily reports"""
-    return REPORTS
+    report_book.refresh()
+    return cached_json("reports", store.reports.version, report_book.all)
 
 
 @app.get("/reports/{date}")
 def get_report_by_date(date: str):
     """Get report for specific date"""
-    report = next((r for r in REPORTS if r.get("date") == date), None)
+    report = report_book.report(date)
     if report:
         return report
     raise HTTPException(status_code=404, detail="Report not found")
@@ -243,17 +664,23 @@ def get_report_by_date(date: str):
 
 # ---------------- Performance Endpoints ----------------
 @app.get("/performance")
-def list_performance():
-    """Get all performance data"""
-    return PERFORMANCE
+def list_performance(
+    department: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+):
+    """Get performance data, optionally filtered, paginated and projected"""
+    performance_book.refresh()
+    equals = {"department": split_param(department)}
+    return query_collection(
+        store.performance, equals, cursor=cursor, limit=limit, fields=fields, key_field="employeeId"
+    )
 
 @app.get("/performance/{employee_id}")
 def get_performance(employee_id: str):
     """Get performance data for specific employee"""
-    perf = next(
-        (p for p in PERFORMANCE if p.get("employeeId") == employee_id or p.get("employee_id") == employee_id),
-        None
-    )
+    perf = performance_book.record(employee_id)
     if not perf:
         raise HTTPException(status_code=404, detail="Performance data not found")
     return perf
@@ -263,14 +690,55 @@ def get_performance(employee_id: str):
 @app.get("/analytics")
 def get_analytics():
     """Get workforce analytics data"""
-    return ANALYTICS
+    return cached_json("analytics", analytics_engine.version(), analytics_engine.analytics)
+
+
+@app.get("/heatmap")
+def get_heatmap(team: Optional[str] = None, shift: Optional[str] = None, skill: Optional[str] = None):
+    """
+    Productivity by weekday and hour, with the peak and idle hours.
+    team (department) and shift take comma-separated names, skill one id or
+    name; "all" or nothing means no filter. Names are case-insensitive.
+    """
+    def selected(value: Optional[str]) -> Optional[List[str]]:
+        names = split_param(value)
+        return None if not names or "all" in names else names
+
+    skills = selected(skill)
+    return FastJSONResponse(heatmap_cube.query(selected(team), selected(shift), skills[0] if skills else None))
+
+
+# ---------------- Leaderboard ----------------
+def leaderboard_metric(metric: str) -> str:
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric; use one of {', '.join(METRICS)}")
+    return metric
+
+
+@app.get("/leaderboard")
+def get_leaderboard(
+    metric: str = "overall",
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+):
+    """Employees ranked by overall score, quality, onTime or tasksCompleted, with trend and badge"""
+    return FastJSONResponse(leaderboard.top(leaderboard_metric(metric), limit, offset))
+
+
+@app.get("/leaderboard/{employee_id}")
+def get_leaderboard_rank(employee_id: str, metric: str = "overall"):
+    """One employee's place on the leaderboard, with "of" the number ranked"""
+    entry = leaderboard.rank(employee_id, leaderboard_metric(metric))
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Performance data not found")
+    return FastJSONResponse(entry)
 
 
 # ---------------- Training Suggestions ----------------
 @app.get("/training-suggestions")
 def get_training_suggestions():
     """Get training suggestions for all employees"""
-    return TRAINING
+    return cached_json("training-suggestions", training_version, lambda: TRAINING)
 
 
 @app.get("/training-suggestions/{employee_id}")
@@ -280,27 +748,172 @@ def get_employee_training(employee_id: str):
     return suggestions
 
 
+# ---------------- Bootstrap ----------------
+@app.get("/bootstrap")
+def bootstrap():
+    """
+    Everything the admin dashboard loads, in one response. Each member is the
+    cached body of its own endpoint, so an unchanged one costs no encoding.
+    """
+    report_book.refresh()
+    performance_book.refresh()
+    version = analytics_engine.version()
+    body = join_object({
+        "users": collection_fragment(store.users),
+        "tasks": collection_fragment(store.tasks),
+        "skills": collection_fragment(store.skills),
+        "reports": encoded.get("reports", store.reports.version, report_book.all),
+        "performance": collection_fragment(store.performance),
+        "analytics": encoded.get("analytics", version, analytics_engine.analytics),
+        "trainingSuggestions": encoded.get("training-suggestions", training_version, lambda: TRAINING),
+        "skillGaps": encoded.get("skill-gaps", version, analytics_engine.skill_gaps),
+    })
+    return Response(body, media_type="application/json")
+
+
+@app.get("/bootstrap/employee/{employee_id}")
+def bootstrap_employee(employee_id: str):
+    """What one employee's view needs: their profile, tasks, performance and training"""
+    user = store.users.get(employee_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    tasks = store.tasks
+    body = join_object({
+        "user": encoded.get(("user", employee_id), store.users.version, lambda: store.users.get(employee_id)),
+        "tasks": encoded.get(
+            ("employee-tasks", employee_id), tasks.version, lambda: tasks.find("assignedTo", employee_id)
+        ),
+        "skills": collection_fragment(store.skills),
+        "performance": encoded.get(
+            ("performance", employee_id), store.performance.version, lambda: store.performance.get(employee_id)
+        ),
+        "trainingSuggestions": encoded.get(
+            ("employee-training", employee_id), training_version, lambda: get_employee_training(employee_id)
+        ),
+    })
+    return Response(body, media_type="application/json")
+
+
 # ---------------- Skill Gaps ----------------
 @app.get("/skill-gaps")
 def get_skill_gaps():
     """Get skill gap analysis"""
-    return SKILL_GAPS
+    return cached_json("skill-gaps", analytics_engine.version(), analytics_engine.skill_gaps)
+
+
+# ---------------- Delta Sync ----------------
+@app.get("/sync")
+def sync(since: int = 0, epoch: Optional[str] = None):
+    """
+    Get everything changed after version `since`.
+    Each collection lists upserted records and deleted keys, and `analytics`
+    and `skillGaps` are included when anything they derive from changed. When
+    the client's version predates the change log (or another server epoch),
+    `full` is true and every collection is sent in full; the client should
+    replace its copy.
+    """
+    report_book.refresh()
+    performance_book.refresh()
+    changed = store.changes_since(since) if epoch == store.epoch else None
+    version = analytics_engine.version()
+    if changed is None:
+        # A full snapshot is mostly the cached bodies of the collection endpoints
+        records = {
+            name: encoded.get("reports", collection.version, report_book.all)
+            if collection is store.reports else collection_fragment(collection)
+            for name, collection in store.served.items()
+        }
+        body = join_object({
+            "epoch": dumps(store.epoch),
+            "version": dumps(store.version),
+            "full": b"true",
+            **{name: join_object({"upserted": fragment, "deleted": b"[]"}) for name, fragment in records.items()},
+            "analytics": encoded.get("analytics", version, analytics_engine.analytics),
+            "trainingSuggestions": encoded.get("training-suggestions", training_version, lambda: TRAINING),
+            "skillGaps": encoded.get("skill-gaps", version, analytics_engine.skill_gaps),
+        })
+        return Response(body, media_type="application/json")
+
+    fragments = {"epoch": dumps(store.epoch), "version": dumps(store.version), "full": b"false"}
+    for name, collection in store.served.items():
+        keys = changed.get(name, {})
+        fragments[name] = dumps({
+            "upserted": [collection.get(k) for k, deleted in keys.items() if not deleted and k in collection],
+            "deleted": [k for k, deleted in keys.items() if deleted],
+        })
+    # Rollups come along whenever the data they are computed from moved past the client's version
+    if max(version) > since:
+        fragments["analytics"] = encoded.get("analytics", version, analytics_engine.analytics)
+        fragments["skillGaps"] = encoded.get("skill-gaps", version, analytics_engine.skill_gaps)
+    return Response(join_object(fragments), media_type="application/json")
+
+
+# ---------------- Live Task Stream ----------------
+@app.get("/stream")
+async def stream_events(
+    department: Optional[str] = None,
+    shift: Optional[str] = None,
+    assignedTo: Optional[str] = None,
+):
+    """
+    Server-sent events for task create/update/delete, optionally filtered.
+    Slow clients receive only the latest state of each task; an `overflow`
+    event means some were dropped and the client should call /sync.
+    """
+    subscriber = bus.subscribe(Subscriber(department, shift, assignedTo))
+
+    async def event_source():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                batch = await subscriber.next_batch(timeout=HEARTBEAT_SECONDS)
+                if not batch:
+                    yield ": keepalive\n\n"
+                    continue
+                yield "".join(format_sse(event) for event in batch)
+        finally:
+            bus.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/stream/ws")
+async def stream_websocket(
+    websocket: WebSocket,
+    department: Optional[str] = None,
+    shift: Optional[str] = None,
+    assignedTo: Optional[str] = None,
+):
+    """WebSocket variant of /stream; each message is a JSON list of events"""
+    await websocket.accept()
+    subscriber = bus.subscribe(Subscriber(department, shift, assignedTo))
+    try:
+        while True:
+            batch = await subscriber.next_batch(timeout=HEARTBEAT_SECONDS)
+            await websocket.send_json(batch or [{"type": "heartbeat"}])
+    except WebSocketDisconnect:
+        pass
+    finally:
+        bus.unsubscribe(subscriber)
 
 
 # ---------------- Utility Endpoints ----------------
 @app.post("/reset")
 def reset_data():
     """Reset all data to initial mock values"""
-    global USERS, TASKS, SKILLS, REPORTS, PERFORMANCE, SKILL_GAPS, ANALYTICS, TRAINING
+    global TRAINING, training_version
     
-    USERS = deep_copy_list(mockUsers)
-    TASKS = deep_copy_list(mockTasks)
-    SKILLS = deep_copy_list(mockSkills)
-    REPORTS = deep_copy_list(mockDailyReports)
-    PERFORMANCE = deep_copy_list(mockEmployeePerformance)
-    SKILL_GAPS = deep_copy_list(mockSkillGaps)
-    ANALYTICS = mockWorkforceAnalytics.copy() if isinstance(mockWorkforceAnalytics, dict) else mockWorkforceAnalytics
-    TRAINING = deep_copy_list(mockTrainingSuggestions)
+    # Under the writer lock so no archiving pass runs in between
+    with store.lock:
+        if task_archive is not None:
+            task_archive.clear()
+        seed_store(store)
+    TRAINING = mockTrainingSuggestions
+    training_version += 1
     
     return {"ok": True, "message": "All data reset to initial values"}
 
@@ -312,9 +925,15 @@ def health_check():
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "data_counts": {
-            "users": len(USERS),
-            "tasks": len(TASKS),
-            "skills": len(SKILLS),
-            "reports": len(REPORTS)
+            "users": len(store.users),
+            "tasks": len(store.tasks),
+            "skills": len(store.skills),
+            "reports": len(store.reports)
         }
     }
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Request and store-operation metrics of this worker process, in Prometheus text format"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
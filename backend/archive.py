@@ -0,0 +1,206 @@
+import datetime
+import glob
+import gzip
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; only this process's threads are kept apart there
+    fcntl = None
+
+from reports import today_iso
+from store import Record, Store
+
+
+# Completed tasks stay in the store this many days past their due date
+KEEP_DAYS = 90
+# Seconds between archiving passes
+ARCHIVE_INTERVAL = 3600.0
+PARTITION = re.compile(r"tasks-(\d{4}-\d{2})\.ndjson\.gz$")
+# Locked by every process using the directory around each file access
+LOCK_FILE = ".lock"
+
+
+# ---------------- Archive Files ----------------
+class TaskArchive:
+    """
+    Tasks moved out of the store, in one gzip-compressed NDJSON file per
+    due-date month (``tasks-2025-09.ndjson.gz``).
+
+    Each ``append`` adds a gzip member to the month's file, so nothing is
+    rewritten. A range query only opens the months it overlaps. Appends
+    take an exclusive ``flock`` on the directory's lock file and reads a
+    shared one, so worker processes archiving into the same directory
+    never interleave their writes. A task written twice (two workers
+    archiving the same day, or a pass interrupted between writing and
+    deleting) is read back once, as its last copy.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def path(self, month: str) -> str:
+        return os.path.join(self.directory, f"tasks-{month}.ndjson.gz")
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.directory, LOCK_FILE), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def months(self) -> List[str]:
+        """Months with archived tasks, oldest first"""
+        names = (PARTITION.search(p) for p in glob.glob(os.path.join(self.directory, "tasks-*.ndjson.gz")))
+        return sorted(m.group(1) for m in names if m)
+
+    def append(self, tasks: Iterable[Record]) -> int:
+        """Write tasks to the partitions of their due-date months; returns how many"""
+        lines: Dict[str, List[bytes]] = {}
+        for task in tasks:
+            line = json.dumps(task, separators=(",", ":"), default=str).encode() + b"\n"
+            lines.setdefault(str(task["dueDate"])[:7], []).append(line)
+        with self._locked():
+            for month, rows in lines.items():
+                with gzip.open(self.path(month), "ab") as f:
+                    f.writelines(rows)
+        return sum(len(rows) for rows in lines.values())
+
+    def read(self, month: str) -> Iterator[Record]:
+        """Every task archived for one month, each once"""
+        path = self.path(month)
+        if not os.path.exists(path):
+            return iter(())
+        tasks: Dict[Any, Record] = {}
+        with self._locked(shared=True), gzip.open(path, "rb") as f:
+            for line in f:
+                task = json.loads(line)
+                tasks[task.get("id")] = task
+        return iter(tasks.values())
+
+    def query(
+        self,
+        low: Optional[str] = None,
+        high: Optional[str] = None,
+        equals: Optional[Dict[str, Optional[List[str]]]] = None,
+    ) -> List[Record]:
+        """
+        Archived tasks due in [low, high] (either bound may be open) whose
+        fields take one of the given values, by due date then id
+        """
+        filters = {field: set(values) for field, values in (equals or {}).items() if values is not None}
+        found = []
+        for month in self.months():
+            if (low and month < low[:7]) or (high and month > high[:7]):
+                continue
+            for task in self.read(month):
+                due = str(task.get("dueDate"))
+                if (low and due < low) or (high and due > high):
+                    continue
+                if all(task.get(field) in values for field, values in filters.items()):
+                    found.append(task)
+        found.sort(key=lambda t: (str(t.get("dueDate")), str(t.get("id"))))
+        return found
+
+    def clear(self) -> None:
+        with self._locked():
+            for month in self.months():
+                os.remove(self.path(month))
+
+
+# ---------------- Archiving ----------------
+class Archiver:
+    """
+    Moves finished history out of the store so its size follows active work.
+
+    A due date is archived once it is more than ``keep_days`` old and every
+    task due on it is completed, also more than ``keep_days`` ago; open or
+    recently finished work keeps its whole day in the store. Each month is
+    written to the archive before its tasks are deleted, inside one store
+    batch under ``store.archiving()``, so daily reports keep counting them.
+    A background thread runs a pass every ``interval`` seconds; ``run``
+    does one now.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        archive: TaskArchive,
+        keep_days: int = KEEP_DAYS,
+        interval: float = ARCHIVE_INTERVAL,
+        today: Callable[[], str] = today_iso,
+    ):
+        self.store = store
+        self.archive = archive
+        self.keep_days = keep_days
+        self._clock = today
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if interval > 0:
+            self._thread = threading.Thread(target=self._loop, args=(interval,), daemon=True)
+            self._thread.start()
+
+    def cutoff(self) -> str:
+        """Tasks due and completed before this date may be archived"""
+        today = datetime.date.fromisoformat(self._clock())
+        return (today - datetime.timedelta(days=self.keep_days)).isoformat()
+
+    def _finished(self, month: str, cutoff: str) -> List[Record]:
+        """Tasks of the month's days that are wholly done before the cutoff; caller holds the lock"""
+        tasks = self.store.tasks.snapshot()
+        completed = tasks.keys_for("status", "completed")
+        done: List[Record] = []
+        for day in tasks.values_between("dueDate", f"{month}-01", min(cutoff, f"{month}-31")):
+            keys = tasks.keys_for("dueDate", day)
+            # The indexes rule most days out before any task is read
+            if day >= cutoff or not all(key in completed for key in keys):
+                continue
+            finished = [tasks.get(key) for key in keys]
+            if all(str(task.get("completedAt") or "") < cutoff for task in finished):
+                done.extend(finished)
+        return done
+
+    def run(self) -> int:
+        """Archive everything that is due; returns the number of tasks moved"""
+        cutoff = self.cutoff()
+        tasks = self.store.tasks.snapshot()
+        months = sorted({str(day)[:7] for day in tasks.values_between("dueDate", None, cutoff)})
+        moved = 0
+        for month in months:
+            # One month at a time, so writers wait for one file append at most
+            with self.store.lock:
+                done = self._finished(month, cutoff)
+                if not done:
+                    continue
+                self.archive.append(done)
+                with self.store.batch(), self.store.archiving():
+                    for task in done:
+                        self.store.tasks.delete(self.store.tasks.key_of(task))
+                moved += len(done)
+        return moved
+
+    def _loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.run()
+            except OSError:
+                # The archive directory was unwritable; the tasks stay put until the next pass
+                continue
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
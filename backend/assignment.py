@@ -0,0 +1,229 @@
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from matching import (
+    AVAILABILITY_POINTS,
+    PERFORMANCE_WEIGHT,
+    SKILL_WEIGHT,
+    WORKLOAD_WEIGHT,
+    MatchEngine,
+    Roster,
+    parse_hour,
+)
+from store import Record
+
+
+SHIFT_MINUTES = 8 * 60
+SLOT_MINUTES = 15
+# Two days of slots so overnight tasks (end before start) fit without wrapping
+DAY_SLOTS = 2 * 24 * 60 // SLOT_MINUTES
+DEFAULT_DURATION = 60
+IMPROVE_PASSES = 2
+
+
+def parse_minutes(value: Optional[str]) -> Optional[int]:
+    try:
+        hours, minutes = str(value).split(":")[:2]
+        return int(hours) * 60 + int(minutes)
+    except ValueError:
+        return None
+
+
+def task_window(task: Record) -> Tuple[Optional[int], int]:
+    """(start minute, duration minutes); overnight tasks end on the next day"""
+    start = parse_minutes(task.get("startTime"))
+    end = parse_minutes(task.get("endTime"))
+    if start is None or end is None:
+        return start, DEFAULT_DURATION
+    if end <= start:
+        end += 24 * 60
+    return start, end - start
+
+
+# ---------------- Batch Planner ----------------
+class BatchPlanner:
+    """
+    Assigns a whole backlog of tasks at once.
+
+    Hard constraints: the task's start hour falls in the employee's shift,
+    the employee's projected workload stays under the cap (each task adds
+    its share of an 8-hour shift), and no employee gets overlapping tasks on
+    the same due date. Within those, the most constrained task (fewest
+    feasible employees) is placed first, ties broken by regret: the task whose
+    best option is furthest ahead of its second-best goes first, so scarce
+    specialists go to the work only they can do. Scores use the
+    match weights with the employee's *projected* workload, which spreads
+    load instead of piling onto the single best candidate. A short local
+    search then moves tasks while that raises the plan's total score.
+    """
+
+    def __init__(self, engine: MatchEngine, workload_cap: float = 100.0, min_skill_match: float = 0.0):
+        self.roster: Roster = engine.roster()
+        self.workload_cap = workload_cap
+        self.min_skill_match = min_skill_match
+        self.projected = self.roster.workload.astype(np.float64).copy()
+        self.counts = np.zeros(len(self.roster.employees), dtype=np.int32)
+        self._busy: Dict[Any, np.ndarray] = {}
+        self._static: Dict[Tuple[Tuple[str, ...], Optional[int]], Tuple[np.ndarray, np.ndarray]] = {}
+        self._rows = {e.get("id"): row for row, e in enumerate(self.roster.employees)}
+
+    def reserve(self, tasks: Iterable[Record]) -> None:
+        """Block out time already taken by tasks assigned before planning"""
+        for task in tasks:
+            row = self._rows.get(task.get("assignedTo"))
+            slots = self._slots(task)
+            if row is not None and slots is not None:
+                self._busy_for(task.get("dueDate"))[row, slots] = True
+
+    def _static_part(self, task: Record) -> Tuple[np.ndarray, np.ndarray]:
+        """Score terms that do not change during planning, shared by identical tasks"""
+        required = tuple(task.get("requiredSkills") or ())
+        hour = parse_hour(task.get("startTime"))
+        key = (required, hour)
+        cached = self._static.get(key)
+        if cached is not None:
+            return cached
+        roster = self.roster
+        n = len(roster.employees)
+        if required:
+            cols = [roster.columns[s] for s in required if s in roster.columns]
+            matched = roster.has[:, cols].sum(axis=1) if cols else np.zeros(n)
+            skill = matched * (100.0 / len(required))
+        else:
+            skill = np.full(n, 100.0)
+        available = roster.available[roster.shift, hour] if hour is not None else np.ones(n, dtype=bool)
+        static = skill * SKILL_WEIGHT + roster.performance * PERFORMANCE_WEIGHT + AVAILABILITY_POINTS
+        eligible = available & (skill >= self.min_skill_match)
+        cached = self._static[key] = (static + WORKLOAD_WEIGHT * 100.0, eligible)
+        return cached
+
+    def _slots(self, task: Record) -> Optional[slice]:
+        start, duration = task_window(task)
+        if start is None:
+            return None
+        first = start // SLOT_MINUTES
+        last = min(DAY_SLOTS, -(-(start + duration) // SLOT_MINUTES))
+        return slice(first, last)
+
+    def _busy_for(self, date: Any) -> np.ndarray:
+        busy = self._busy.get(date)
+        if busy is None:
+            busy = self._busy[date] = np.zeros((len(self.roster.employees), DAY_SLOTS), dtype=bool)
+        return busy
+
+    def _candidates(self, task: Record, load: float) -> np.ndarray:
+        """
+        Objective gain of giving the task to each employee; -inf where infeasible.
+        The gain is the task's match score at the employee's new workload, minus
+        what that extra load costs the employee's other planned tasks.
+        """
+        static, eligible = self._static_part(task)
+        feasible = eligible & (self.projected + load <= self.workload_cap)
+        slots = self._slots(task)
+        if slots is not None:
+            feasible &= ~self._busy_for(task.get("dueDate"))[:, slots].any(axis=1)
+        gain = static - WORKLOAD_WEIGHT * (self.projected + load) - WORKLOAD_WEIGHT * load * self.counts
+        return np.where(feasible, gain, -np.inf)
+
+    @staticmethod
+    def _priority(scores: np.ndarray) -> Optional[Tuple[int, float, float, int]]:
+        """(feasible count, regret, best score, best row), or None if nothing is feasible"""
+        options = int(np.isfinite(scores).sum())
+        if options == 0:
+            return None
+        if options == 1:
+            best = int(np.argmax(scores))
+            return 1, np.inf, float(scores[best]), best
+        top2 = np.argpartition(-scores, 1)[:2]
+        first, second = sorted(top2, key=lambda i: (-scores[i], i))
+        return options, float(scores[first] - scores[second]), float(scores[first]), int(first)
+
+    @staticmethod
+    def _key(priority: Tuple[int, float, float, int], i: int) -> Tuple[int, float, float, int]:
+        # Fewest options first, then largest regret, then best score
+        return priority[0], -priority[1], -priority[2], i
+
+    def _place(self, task: Record, load: float, row: int, taken: bool) -> None:
+        """Commit (or release) a task's workload and time slots on an employee"""
+        self.projected[row] += load if taken else -load
+        self.counts[row] += 1 if taken else -1
+        slots = self._slots(task)
+        if slots is not None:
+            self._busy_for(task.get("dueDate"))[row, slots] = taken
+
+    def score(self, task: Record, row: int) -> float:
+        """Match score of a placed task at the employee's current projected workload"""
+        static, _ = self._static_part(task)
+        return float(static[row] - WORKLOAD_WEIGHT * self.projected[row])
+
+    def _improve(self, tasks: List[Record], loads: List[float], placed: Dict[int, int]) -> None:
+        """Local search: move each task wherever it strictly raises the objective"""
+        for _ in range(IMPROVE_PASSES):
+            moved = 0
+            for i, row in placed.items():
+                task = tasks[i]
+                self._place(task, loads[i], row, False)
+                scores = self._candidates(task, loads[i])
+                best = int(np.argmax(scores))
+                if scores[best] > scores[row] + 1e-9:
+                    placed[i] = row = best
+                    moved += 1
+                self._place(task, loads[i], row, True)
+            if not moved:
+                break
+
+    def plan(self, tasks: List[Record]) -> Dict[str, Any]:
+        loads = [task_window(t)[1] / SHIFT_MINUTES * 100.0 for t in tasks]
+        heap: List[Tuple[int, float, float, int]] = []
+        unassigned: List[Dict[str, Any]] = []
+        for i, task in enumerate(tasks):
+            priority = self._priority(self._candidates(task, loads[i]))
+            if priority is None:
+                unassigned.append({"taskId": task.get("id"), "reason": "No feasible employee"})
+            else:
+                heapq.heappush(heap, self._key(priority, i))
+
+        placed: Dict[int, int] = {}
+        while heap:
+            i = heapq.heappop(heap)[-1]
+            task = tasks[i]
+            priority = self._priority(self._candidates(task, loads[i]))
+            if priority is None:
+                unassigned.append({"taskId": task.get("id"), "reason": "No capacity left in shift window"})
+                continue
+            key = self._key(priority, i)
+            # Lazy re-evaluation: only commit if the refreshed key still leads
+            if heap and key > heap[0]:
+                heapq.heappush(heap, key)
+                continue
+            placed[i] = priority[3]
+            self._place(task, loads[i], priority[3], True)
+
+        self._improve(tasks, loads, placed)
+        return self.summarize(tasks, placed, unassigned)
+
+    def summarize(
+        self, tasks: List[Record], placed: Dict[int, int], unassigned: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Plan result for tasks[i] -> roster row; the objective is the sum of final match scores"""
+        assignments: List[Dict[str, Any]] = []
+        objective = 0.0
+        for i, row in placed.items():
+            score = self.score(tasks[i], row)
+            assignments.append({
+                "taskId": tasks[i].get("id"),
+                "employeeId": self.roster.employees[row].get("id"),
+                "score": round(score, 2),
+            })
+            objective += score
+        rows = sorted(set(placed.values()))
+        workload = {self.roster.employees[row].get("id"): round(float(self.projected[row]), 1) for row in rows}
+        return {
+            "assignments": assignments,
+            "unassigned": unassigned or [],
+            "objective": round(objective, 2),
+            "averageScore": round(objective / len(assignments), 2) if assignments else 0.0,
+            "workload": workload,
+        }
@@ -0,0 +1,123 @@
+import hashlib
+import hmac
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+
+# ---------------- Password Hashing ----------------
+ALGORITHM = "pbkdf2_sha256"
+ITERATIONS = 100_000
+SALT_BYTES = 16
+VERIFIED_CACHE_SIZE = 4096
+
+
+class Verifier(NamedTuple):
+    """Parsed form of an encoded password hash"""
+    iterations: int
+    salt: bytes
+    digest: bytes
+
+
+def is_encoded(password: str) -> bool:
+    return isinstance(password, str) and password.startswith(ALGORITHM + "$")
+
+
+def hash_password(password: str, salt: Optional[bytes] = None, iterations: int = ITERATIONS) -> str:
+    """Return "pbkdf2_sha256$<iterations>$<salt>$<digest>" for a plaintext password"""
+    salt = salt if salt is not None else os.urandom(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def parse_hash(encoded: str) -> Verifier:
+    algorithm, iterations, salt, digest = encoded.split("$")
+    if algorithm != ALGORITHM:
+        raise ValueError(f"Unsupported password hash: {algorithm}")
+    return Verifier(int(iterations), bytes.fromhex(salt), bytes.fromhex(digest))
+
+
+def check_password(password: str, verifier: Verifier) -> bool:
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), verifier.salt, verifier.iterations)
+    return hmac.compare_digest(digest, verifier.digest)
+
+
+# Seed data is plaintext; remember its hashes so /reset does not re-derive them
+_seed_hashes: Dict[str, str] = {}
+
+
+def seed_hash(password: str) -> str:
+    if is_encoded(password):
+        return password
+    encoded = _seed_hashes.get(password)
+    if encoded is None:
+        encoded = _seed_hashes[password] = hash_password(password)
+    return encoded
+
+
+# ---------------- Credential Store ----------------
+class Credentials:
+    """
+    Password verifiers keyed by user id.
+
+    Verifiers are parsed once when a password is set. Recent successful
+    logins are remembered as a salted SHA-256 so a repeated badge-in skips
+    the PBKDF2 derivation; unknown users are checked against a dummy
+    verifier so every miss costs the same as a wrong password. Logins are
+    verified on threadpool workers, so the remembered logins take a lock.
+    """
+
+    def __init__(self, cache_size: int = VERIFIED_CACHE_SIZE):
+        self._verifiers: Dict[str, Verifier] = {}
+        self._verified: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self._dummy = parse_hash(hash_password(os.urandom(8).hex()))
+
+    def __len__(self) -> int:
+        return len(self._verifiers)
+
+    def clear(self) -> None:
+        self._verifiers.clear()
+        with self._lock:
+            self._verified.clear()
+
+    def set(self, user_id: str, password: str) -> None:
+        """Store a password, hashing it first if it is plaintext"""
+        self._verifiers[user_id] = parse_hash(seed_hash(password))
+        with self._lock:
+            self._verified.pop(user_id, None)
+
+    def encoded(self, user_id: str) -> Optional[str]:
+        """The stored hash in its encoded form, for persisting"""
+        verifier = self._verifiers.get(user_id)
+        if verifier is None:
+            return None
+        return f"{ALGORITHM}${verifier.iterations}${verifier.salt.hex()}${verifier.digest.hex()}"
+
+    def remove(self, user_id: str) -> None:
+        self._verifiers.pop(user_id, None)
+        with self._lock:
+            self._verified.pop(user_id, None)
+
+    def verify(self, user_id: Optional[str], password: str) -> bool:
+        verifier = self._verifiers.get(user_id) if user_id is not None else None
+        if verifier is None:
+            check_password(password, self._dummy)
+            return False
+
+        fast = hashlib.sha256(verifier.salt + password.encode()).digest()
+        with self._lock:
+            cached = self._verified.get(user_id)
+            if cached is not None and hmac.compare_digest(cached, fast):
+                self._verified.move_to_end(user_id)
+                return True
+
+        if not check_password(password, verifier):
+            return False
+        with self._lock:
+            self._verified[user_id] = fast
+            if len(self._verified) > self._cache_size:
+                self._verified.popitem(last=False)
+        return True
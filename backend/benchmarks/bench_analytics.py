@@ -0,0 +1,98 @@
+"""
+Analytics benchmark: incremental AnalyticsEngine vs a full rescan per request.
+
+Measures a cached read, a read right after a task mutation (the recompute
+path) and a straightforward pass over every task and user. Run from the
+backend directory:
+    python -m benchmarks.bench_analytics --tasks 100000 --employees 2000
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from analytics import AnalyticsEngine
+from benchmarks.bench_matching import make_roster, timed
+from matching import MatchEngine
+from store import Store
+
+
+STATUSES = ["pending", "in-progress", "completed"]
+
+
+def make_tasks(count: int, skills: int, seed: int = 5):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(i),
+            "status": rng.choice(STATUSES),
+            "requiredSkills": [f"skill-{rng.randrange(skills)}" for _ in range(rng.choice([1, 2, 3]))],
+        }
+        for i in range(count)
+    ]
+
+
+def make_performance(users, seed: int = 9):
+    rng = random.Random(seed)
+    return [
+        {
+            "employeeId": user["id"],
+            "completionRate": rng.randint(60, 100),
+            "onTimeDeliveryRate": rng.randint(60, 100),
+            "qualityScore": round(rng.uniform(3, 5), 1),
+            "tasksCompleted": rng.randint(50, 200),
+            "skillsUsed": [{"skillId": s["skillId"], "count": rng.randint(0, 50)} for s in user["skills"]],
+        }
+        for user in users
+    ]
+
+
+def rescan(store: Store):
+    """Demand and supply from a pass over every record"""
+    demand = Counter()
+    for task in store.tasks.all():
+        if task.get("status") != "completed":
+            demand.update(task.get("requiredSkills") or ())
+    supply = Counter()
+    for user in store.users.all():
+        supply.update(s["skillId"] for s in user.get("skills") or ())
+    return [
+        {"skillId": s["id"], "demand": demand[s["id"]], "supply": supply[s["id"]],
+         "gap": max(demand[s["id"]] - supply[s["id"]], 0)}
+        for s in store.skills.all()
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    users, skills = make_roster(args.employees, args.skills, 6)
+    store = Store()
+    store.load(users=users, tasks=make_tasks(args.tasks, args.skills), skills=skills,
+               performance=make_performance(users))
+    engine = AnalyticsEngine(store, MatchEngine(store))
+    engine.analytics()
+
+    rng = random.Random(1)
+
+    def mutate_and_read():
+        store.tasks.update(str(rng.randrange(args.tasks)), {"status": rng.choice(STATUSES)})
+        engine.analytics()
+
+    cached_ms = timed(engine.analytics, args.repeat)
+    mutated_ms = timed(mutate_and_read, args.repeat)
+    rescan_ms = timed(lambda: rescan(store), 3)
+
+    print(f"{args.tasks} tasks, {args.employees} employees, {args.skills} skills")
+    print(f"  cached read:                {cached_ms:10.4f} ms")
+    print(f"  mutation + recompute:       {mutated_ms:10.2f} ms")
+    print(f"  full rescan (demand only):  {rescan_ms:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Batch assignment benchmark: one regret-ordered plan vs N sequential greedy picks.
+
+Greedy mimics assigning tasks one at a time through /tasks/match: each task,
+in arrival order, takes the best feasible employee at that moment. Both use
+the same constraints. Run from the backend directory:
+    python -m benchmarks.bench_assignment --tasks 2000 --employees 600
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from assignment import SHIFT_MINUTES, BatchPlanner, task_window
+from benchmarks.bench_matching import make_roster
+from matching import WORKLOAD_WEIGHT, MatchEngine
+from store import Store
+
+
+def make_tasks(count: int, skills: int, seed: int = 11):
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(count):
+        start = rng.randrange(6 * 60, 14 * 60, 15)
+        duration = rng.choice([30, 45, 60, 90, 120])
+        end = start + duration
+        tasks.append({
+            "id": f"t{i}",
+            "dueDate": "2025-10-20",
+            "startTime": f"{start // 60:02d}:{start % 60:02d}",
+            "endTime": f"{end // 60:02d}:{end % 60:02d}",
+            # A skewed skill mix: a few skills are in heavy demand
+            "requiredSkills": [f"skill-{min(int(rng.expovariate(0.15)), skills - 1)}"
+                               for _ in range(rng.choice([1, 1, 2]))],
+        })
+    return tasks
+
+
+def greedy(engine: MatchEngine, tasks, cap: float, min_skill: float):
+    """Each task in arrival order takes the employee with the best match score right now"""
+    planner = BatchPlanner(engine, cap, min_skill)
+    placed = {}
+    for i, task in enumerate(tasks):
+        load = task_window(task)[1] / SHIFT_MINUTES * 100.0
+        feasible = np.isfinite(planner._candidates(task, load))
+        if not feasible.any():
+            continue
+        static, _ = planner._static_part(task)
+        match = np.where(feasible, static - WORKLOAD_WEIGHT * (planner.projected + load), -np.inf)
+        row = int(np.argmax(match))
+        placed[i] = row
+        planner._place(task, load, row, True)
+    return planner.summarize(tasks, placed), planner.projected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--employees", type=int, default=600)
+    parser.add_argument("--skills", type=int, default=40)
+    parser.add_argument("--cap", type=float, default=100.0)
+    parser.add_argument("--min-skill", type=float, default=50.0)
+    args = parser.parse_args()
+
+    users, skills = make_roster(args.employees, args.skills, 4)
+    for user in users:
+        user["shift"] = "Morning"
+        user["currentWorkload"] = random.Random(user["id"]).randint(0, 60)
+    store = Store()
+    store.load(users=users, skills=skills)
+    engine = MatchEngine(store)
+    engine.roster()
+    tasks = make_tasks(args.tasks, args.skills)
+
+    start = time.perf_counter()
+    g_plan, g_load = greedy(engine, tasks, args.cap, args.min_skill)
+    g_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    planner = BatchPlanner(engine, args.cap, args.min_skill)
+    plan = planner.plan(tasks)
+    p_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.tasks} tasks, {args.employees} employees, {args.skills} skills")
+    print(f"{'':>10} {'assigned':>9} {'objective':>11} {'avg score':>10} {'load stddev':>12} {'time':>10}")
+    for name, assigned, objective, load, ms in (
+        ("greedy", len(g_plan["assignments"]), g_plan["objective"], g_load, g_ms),
+        ("plan", len(plan["assignments"]), plan["objective"], planner.projected, p_ms),
+    ):
+        print(f"{name:>10} {assigned:>9} {objective:>11.1f} {objective / max(assigned, 1):>10.2f} "
+              f"{float(np.std(load)):>12.2f} {ms:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Bulk ingest benchmark: POST /tasks:batch vs one POST /tasks per task.
+
+Requests go through the ASGI app in process, with the SQLite backend in a
+temporary directory, so validation, listeners and commits are all counted.
+Run from the backend directory:
+    python -m benchmarks.bench_batch --tasks 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+
+def make_rows(count: int):
+    return [
+        {"title": f"Work order {i}", "description": "Imported from MES", "assignedTo": str(i % 8 + 1),
+         "priority": "medium", "startTime": "08:00", "endTime": "09:00", "dueDate": "2025-10-20",
+         "requiredSkills": ["skill-1"]}
+        for i in range(count)
+    ]
+
+
+async def run(tasks: int, single: int) -> None:
+    from httpx import AsyncClient
+    from app import app
+
+    rows = make_rows(tasks)
+    ndjson = "\n".join(json.dumps(r) for r in rows)
+    async with AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        r = await client.post("/tasks:batch", json=rows)
+        json_s = time.perf_counter() - start
+        assert r.json()["succeeded"] == tasks
+
+        start = time.perf_counter()
+        r = await client.post("/tasks:batch", content=ndjson, headers={"content-type": "application/x-ndjson"})
+        ndjson_s = time.perf_counter() - start
+        assert r.json()["succeeded"] == tasks
+
+        patch = [{"id": x["id"], "status": "in-progress"} for x in r.json()["results"]]
+        start = time.perf_counter()
+        r = await client.patch("/tasks:batch", json=patch)
+        patch_s = time.perf_counter() - start
+        assert r.json()["succeeded"] == tasks
+
+        start = time.perf_counter()
+        for row in rows[:single]:
+            await client.post("/tasks", json=row)
+        single_s = (time.perf_counter() - start) / single * tasks
+
+    print(f"{tasks} tasks")
+    print(f"  POST /tasks:batch (JSON array):    {json_s * 1000:8.0f} ms")
+    print(f"  POST /tasks:batch (NDJSON):        {ndjson_s * 1000:8.0f} ms")
+    print(f"  PATCH /tasks:batch:                {patch_s * 1000:8.0f} ms")
+    print(f"  POST /tasks one by one (est.):     {single_s * 1000:8.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--single", type=int, default=1000, help="individual POSTs to time and extrapolate")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["OPTIWORK_DB"] = os.path.join(tmp, "bench.db")
+        asyncio.run(run(args.tasks, args.single))
+
+
+if __name__ == "__main__":
+    main()
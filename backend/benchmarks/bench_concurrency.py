@@ -0,0 +1,114 @@
+"""
+Concurrent PATCH + GET stress test against the task handlers.
+
+Handlers are called from plain threads, as FastAPI's thread pool calls the
+sync endpoints. Writers keep title == description and move tasks between
+statuses and due dates; readers list filtered pages and check every record
+against the filter and that invariant. Any mismatch is a torn read.
+Run from the backend directory:
+    python -m benchmarks.bench_concurrency --writers 50 --readers 150 --seconds 5
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+
+os.environ.setdefault("OPTIWORK_DB", ":memory:")
+
+from fastapi import HTTPException  # noqa: E402
+
+import app  # noqa: E402
+
+STATUSES = ["pending", "in-progress", "completed"]
+DATES = [f"2025-10-{d:02d}" for d in range(1, 29)]
+
+
+def seed(tasks: int) -> None:
+    rng = random.Random(1)
+    app.store.load(tasks=[
+        {"id": f"{i:06d}", "title": "v0", "description": "v0", "status": rng.choice(STATUSES),
+         "dueDate": rng.choice(DATES), "assignedTo": str(i % 50)}
+        for i in range(tasks)
+    ])
+
+
+def writer(stop: threading.Event, counts: dict, seed_value: int, tasks: int) -> None:
+    rng = random.Random(seed_value)
+    n = 0
+    while not stop.is_set():
+        n += 1
+        roll = rng.random()
+        try:
+            if roll < 0.05:
+                app.create_task({"title": f"w{seed_value}-{n}", "description": f"w{seed_value}-{n}",
+                                 "dueDate": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"})
+            elif roll < 0.08:
+                app.delete_task(f"{rng.randrange(tasks):06d}")
+            else:
+                version = f"w{seed_value}-{n}"
+                app.update_task(f"{rng.randrange(tasks):06d}", {
+                    "title": version, "description": version,
+                    "status": rng.choice(STATUSES), "dueDate": rng.choice(DATES),
+                })
+        except HTTPException:
+            pass
+        except Exception:
+            counts["errors"] += 1
+        counts["writes"] += 1
+
+
+def reader(stop: threading.Event, counts: dict, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    while not stop.is_set():
+        status = rng.choice(STATUSES)
+        low, high = sorted(rng.sample(DATES, 2))
+        try:
+            response = app.list_tasks(status=status, assignedTo=None, priority=None, dueDate=None,
+                                      dueFrom=low, dueTo=high, cursor=None, limit=200, fields=None)
+            page = json.loads(response.body)
+            for task in page:
+                if task["status"] != status or not low <= task["dueDate"] <= high \
+                        or task["title"] != task["description"]:
+                    counts["torn"] += 1
+        except Exception:
+            counts["errors"] += 1
+        counts["reads"] += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--writers", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=150)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    seed(args.tasks)
+    stop = threading.Event()
+    counts = [dict(writes=0, reads=0, torn=0, errors=0) for _ in range(args.writers + args.readers)]
+    threads = [threading.Thread(target=writer, args=(stop, counts[i], i, args.tasks)) for i in range(args.writers)]
+    threads += [threading.Thread(target=reader, args=(stop, counts[args.writers + i], i))
+                for i in range(args.readers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    # Count before joining: with this many busy threads the joins themselves are slow
+    total = {k: sum(c[k] for c in counts) for k in counts[0]}
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for t in threads:
+        t.join()
+    total["torn"] = sum(c["torn"] for c in counts)
+    total["errors"] = sum(c["errors"] for c in counts)
+    print(f"{args.tasks} tasks, {args.writers} writer and {args.readers} reader threads, {elapsed:.1f}s")
+    print(f"  writes/s:    {total['writes'] / elapsed:10.0f}")
+    print(f"  reads/s:     {total['reads'] / elapsed:10.0f}   (filtered pages of up to 200)")
+    print(f"  torn reads:  {total['torn']:10d}")
+    print(f"  errors:      {total['errors']:10d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Task id generator stress test: throughput and duplicates across threads and processes.
+
+Each process gets its own worker number, as each uvicorn worker would.
+Run from the backend directory:
+    python -m benchmarks.bench_ids --per-process 1000000 --processes 4
+"""
+import argparse
+import multiprocessing
+import threading
+import time
+
+from ids import IdGenerator
+
+
+def generate(args):
+    worker, count, bulk = args
+    gen = IdGenerator(worker)
+    start = time.perf_counter()
+    if bulk:
+        ids = []
+        for _ in range(count // 1000):
+            ids.extend(gen.next_ids(1000))
+    else:
+        ids = [gen.next_int() for _ in range(count)]
+    return ids, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-process", type=int, default=1_000_000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    n = args.per_process
+
+    ids, seconds = generate((0, n, False))
+    print(f"single thread next_int:      {n / seconds / 1e6:6.2f} M ids/s")
+    ids, seconds = generate((0, n, True))
+    print(f"single thread next_ids(1000): {n / seconds / 1e6:6.2f} M ids/s")
+
+    gen = IdGenerator(1)
+    out = [[] for _ in range(args.threads)]
+    threads = [threading.Thread(target=lambda o=o: o.extend(gen.next_int() for _ in range(n // args.threads)))
+               for o in out]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+    every = [x for o in out for x in o]
+    print(f"{args.threads} threads, one generator:  {len(every) / seconds / 1e6:6.2f} M ids/s, "
+          f"{len(every) - len(set(every))} duplicates")
+
+    with multiprocessing.Pool(args.processes) as pool:
+        start = time.perf_counter()
+        results = pool.map(generate, [(w, n, False) for w in range(args.processes)])
+        seconds = time.perf_counter() - start
+    every = [x for ids, _ in results for x in ids]
+    per_process = sum(len(ids) / s for ids, s in results)
+    print(f"{args.processes} processes:                {per_process / 1e6:6.2f} M ids/s combined, "
+          f"{len(every)} ids, {len(every) - len(set(every))} duplicates")
+
+
+if __name__ == "__main__":
+    main()
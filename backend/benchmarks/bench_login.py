@@ -0,0 +1,66 @@
+"""
+Login microbenchmark: identifier lookup and password verification at 10k and 100k users.
+
+Run from the backend directory:
+    python -m benchmarks.bench_login
+"""
+import time
+from typing import Any, Callable, Dict, List
+
+from auth import hash_password
+from store import Store
+
+
+ROSTER_SIZES = (10_000, 100_000)
+LOOKUPS = 2_000
+
+
+def make_users(count: int, encoded: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": str(i),
+            "employeeId": f"EMP{i:06d}",
+            "email": f"emp{i}@company.com",
+            "role": "employee",
+            "password": encoded,
+        }
+        for i in range(count)
+    ]
+
+
+def linear_login(users: List[Dict[str, Any]], username: str, password: str):
+    """The previous implementation: scan every user and compare plaintext"""
+    for user in users:
+        if username in [user.get("id"), user.get("employeeId"), user.get("email")]:
+            return user if user.get("password") == password else None
+    return None
+
+
+def per_call_us(func: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    encoded = hash_password("shift-change")
+    print(f"{'users':>8} {'linear scan':>14} {'index lookup':>14} {'verify cold':>14} {'verify warm':>14}")
+    for count in ROSTER_SIZES:
+        users = make_users(count, encoded)
+        plain = [dict(u, password="shift-change") for u in users]
+        store = Store()
+        store.load(users=users)
+        # Worst case for the scan: the last badge on the roster
+        username = f"EMP{count - 1:06d}"
+
+        scan = per_call_us(lambda: linear_login(plain, username, "shift-change"), 20)
+        lookup = per_call_us(lambda: store.users.find_one("login", username), LOOKUPS)
+        cold = per_call_us(lambda: store.credentials.set(str(count - 1), encoded) or
+                           store.authenticate(username, "shift-change"), 5)
+        warm = per_call_us(lambda: store.authenticate(username, "shift-change"), LOOKUPS)
+        print(f"{count:>8} {scan:>12.1f}us {lookup:>12.2f}us {cold:>12.1f}us {warm:>12.2f}us")
+
+
+if __name__ == "__main__":
+    main()
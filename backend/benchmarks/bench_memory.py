@@ -0,0 +1,76 @@
+"""
+Task memory: compact slotted records vs one dict per task.
+
+Loads generated tasks into a store with and without the compact task
+codec and reports traced bytes per task, load time, read latency and
+update throughput. Run from the backend directory:
+    python -m benchmarks.bench_memory --tasks 100000
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from data.generator import DatasetGenerator
+from store import Store
+
+
+def measure(compact: bool, users: int, tasks: int, reads: int, updates: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    store = Store(compact_tasks=compact)
+    records = list(DatasetGenerator(users=users, tasks=tasks, seed=1).tasks())
+    start = time.perf_counter()
+    store.tasks.load(records)
+    load_seconds = time.perf_counter() - start
+    del records
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    rng = random.Random(5)
+    keys = store.tasks.snapshot().sorted_keys()
+    sample = [rng.choice(keys) for _ in range(reads)]
+    start = time.perf_counter()
+    for key in sample:
+        store.tasks.get(key)
+    get_us = (time.perf_counter() - start) / reads * 1e6
+
+    start = time.perf_counter()
+    store.tasks.all()
+    all_ms = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    for key in sample[:updates]:
+        store.tasks.update(key, {"status": rng.choice(("pending", "in-progress", "completed"))})
+    update_rate = updates / (time.perf_counter() - start)
+    return {
+        "bytes_per_task": held / tasks,
+        "load_s": load_seconds,
+        "get_us": get_us,
+        "all_ms": all_ms,
+        "updates_per_s": update_rate,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=20_000)
+    parser.add_argument("--updates", type=int, default=20_000)
+    args = parser.parse_args()
+
+    results = {}
+    for label, compact in (("dict per task", False), ("compact", True)):
+        results[label] = r = measure(compact, args.users, args.tasks, args.reads, min(args.updates, args.reads))
+        print(f"{label:>14}: {r['bytes_per_task']:7.0f} B/task  load {r['load_s']:5.2f}s  "
+              f"get {r['get_us']:5.2f}us  all() {r['all_ms']:7.1f}ms  {r['updates_per_s']:8.0f} updates/s")
+    saved = 1 - results["compact"]["bytes_per_task"] / results["dict per task"]["bytes_per_task"]
+    print(f"compact layout holds {saved:.0%} less task memory")
+
+
+if __name__ == "__main__":
+    main()
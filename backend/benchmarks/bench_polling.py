@@ -0,0 +1,102 @@
+"""
+Bytes on the wire for a dashboard polling the 8 list endpoints.
+
+Each cycle fetches every endpoint once; every `--write-every` cycles a task
+is updated first. The plain client always gets full uncompressed bodies;
+the caching client revalidates with If-None-Match and accepts gzip (and br
+when the brotli module is installed); the bootstrap client does the same
+with one /bootstrap request per cycle. Bytes count the body as sent plus
+the response header lines. Run from the backend directory:
+    python -m benchmarks.bench_polling --users 2000 --tasks 20000 --cycles 60
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+os.environ.setdefault("OPTIWORK_DB", ":memory:")
+
+from httpx import AsyncClient  # noqa: E402
+
+import app  # noqa: E402
+from data.mockData import mockUsers  # noqa: E402
+
+ENDPOINTS = ["/users", "/tasks", "/skills", "/reports", "/analytics", "/training-suggestions",
+             "/skill-gaps", "/performance"]
+STATUSES = ["pending", "in-progress", "completed"]
+
+
+def seed(users: int, tasks: int) -> None:
+    rng = random.Random(5)
+    template = next(u for u in mockUsers if u.get("skills"))
+    employees = []
+    for i in range(users):
+        user = {k: v for k, v in template.items() if k != "password"}
+        user.update(id=f"u{i}", employeeId=f"EMP{i:06d}", email=f"user{i}@optiwork.com")
+        employees.append(user)
+    with app.store.batch():
+        app.store.users.load(employees)
+        app.store.tasks.load(
+            {"id": f"t{i:07d}", "title": f"Task {i}", "assignedTo": f"u{rng.randrange(users)}",
+             "status": rng.choice(STATUSES), "priority": "medium",
+             "dueDate": f"2025-10-{rng.randint(1, 28):02d}", "requiredSkills": ["1"]}
+            for i in range(tasks)
+        )
+
+
+def wire_bytes(response) -> int:
+    headers = sum(len(k) + len(v) + 4 for k, v in response.headers.raw)
+    return response.num_bytes_downloaded + headers + 17
+
+
+async def poll(cycles: int, write_every: int, conditional: bool, endpoints=ENDPOINTS) -> tuple:
+    rng = random.Random(9)
+    etags = {}
+    total = statuses_304 = 0
+    start = time.perf_counter()
+    async with AsyncClient(app=app.app, base_url="http://bench") as client:
+        for cycle in range(cycles):
+            if cycle and cycle % write_every == 0:
+                await client.patch(f"/tasks/t{rng.randrange(10):07d}", json={"status": rng.choice(STATUSES)})
+            for path in endpoints:
+                if conditional:
+                    headers = {"Accept-Encoding": "br, gzip"}
+                    if path in etags:
+                        headers["If-None-Match"] = etags[path]
+                else:
+                    headers = {"Accept-Encoding": "identity"}
+                response = await client.get(path, headers=headers)
+                total += wire_bytes(response)
+                statuses_304 += response.status_code == 304
+                if "etag" in response.headers:
+                    etags[path] = response.headers["etag"]
+    return total, statuses_304, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--cycles", type=int, default=60)
+    parser.add_argument("--write-every", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.users, args.tasks)
+    plain, _, plain_time = asyncio.run(poll(args.cycles, args.write_every, conditional=False))
+    cached, not_modified, cached_time = asyncio.run(poll(args.cycles, args.write_every, conditional=True))
+    combined, combined_304, combined_time = asyncio.run(
+        poll(args.cycles, args.write_every, conditional=True, endpoints=["/bootstrap"])
+    )
+    requests = args.cycles * len(ENDPOINTS)
+    print(f"{args.cycles} polling cycles over {len(ENDPOINTS)} endpoints, {args.users} users, {args.tasks} tasks,"
+          f" a task update every {args.write_every} cycles")
+    print(f"  plain:       {plain / 1e6:10.2f} MB   {plain_time:6.2f}s")
+    print(f"  caching:     {cached / 1e6:10.2f} MB   {cached_time:6.2f}s   {not_modified}/{requests} answered 304")
+    print(f"  bootstrap:   {combined / 1e6:10.2f} MB   {combined_time:6.2f}s   "
+          f"{combined_304}/{args.cycles} answered 304")
+    print(f"  reduction:   {plain / cached:10.1f}x caching, {plain / combined:.1f}x bootstrap")
+
+
+if __name__ == "__main__":
+    main()
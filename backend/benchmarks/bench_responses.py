@@ -0,0 +1,82 @@
+"""
+Cost of serving an unchanged collection: re-encoding vs cached bytes vs 304.
+
+Encoding is timed on its own (jsonable_encoder + stdlib json, as FastAPI
+does for a returned list, against orjson and the encoded cache), then
+whole requests go through the app in-process with httpx.
+Run from the backend directory:
+    python -m benchmarks.bench_responses --users 5000 --requests 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("OPTIWORK_DB", ":memory:")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from httpx import AsyncClient  # noqa: E402
+
+import app  # noqa: E402
+from data.mockData import mockUsers  # noqa: E402
+from responses import dumps  # noqa: E402
+
+
+def seed(users: int) -> None:
+    template = next(u for u in mockUsers if u.get("skills"))
+    records = []
+    for i in range(users):
+        user = {k: v for k, v in template.items() if k != "password"}
+        user.update(id=f"u{i}", employeeId=f"EMP{i:06d}", email=f"user{i}@optiwork.com")
+        records.append(user)
+    app.store.users.load(records)
+
+
+def per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+async def per_request(client: AsyncClient, requests: int, headers: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get("/users", headers=headers)
+    return (time.perf_counter() - start) / requests
+
+
+async def requests_(count: int) -> tuple:
+    async with AsyncClient(app=app.app, base_url="http://bench") as client:
+        first = await client.get("/users")
+        etag = first.headers["etag"]
+        cached = await per_request(client, count, {})
+        not_modified = await per_request(client, count, {"If-None-Match": etag})
+        return len(first.content), cached, not_modified
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    seed(args.users)
+    users = app.store.users.all()
+    repeat = max(3, args.requests // 30)
+    stdlib = per_call(lambda: json.dumps(jsonable_encoder(users)).encode(), repeat)
+    fast = per_call(lambda: dumps(users), repeat)
+    hit = per_call(lambda: app.encoded.get("users", app.store.users.version, app.store.users.all), args.requests)
+    size, cached, not_modified = asyncio.run(requests_(args.requests))
+
+    print(f"/users with {args.users} users ({size / 1024:.0f} KiB)")
+    print(f"  jsonable_encoder + json:  {stdlib * 1000:9.2f} ms per encode")
+    print(f"  orjson:                   {fast * 1000:9.2f} ms per encode")
+    print(f"  encoded cache hit:        {hit * 1000:9.4f} ms")
+    print(f"  GET, cached body:         {cached * 1000:9.2f} ms per request")
+    print(f"  GET, If-None-Match (304): {not_modified * 1000:9.2f} ms per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Storage write throughput: batched commits vs a commit per write.
+
+Every write goes through the store, so indexes, the change log and the
+storage listener are all included. Run from the backend directory:
+    python -m benchmarks.bench_storage --writes 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from storage import SQLiteStorage, attach_storage
+from store import Store
+
+
+def run(path: str, writes: int, batch_size: int, flush_interval: float, shared: bool = False) -> float:
+    storage = SQLiteStorage(path, batch_size=batch_size, flush_interval=flush_interval, shared=shared)
+    store = Store()
+    attach_storage(store, storage)
+    rng = random.Random(3)
+    start = time.perf_counter()
+    for i in range(writes):
+        key = str(rng.randrange(writes // 2))
+        if key in store.tasks:
+            store.tasks.update(key, {"status": rng.choice(["pending", "in-progress", "completed"])})
+        else:
+            store.tasks.insert({"id": key, "title": f"Task {key}", "assignedTo": str(i % 50),
+                                "status": "pending", "dueDate": "2025-10-20"})
+    storage.close()
+    return writes / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batched = run(os.path.join(tmp, "batched.db"), args.writes, 1000, 0.05)
+        shared = run(os.path.join(tmp, "shared.db"), args.writes, 1000, 0.05, shared=True)
+        single = run(os.path.join(tmp, "single.db"), args.writes // 10, 1, 0)
+
+    print(f"{args.writes} task writes through the store into SQLite (WAL)")
+    print(f"  batched commits:     {batched:10.0f} writes/s")
+    print(f"  batched, shared log: {shared:10.0f} writes/s")
+    print(f"  commit per write:    {single:10.0f} writes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+GET throughput with 1 to N uvicorn worker processes sharing one SQLite file.
+
+Seeds a temporary database, then for each worker count starts
+`uvicorn app:app --workers N` on it and drives a filtered task list with
+client processes over keep-alive connections. After each run a PATCH sent
+to one worker is read back through fresh connections (spread over the
+workers by the kernel) to time how long the change feed takes to reach
+all of them. Scaling needs as many free cores as workers plus clients.
+Run from the backend directory:
+    python -m benchmarks.bench_workers --max-workers 4 --clients 8 --seconds 5
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATH = "/tasks?status=pending&limit=50"
+STATUSES = ["pending", "in-progress", "completed"]
+
+
+def seed(path: str, tasks: int) -> str:
+    """Seed the database in a child process; returns the id of a task to patch"""
+    script = (
+        "import app\n"
+        f"with app.store.batch():\n"
+        f"    for i in range({tasks}):\n"
+        "        app.store.tasks.insert({'id': 'bench%07d' % i, 'title': 'Task %d' % i,"
+        f" 'status': {STATUSES!r}[i % 3], 'dueDate': '2025-10-%02d' % (i % 28 + 1)}})\n"
+    )
+    env = {**os.environ, "OPTIWORK_DB": path}
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND, env=env, check=True)
+    return "bench0000000"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(path: str, workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "OPTIWORK_DB": path}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=BACKEND, env=env,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            # Give the remaining workers time to finish loading the store
+            time.sleep(1 + workers * 0.5)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def client(port: int, connections: int, seconds: float, results) -> None:
+    conns = [http.client.HTTPConnection("127.0.0.1", port) for _ in range(connections)]
+    done = errors = 0
+    stop = time.perf_counter() + seconds
+    while time.perf_counter() < stop:
+        conn = conns[done % connections]
+        conn.request("GET", PATH)
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            done += 1
+        else:
+            errors += 1
+    results.put((done, errors))
+
+
+def propagation(port: int, task_id: str, readers: int) -> float:
+    """Seconds until a PATCH through one connection is visible through `readers` fresh ones"""
+    title = f"patched {time.time_ns()}"
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("PATCH", f"/tasks/{task_id}", json.dumps({"title": title}), {"Content-Type": "application/json"})
+    conn.getresponse().read()
+    start = time.perf_counter()
+    pending = readers
+    while pending and time.perf_counter() - start < 10:
+        reader = http.client.HTTPConnection("127.0.0.1", port)
+        reader.request("GET", f"/tasks/{task_id}")
+        body = json.loads(reader.getresponse().read())
+        reader.close()
+        if body.get("title") == title:
+            pending -= 1
+        else:
+            pending = readers
+    return time.perf_counter() - start
+
+
+def run(path: str, workers: int, clients: int, connections: int, seconds: float, task_id: str):
+    port = free_port()
+    server = start_server(path, workers, port)
+    try:
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=client, args=(port, connections, seconds, results))
+                 for _ in range(clients)]
+        for p in procs:
+            p.start()
+        totals = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+        done = sum(t[0] for t in totals)
+        errors = sum(t[1] for t in totals)
+        lag = propagation(port, task_id, readers=4 * workers)
+    finally:
+        server.terminate()
+        server.wait()
+    return done / seconds, errors, lag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--connections", type=int, default=4, help="keep-alive connections per client")
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "optiwork.db")
+        task_id = seed(path, args.tasks)
+        print(f"GET {PATH} over {args.tasks} tasks, {args.clients} client processes, {os.cpu_count()} cores")
+        print(f"  {'workers':>7}  {'req/s':>9}  {'speedup':>7}  {'errors':>6}  {'PATCH visible everywhere':>24}")
+        base = None
+        workers = 1
+        while workers <= args.max_workers:
+            rate, errors, lag = run(path, workers, args.clients, args.connections, args.seconds, task_id)
+            base = base or rate
+            print(f"  {workers:7d}  {rate:9.0f}  {rate / base:6.2f}x  {errors:6d}  {lag * 1000:21.1f} ms")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Load harness for /stream: one uvicorn worker holding thousands of idle SSE subscribers.
+
+Opens subscribers in stages, records the server's resident memory after each
+stage, then patches a task and times how long the event takes to reach every
+subscriber. Linux only (reads /proc). Run from the backend directory:
+    python -m benchmarks.stream_load --subscribers 1000 2000 4000
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import List, Tuple
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def raise_fd_limit(wanted: int) -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+
+async def open_subscriber(port: int) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /stream HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nAccept: text/event-stream\r\n\r\n".encode())
+    await writer.drain()
+    # Status line, headers and the initial retry hint
+    await reader.readuntil(b"retry: 5000\n\n")
+    # Keep the writer alive too: dropping it closes the connection
+    return reader, writer
+
+
+async def wait_for_event(reader: asyncio.StreamReader) -> float:
+    await reader.readuntil(b"event: task.updated")
+    return time.perf_counter()
+
+
+def patch_task(port: int, task_id: str, status: str) -> None:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/tasks/{task_id}",
+        data=json.dumps({"status": status}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="PATCH",
+    )
+    urllib.request.urlopen(request).read()
+
+
+async def run(port: int, stages: List[int], server_pid: int) -> None:
+    connections: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+    print(f"{'subscribers':>12} {'server RSS':>12} {'KB/subscriber':>14} {'fan-out':>10}")
+    baseline = rss_mb(server_pid)
+    print(f"{0:>12} {baseline:>10.1f}MB {'':>14} {'':>10}")
+
+    for target in stages:
+        while len(connections) < target:
+            batch = min(500, target - len(connections))
+            connections.extend(await asyncio.gather(*(open_subscriber(port) for _ in range(batch))))
+        await asyncio.sleep(0.5)
+        rss = rss_mb(server_pid)
+        per_sub = (rss - baseline) * 1024 / len(connections)
+
+        waiters = [asyncio.ensure_future(wait_for_event(reader)) for reader, _ in connections]
+        start = time.perf_counter()
+        await asyncio.to_thread(patch_task, port, "1", "in-progress" if target % 2 else "pending")
+        done = await asyncio.gather(*waiters)
+        fan_out_ms = (max(done) - start) * 1000
+        print(f"{len(connections):>12} {rss:>10.1f}MB {per_sub:>12.1f}KB {fan_out_ms:>8.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1000, 2000, 4000])
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    raise_fd_limit(max(args.subscribers) * 2 + 256)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(args.port),
+         "--log-level", "warning", "--backlog", "4096"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{args.port}/health").read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        asyncio.run(run(args.port, args.subscribers, server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Benchmark suite: every API endpoint at realistic scale, in-process and over a socket.
+
+For each scale a SQLite database is seeded by data/generator.py with
+synthetic skills, users, tasks and performance records. Each mode then
+opens a fresh copy of it:
+
+  asgi    the app is imported in a child process and driven through
+          httpx's ASGI transport (no network, no server loop)
+  socket  `uvicorn app:app` serves the copy on a local port and is driven
+          over HTTP/1.1 keep-alive connections
+
+Every endpoint gets `--requests` requests (full-collection endpoints a
+twentieth of that) from `--concurrency` concurrent clients; reads run
+before writes. Throughput, latency percentiles, bytes and errors are
+reported per endpoint, with the app's load time and resident memory.
+/stream, /stream/ws and /reset are left out: see stream_load.py for the
+stream, and /reset would replace the dataset. Results are written as JSON;
+pass an earlier file to --compare to see what changed.
+Linux only (reads /proc). Run from the backend directory:
+    python -m benchmarks.suite --scale small --modes asgi socket
+    python -m benchmarks.suite --scale small medium --output before.json
+    python -m benchmarks.suite --scale small medium --compare before.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.bench_workers import BACKEND, free_port, start_server
+from data.generator import DEPARTMENTS, EMPLOYEE_PASSWORD, END_DATE, SHIFTS, DatasetGenerator, write_sqlite
+from storage import COLLECTIONS
+
+SCALES = {
+    "small": (1_000, 10_000),
+    "medium": (10_000, 100_000),
+    "large": (100_000, 1_000_000),
+}
+
+
+# ---------------- Dataset ----------------
+def seed_database(path: str, users: int, tasks: int, seed: int) -> None:
+    """Write a synthetic dataset to a new SQLite database (runs in a child process)"""
+    write_sqlite(DatasetGenerator(users, tasks, seed), path, COLLECTIONS)
+
+
+# ---------------- Endpoints ----------------
+class Endpoint:
+    """One benchmarked request shape; `request(rng)` returns (method, path, json body)"""
+
+    def __init__(
+        self,
+        name: str,
+        request: Callable[[random.Random], Tuple[str, str, Any]],
+        heavy: bool = False,
+        on_response: Optional[Callable[[httpx.Response], None]] = None,
+    ):
+        self.name = name
+        self.request = request
+        # Full-collection responses: far fewer requests
+        self.heavy = heavy
+        self.on_response = on_response
+
+
+def endpoints(users: int, tasks: int) -> List[Endpoint]:
+    user = lambda rng: DatasetGenerator.user_id(rng.randrange(users))  # noqa: E731
+    task = lambda rng: DatasetGenerator.task_id(rng.randrange(tasks))  # noqa: E731
+    day = lambda rng: (END_DATE - datetime.timedelta(days=rng.randrange(14))).isoformat()  # noqa: E731
+    get = lambda path: (lambda rng: ("GET", path(rng) if callable(path) else path, None))  # noqa: E731
+    created: List[str] = []
+
+    def create(rng):
+        return "POST", "/tasks", {"title": "Bench task", "assignedTo": user(rng), "priority": "medium",
+                                  "dueDate": day(rng), "requiredSkills": ["skill-1"]}
+
+    def delete(rng):
+        return "DELETE", f"/tasks/{created.pop() if created else task(rng)}", None
+
+    reads = [
+        Endpoint("GET /", get("/")),
+        Endpoint("GET /health", get("/health")),
+        Endpoint("GET /users", get("/users"), heavy=True),
+        Endpoint("GET /users?role", get("/users?role=manager")),
+        Endpoint("GET /users/{user_id}", get(lambda rng: f"/users/{user(rng)}")),
+        Endpoint("GET /tasks", get("/tasks"), heavy=True),
+        Endpoint("GET /tasks?assignedTo", get(lambda rng: f"/tasks?assignedTo={user(rng)}")),
+        Endpoint("GET /tasks?status&limit", get("/tasks?status=pending&limit=50")),
+        Endpoint("GET /tasks?dueFrom&dueTo&fields",
+                 get(lambda rng: f"/tasks?dueFrom={day(rng)}&dueTo={day(rng)}&limit=100&fields=title,status")),
+        Endpoint("GET /tasks/{task_id}", get(lambda rng: f"/tasks/{task(rng)}")),
+        Endpoint("GET /skills", get("/skills")),
+        Endpoint("GET /skills/{skill_id}", get("/skills/skill-1")),
+        Endpoint("GET /reports", get("/reports"), heavy=True),
+        Endpoint("GET /reports/{date}", get(lambda rng: f"/reports/{day(rng)}")),
+        Endpoint("GET /performance", get("/performance"), heavy=True),
+        Endpoint("GET /performance?department&limit", get("/performance?department=Assembly&limit=100")),
+        Endpoint("GET /performance/{employee_id}", get(lambda rng: f"/performance/{user(rng)}")),
+        Endpoint("GET /analytics", get("/analytics"), heavy=True),
+        Endpoint("GET /skill-gaps", get("/skill-gaps"), heavy=True),
+        Endpoint("GET /heatmap", get("/heatmap")),
+        Endpoint("GET /heatmap?team&shift&skill", get(
+            lambda rng: f"/heatmap?team={rng.choice(DEPARTMENTS)}&shift={rng.choice(SHIFTS)}&skill=skill-{rng.randint(1, 8)}"
+        )),
+        Endpoint("GET /leaderboard", get("/leaderboard")),
+        Endpoint("GET /leaderboard?metric&offset", get(lambda rng: f"/leaderboard?metric=onTime&offset={rng.randrange(users)}")),
+        Endpoint("GET /leaderboard/{employee_id}", get(lambda rng: f"/leaderboard/{user(rng)}?metric=quality")),
+        Endpoint("GET /training-suggestions", get("/training-suggestions")),
+        Endpoint("GET /training-suggestions/{employee_id}", get(lambda rng: f"/training-suggestions/{user(rng)}")),
+        Endpoint("GET /bootstrap", get("/bootstrap"), heavy=True),
+        Endpoint("GET /bootstrap/employee/{employee_id}", get(lambda rng: f"/bootstrap/employee/{user(rng)}")),
+        Endpoint("GET /sync", get("/sync"), heavy=True),
+        Endpoint("GET /metrics", get("/metrics")),
+        Endpoint("POST /login", lambda rng: ("POST", "/login", {
+            "username": DatasetGenerator.employee_id(rng.randrange(min(users, 50))), "password": EMPLOYEE_PASSWORD,
+        })),
+        Endpoint("POST /tasks/match", lambda rng: ("POST", "/tasks/match",
+                                                   {"requiredSkills": ["skill-1", "skill-6"], "limit": 10})),
+        Endpoint("POST /tasks/plan", lambda rng: ("POST", "/tasks/plan",
+                                                  {"taskIds": [task(rng) for _ in range(20)], "apply": False})),
+    ]
+    writes = [
+        # Tasks created here are the ones DELETE removes
+        Endpoint("POST /tasks", create, on_response=lambda response: created.append(response.json()["id"])),
+        Endpoint("PATCH /tasks/{task_id}", lambda rng: ("PATCH", f"/tasks/{task(rng)}",
+                                                        {"status": rng.choice(["in-progress", "completed"])})),
+        Endpoint("POST /tasks:batch", lambda rng: ("POST", "/tasks:batch", [create(rng)[2] for _ in range(50)])),
+        Endpoint("PATCH /tasks:batch", lambda rng: ("PATCH", "/tasks:batch",
+                                                    [{"id": task(rng), "priority": "high"} for _ in range(50)])),
+        Endpoint("DELETE /tasks/{task_id}", delete),
+    ]
+    return reads + writes
+
+
+# ---------------- Driver ----------------
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def drive(client: httpx.AsyncClient, endpoint: Endpoint, count: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = received = 0
+    remaining = count
+
+    async def worker() -> None:
+        nonlocal remaining, errors, received
+        while remaining > 0:
+            remaining -= 1
+            method, path, body = endpoint.request(rng)
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            received += len(response.content)
+            if response.status_code >= 400:
+                errors += 1
+            elif endpoint.on_response is not None:
+                endpoint.on_response(response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput": round(count / elapsed, 1),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "bytes_per_request": received // count,
+    }
+
+
+async def drive_all(client: httpx.AsyncClient, users: int, tasks: int, args) -> Dict[str, dict]:
+    results = {}
+    for i, endpoint in enumerate(endpoints(users, tasks)):
+        if args.endpoints and not any(part in endpoint.name for part in args.endpoints):
+            continue
+        count = max(5, args.requests // 20) if endpoint.heavy else args.requests
+        # One warm-up request fills the caches a steady-state poller would hit
+        method, path, body = endpoint.request(random.Random(-1))
+        if method == "GET":
+            await client.request(method, path)
+        results[endpoint.name] = await drive(client, endpoint, count, args.concurrency, args.seed + i)
+    return results
+
+
+def memory_mb(pid: int) -> Dict[str, float]:
+    """Resident set now and at its peak (VmHWM)"""
+    values = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                values["rss_mb" if line.startswith("VmRSS") else "peak_rss_mb"] = round(int(line.split()[1]) / 1024, 1)
+    return values
+
+
+def run_asgi(path: str, users: int, tasks: int, args, results) -> None:
+    """Import the app on a copy of the database and drive it in-process (runs in a child process)"""
+    os.environ["OPTIWORK_DB"] = path
+    sys.path.insert(0, BACKEND)
+    start = time.perf_counter()
+    import app
+    load_seconds = time.perf_counter() - start
+
+    async def main() -> Dict[str, dict]:
+        transport = httpx.ASGITransport(app=app.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            return await drive_all(client, users, tasks, args)
+
+    endpoint_results = asyncio.run(main())
+    results.put({"load_seconds": round(load_seconds, 2), "memory": memory_mb(os.getpid()),
+                 "endpoints": endpoint_results})
+
+
+def run_socket(path: str, users: int, tasks: int, args) -> dict:
+    port = free_port()
+    start = time.perf_counter()
+    server = start_server(path, 1, port)
+    load_seconds = time.perf_counter() - start
+
+    async def main() -> Dict[str, dict]:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=None) as client:
+            return await drive_all(client, users, tasks, args)
+
+    try:
+        endpoint_results = asyncio.run(main())
+        memory = memory_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+    # Includes the fixed settle delay of start_server
+    return {"load_seconds": round(load_seconds, 2), "memory": memory, "endpoints": endpoint_results}
+
+
+def run_scale(users: int, tasks: int, args, context) -> List[dict]:
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = os.path.join(tmp, "seed.db")
+        start = time.perf_counter()
+        seeder = context.Process(target=seed_database, args=(seeded, users, tasks, args.seed))
+        seeder.start()
+        seeder.join()
+        if seeder.exitcode:
+            raise RuntimeError("seeding failed")
+        seed_seconds = time.perf_counter() - start
+        print(f"{users} users, {tasks} tasks: seeded in {seed_seconds:.1f}s")
+        for mode in args.modes:
+            path = os.path.join(tmp, f"{mode}.db")
+            shutil.copy(seeded, path)
+            if mode == "asgi":
+                queue = context.Queue()
+                child = context.Process(target=run_asgi, args=(path, users, tasks, args, queue))
+                child.start()
+                result = queue.get()
+                child.join()
+            else:
+                result = run_socket(path, users, tasks, args)
+            run = {"mode": mode, "users": users, "tasks": tasks, "seed_seconds": round(seed_seconds, 2), **result}
+            report(run)
+            runs.append(run)
+    return runs
+
+
+# ---------------- Reporting ----------------
+def report(run: dict) -> None:
+    memory = run["memory"]
+    print(f"  {run['mode']}: loaded in {run['load_seconds']:.1f}s, RSS {memory['rss_mb']:.0f} MB"
+          f" (peak {memory['peak_rss_mb']:.0f} MB)")
+    print(f"    {'endpoint':<44} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'KiB':>8} {'err':>4}")
+    for name, r in run["endpoints"].items():
+        print(f"    {name:<44} {r['throughput']:9.1f} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f}"
+              f" {r['bytes_per_request'] / 1024:8.1f} {r['errors']:4d}")
+
+
+def compare(runs: List[dict], baseline_path: str, tolerance: float) -> None:
+    with open(baseline_path) as f:
+        baseline = {(r["mode"], r["users"], r["tasks"]): r for r in json.load(f)["runs"]}
+    print(f"\nAgainst {baseline_path} (changes beyond {tolerance:.0%} are marked)")
+    for run in runs:
+        before = baseline.get((run["mode"], run["users"], run["tasks"]))
+        print(f"  {run['mode']}, {run['users']} users, {run['tasks']} tasks")
+        if before is None:
+            print("    not in the baseline")
+            continue
+        for name, r in run["endpoints"].items():
+            old = before["endpoints"].get(name)
+            if old is None:
+                continue
+            p50 = r["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+            rate = r["throughput"] / old["throughput"] - 1 if old["throughput"] else 0.0
+            mark = "  <- slower" if p50 > tolerance else "  <- faster" if p50 < -tolerance else ""
+            print(f"    {name:<44} p50 {p50:+7.1%}   req/s {rate:+7.1%}{mark}")
+        rss = run["memory"]["rss_mb"] / before["memory"]["rss_mb"] - 1
+        print(f"    {'resident memory':<44} {rss:+7.1%}")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", nargs="+", choices=sorted(SCALES), default=["small"])
+    parser.add_argument("--users", type=int, help="custom scale (with --tasks) instead of --scale")
+    parser.add_argument("--tasks", type=int)
+    parser.add_argument("--modes", nargs="+", choices=["asgi", "socket"], default=["asgi", "socket"])
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--endpoints", nargs="+", help="only endpoints whose name contains one of these")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="JSON results file (default benchmarks/results/suite-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    scales = [(args.users, args.tasks)] if args.users and args.tasks else [SCALES[s] for s in args.scale]
+    # Children must import the app afresh, not inherit this process's state
+    context = multiprocessing.get_context("spawn")
+    commit = git_commit()
+    print(f"Python {platform.python_version()}, {os.cpu_count()} cores, commit {commit or 'unknown'}")
+    runs = []
+    for users, tasks in scales:
+        runs.extend(run_scale(users, tasks, args, context))
+
+    output = args.output or os.path.join(BACKEND, "benchmarks", "results", f"suite-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    meta = {
+        "commit": commit,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+    }
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "runs": runs}, f, indent=2)
+    print(f"\nResults written to {output}")
+    if args.compare:
+        compare(runs, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
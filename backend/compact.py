@@ -0,0 +1,154 @@
+import json
+import sys
+from operator import attrgetter
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library encoder is used instead
+    orjson = None
+
+Record = Dict[str, Any]
+
+# Scalar task fields kept in slots: read by indexes, reports, matching and planning
+TASK_HOT_FIELDS = (
+    "id", "title", "assignedTo", "assignedBy", "priority", "status", "startTime", "endTime",
+    "dueDate", "completedAt", "difficultyRating", "qualityRating", "requiredSkills",
+)
+# Few distinct values shared by many tasks: one string object each
+TASK_INTERNED_FIELDS = frozenset(("assignedTo", "assignedBy", "priority", "status", "startTime", "endTime", "dueDate"))
+SCALARS = (str, int, float, bool, type(None))
+# Distinct key orders remembered per codec; rarer ones get a layout each
+LAYOUT_CACHE_SIZE = 1024
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+# Slot value of a hot field the record does not have (or keeps in its cold blob)
+MISSING = _Missing()
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:  # e.g. integers beyond 64 bits; the standard library takes them
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def compact_class(name: str, fields: Tuple[str, ...]) -> type:
+    """A record class with one slot per hot field, plus its Layout and the cold blob"""
+    return type(name, (), {"__slots__": ("layout", "cold") + fields})
+
+
+class Layout(NamedTuple):
+    """How to rebuild one key order: the keys, and the hot ones among them"""
+
+    keys: Tuple[str, ...]
+    hot: Tuple[str, ...]
+    read_hot: Callable[[Any], Tuple[Any, ...]]
+    lists: Tuple[str, ...]
+
+
+class RecordCodec:
+    """
+    Stores dict records as slotted objects for ``Collection(codec=...)``.
+
+    Hot fields with scalar values go in slots; strings of the ``interned``
+    fields (and the items of ``requiredSkills``-like string lists given in
+    ``lists``) are interned so every record shares one object per value.
+    Everything else, such as checklists and feedback, is encoded as one
+    JSON blob and only parsed when the record is read. The key order of the
+    original dict is kept in a shared ``Layout``, so ``decode`` gives back
+    an equal dict with the same ordering. Decoded dicts are fresh copies:
+    changing one never changes the stored record.
+    """
+
+    def __init__(self, name: str, hot: Tuple[str, ...], interned: frozenset = frozenset(), lists: frozenset = frozenset()):
+        self.cls = compact_class(name, hot)
+        self.hot = hot
+        self._hot = frozenset(hot)
+        self._interned = interned
+        self._lists = lists
+        self._layouts: Dict[Tuple[str, ...], Layout] = {}
+
+    def _layout(self, keys: Tuple[str, ...]) -> Layout:
+        layout = self._layouts.get(keys)
+        if layout is None:
+            keys = tuple(sys.intern(k) if type(k) is str else k for k in keys)
+            hot = tuple(k for k in keys if k in self._hot)
+            layout = Layout(keys, hot, _getter(hot), tuple(k for k in hot if k in self._lists))
+            if len(self._layouts) < LAYOUT_CACHE_SIZE:
+                self._layouts[keys] = layout
+        return layout
+
+    def encode(self, record: Record) -> Any:
+        stored = self.cls.__new__(self.cls)
+        stored.layout = self._layout(tuple(record))
+        cold: Optional[Record] = None
+        for field in self.hot:
+            value = record.get(field, MISSING)
+            if value is MISSING:
+                pass
+            elif field in self._lists and type(value) is list and all(type(v) is str for v in value):
+                value = tuple(sys.intern(v) for v in value)
+            elif type(value) not in SCALARS:
+                # A nested or unusual value: kept exactly, in the blob
+                cold = cold or {}
+                cold[field] = value
+                value = MISSING
+            elif field in self._interned:
+                value = _intern(value)
+            setattr(stored, field, value)
+        for field, value in record.items():
+            if field not in self._hot:
+                cold = cold or {}
+                cold[field] = value
+        stored.cold = _dumps(cold) if cold else None
+        return stored
+
+    def decode(self, stored: Any) -> Record:
+        layout = stored.layout
+        # Keys first, in order; filling values in later keeps their positions
+        record = dict.fromkeys(layout.keys)
+        record.update(zip(layout.hot, layout.read_hot(stored)))
+        if stored.cold is not None:
+            # Also replaces the MISSING of hot fields that held nested values
+            record.update(_loads(stored.cold))
+        for field in layout.lists:
+            value = record[field]
+            if type(value) is tuple:
+                record[field] = list(value)
+        return record
+
+
+def _getter(fields: Tuple[str, ...]) -> Callable[[Any], Tuple[Any, ...]]:
+    """attrgetter that always returns a tuple, even for zero or one field"""
+    if len(fields) > 1:
+        return attrgetter(*fields)
+    if fields:
+        one = attrgetter(fields[0])
+        return lambda stored: (one(stored),)
+    return lambda stored: ()
+
+
+def task_codec() -> RecordCodec:
+    return RecordCodec(
+        "CompactTask", TASK_HOT_FIELDS, interned=TASK_INTERNED_FIELDS, lists=frozenset(("requiredSkills",))
+    )
@@ -0,0 +1,552 @@
+"""
+Deterministic synthetic datasets at any scale, in the shapes of mockData.py.
+
+The same seed and sizes always give the same records. Every dataset agrees
+with the others. Tasks are assigned to real users, in their shift's hours,
+mostly needing skills the assignee has. Performance, reports, the heatmap and
+the leaderboard are tallied from those tasks. Skill evolution ends at each
+user's current level and certification dates. Records are generated lazily
+and written out as they come, so memory stays proportional to the number of
+users, not tasks. Run from the backend directory:
+    python -m data.generator --users 10000 --tasks 200000 --sqlite optiwork.db
+    python -m data.generator --users 1000 --tasks 20000 --ndjson seed/
+Every synthetic employee's password is "emp1122" (the admin's "admin123").
+"""
+import argparse
+import datetime
+import hashlib
+import heapq
+import json
+import os
+import random
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from auth import SALT_BYTES, hash_password
+from data.mockData import mockSkills
+from heatmap import cell_status
+from leaderboard import overall_score, trend
+from storage import COLLECTIONS, SQLiteStorage
+from store import Record, performance_key
+
+DEPARTMENTS = ["Production", "Quality Control", "Assembly", "Logistics", "Maintenance"]
+SHIFTS = ["Morning", "Evening", "Night"]
+# Start hours of each shift's tasks; all within matching.SHIFT_HOURS
+SHIFT_START_HOURS = {
+    "Morning": list(range(6, 14)),
+    "Evening": list(range(14, 22)),
+    "Night": [22, 23, 0, 1, 2, 3, 4, 5],
+}
+LEVELS = ["beginner", "intermediate", "advanced", "expert"]
+PRIORITIES = ["low", "medium", "high", "urgent"]
+PRIORITY_WEIGHTS = [2, 5, 3, 1]
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+CHECKLIST = ["Check oil levels", "Calibrate sensors", "Test run", "Inspect welds", "Log measurements",
+             "Clean work area", "Verify torque settings", "Update maintenance log", "Review blueprint",
+             "Sign off with supervisor"]
+FIRST_NAMES = ["Kumar", "Priya", "Dharan", "Samuel", "Nagarajan", "Govindhan", "Sarah", "Rachel", "Thomas",
+               "Emily", "John", "Anita", "Ravi", "Meena", "Arjun", "Lakshmi", "David", "Fatima", "Wei", "Maria"]
+LAST_NAMES = ["R", "Raj", "Johnson", "Kim", "Anderson", "Davis", "Smith", "Iyer", "Nair", "Khan", "Chen",
+              "Lopez", "Menon", "Das", "Patel", "Singh", "Brown", "Garcia", "Rao", "Wilson"]
+EMPLOYEE_PASSWORD = "emp1122"
+ADMIN_PASSWORD = "admin123"
+END_DATE = datetime.date(2025, 10, 16)
+TREND_DAYS = 7
+LEADERBOARD_SIZE = 20
+
+# Stream order: later datasets are tallied from the tasks
+DATASETS = ("skills", "users", "tasks", "performance", "reports", "skillEvolution", "heatmap", "leaderboard")
+# Datasets the API does not keep in the store; written to their own tables
+EXTRA_TABLES = {"skillEvolution": "skill_evolution", "heatmap": "heatmap", "leaderboard": "leaderboard"}
+KEYS: Dict[str, Callable[[Record], Any]] = {
+    "users": lambda r: r["id"],
+    "tasks": lambda r: r["id"],
+    "skills": lambda r: r["id"],
+    "reports": lambda r: r["date"],
+    "performance": performance_key,
+    "skillEvolution": lambda r: f"{r['employeeId']}/{r['skillId']}",
+    "heatmap": lambda r: f"{r['day']} {r['hour']}",
+    "leaderboard": lambda r: r["rank"],
+}
+
+
+class Employee(NamedTuple):
+    """What other datasets need to know about a user, kept for every user"""
+
+    name: str
+    department: str
+    shift: str
+    # 0.6-1.0: drives on-time delivery and quality
+    ability: float
+    # (catalog index, level 1-4, days of experience)
+    skills: Tuple[Tuple[int, int, int], ...]
+
+
+class Tally:
+    """Per-user, per-date and per-slot counts accumulated while tasks are generated"""
+
+    def __init__(self, users: int):
+        self.assigned = [0] * users
+        self.completed = [0] * users
+        self.on_time = [0] * users
+        self.overdue = [0] * users
+        self.quality = [0] * users
+        self.minutes = [0] * users
+        self.skill_counts: List[Dict[int, int]] = [{} for _ in range(users)]
+        # Last TREND_DAYS days, oldest first: (due, completed) per user
+        self.trend_due = [[0] * TREND_DAYS for _ in range(users)]
+        self.trend_completed = [[0] * TREND_DAYS for _ in range(users)]
+        # date -> [total, completed, in progress, pending]
+        self.dates: Dict[str, List[int]] = {}
+        # [weekday][hour]: task hours scheduled, tasks started, started and done on time, completions
+        self.scheduled = [[0] * 24 for _ in WEEKDAYS]
+        self.started = [[0] * 24 for _ in WEEKDAYS]
+        self.started_on_time = [[0] * 24 for _ in WEEKDAYS]
+        self.done = [[0] * 24 for _ in WEEKDAYS]
+
+
+class DatasetGenerator:
+    """
+    Synthetic users, skills, tasks and everything derived from them.
+
+    Each dataset method returns a fresh iterator. Every dataset draws from
+    its own random stream, seeded from ``seed`` and the dataset name, so a
+    dataset is the same whichever others are generated. The derived datasets
+    need a full pass over the tasks; it runs on first use unless ``tasks()``
+    has been consumed already.
+    """
+
+    def __init__(
+        self,
+        users: int = 1000,
+        tasks: int = 10_000,
+        seed: int = 0,
+        days: int = 90,
+        end: datetime.date = END_DATE,
+        skills: int = len(mockSkills),
+    ):
+        self.user_count = users
+        self.task_count = tasks
+        self.seed = seed
+        self.days = days
+        self.end = end
+        self.catalog = self._catalog(skills)
+        self._skill_index = {s["id"]: i for i, s in enumerate(self.catalog)}
+        self._roster: Optional[List[Employee]] = None
+        self._tally: Optional[Tally] = None
+
+    def _rng(self, name: str) -> random.Random:
+        return random.Random(f"optiwork/{self.seed}/{name}")
+
+    def dataset(self, name: str) -> Iterator[Record]:
+        if name not in DATASETS:
+            raise ValueError(f"Unknown dataset: {name}")
+        return getattr(self, "skill_evolution" if name == "skillEvolution" else name)()
+
+    # ---------------- Ids ----------------
+    @staticmethod
+    def user_id(index: int) -> str:
+        return str(index + 1)
+
+    @staticmethod
+    def employee_id(index: int) -> str:
+        return f"EMP{index + 1:06d}"
+
+    @staticmethod
+    def task_id(index: int) -> str:
+        return f"t{index:07d}"
+
+    # ---------------- Skills and Roster ----------------
+    def _catalog(self, count: int) -> List[Record]:
+        catalog = [dict(s) for s in mockSkills[:count]]
+        rng = self._rng("skills")
+        categories = sorted({s["category"] for s in mockSkills})
+        for i in range(len(catalog), count):
+            category = rng.choice(categories)
+            catalog.append({
+                "id": f"skill-{i + 1}",
+                "name": f"{category} {i + 1}",
+                "category": category,
+                "requiresCertification": rng.random() < 0.5,
+                "department": rng.choice(DEPARTMENTS),
+            })
+        return catalog
+
+    def skills(self) -> Iterator[Record]:
+        return (dict(s) for s in self.catalog)
+
+    @property
+    def roster(self) -> List[Employee]:
+        if self._roster is None:
+            rng = self._rng("roster")
+            by_department = {
+                d: [i for i, s in enumerate(self.catalog) if s["department"] in (d, "All")] or list(range(len(self.catalog)))
+                for d in DEPARTMENTS
+            }
+            roster = []
+            for _ in range(self.user_count):
+                department = rng.choice(DEPARTMENTS)
+                # Mostly skills of the employee's own department
+                pool = by_department[department] if rng.random() < 0.8 else range(len(self.catalog))
+                picks = rng.sample(list(pool), min(len(pool), rng.randint(1, 4)))
+                roster.append(Employee(
+                    name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    department=department,
+                    shift=rng.choices(SHIFTS, (5, 3, 2))[0],
+                    ability=round(rng.uniform(0.6, 1.0), 3),
+                    skills=tuple((s, rng.randint(1, 4), rng.randint(60, 3000)) for s in picks),
+                ))
+            self._roster = roster
+        return self._roster
+
+    def _level_dates(self, experience: int, level: int) -> List[datetime.date]:
+        """Dates an employee reached levels 1..level, spread over their experience"""
+        start = self.end - datetime.timedelta(days=experience)
+        step = max(1, (experience - 30) // level)
+        return [start + datetime.timedelta(days=step * n) for n in range(level)]
+
+    # ---------------- Users ----------------
+    def users(self) -> Iterator[Record]:
+        rng = self._rng("users")
+        salt = hashlib.sha256(f"optiwork/{self.seed}/salt".encode()).digest()[:SALT_BYTES]
+        # One hash for everyone keeps generation fast and output deterministic
+        employee_password = hash_password(EMPLOYEE_PASSWORD, salt)
+        for index, employee in enumerate(self.roster):
+            skills = []
+            for skill_index, level, experience in employee.skills:
+                skill = self.catalog[skill_index]
+                certified_on = self._level_dates(experience, level)[-1]
+                expires = certified_on + datetime.timedelta(days=3 * 365)
+                skills.append({
+                    "skillId": skill["id"],
+                    "skillName": skill["name"],
+                    "level": LEVELS[level - 1],
+                    "yearsExperience": experience // 365,
+                    "certifications": [{
+                        "id": f"cert-{index + 1}-{skill_index + 1}",
+                        "name": f"{skill['name']} Certification",
+                        "issueDate": certified_on.isoformat(),
+                        "expiryDate": expires.isoformat(),
+                        "status": "active" if expires >= self.end else "expired",
+                    }] if skill.get("requiresCertification") else [],
+                    "lastUsed": (self.end - datetime.timedelta(days=rng.randrange(30))).isoformat(),
+                })
+            yield {
+                "id": self.user_id(index),
+                "name": employee.name,
+                "role": "employee",
+                "employeeId": self.employee_id(index),
+                "email": f"emp{index + 1}@optiwork.com",
+                "department": employee.department,
+                "shift": employee.shift,
+                "currentWorkload": rng.randint(0, 100),
+                "performanceScore": round(60 + 40 * employee.ability),
+                "skills": skills,
+                "password": employee_password,
+            }
+        yield {"id": "admin", "name": "Admin User", "role": "manager", "employeeId": "ADMIN",
+               "department": "Management", "email": "admin@company.com",
+               "password": hash_password(ADMIN_PASSWORD, salt)}
+
+    # ---------------- Tasks ----------------
+    def tasks(self) -> Iterator[Record]:
+        rng = self._rng("tasks")
+        roster = self.roster
+        tally = Tally(self.user_count)
+        trend_start = self.end - datetime.timedelta(days=TREND_DAYS - 1)
+        end = self.end
+        for i in range(self.task_count):
+            assignee = rng.randrange(self.user_count)
+            employee = roster[assignee]
+            # A week of upcoming work on top of the history
+            due = end - datetime.timedelta(days=rng.randrange(-7, self.days))
+            if due < end:
+                status = "completed" if rng.random() < 0.85 + 0.13 * employee.ability else \
+                    rng.choice(("pending", "in-progress"))
+            elif due == end:
+                status = rng.choices(("completed", "in-progress", "pending"), (3, 3, 4))[0]
+            else:
+                status = "pending" if rng.random() < 0.85 else "in-progress"
+            hour = rng.choice(SHIFT_START_HOURS[employee.shift])
+            hours = rng.randint(1, 3)
+            own = [self.catalog[s]["id"] for s, _, _ in employee.skills]
+            required = [rng.choice(own) if rng.random() < 0.85 else rng.choice(self.catalog)["id"]]
+            if rng.random() < 0.2 and "skill-6" in self._skill_index:
+                # Safety Compliance
+                required.append("skill-6")
+            required = list(dict.fromkeys(required))
+            completed = status == "completed"
+            checklist = [
+                {"id": str(n + 1), "text": text, "completed": completed or rng.random() < 0.4}
+                for n, text in enumerate(rng.sample(CHECKLIST, rng.randint(2, 5)))
+            ]
+            task = {
+                "id": self.task_id(i),
+                "title": f"{self.catalog[self._skill_index[required[0]]]['name']} job {i + 1}",
+                "description": f"{employee.department} work order",
+                "assignedTo": self.user_id(assignee),
+                "assignedBy": "admin",
+                "priority": rng.choices(PRIORITIES, PRIORITY_WEIGHTS)[0],
+                "status": status,
+                "startTime": f"{hour:02d}:00",
+                "endTime": f"{(hour + hours) % 24:02d}:00",
+                "dueDate": due.isoformat(),
+                "completedAt": None,
+                "requiredSkills": required,
+                "checklist": checklist,
+                "notes": "",
+            }
+            weekday = due.weekday()
+            tally.assigned[assignee] += 1
+            for busy in range(hour, hour + hours):
+                # Each hour the task covers, into the next weekday past midnight
+                tally.scheduled[(weekday + busy // 24) % 7][busy % 24] += 1
+            tally.started[weekday][hour] += 1
+            counts = tally.dates.setdefault(task["dueDate"], [0, 0, 0, 0])
+            counts[0] += 1
+            counts[{"completed": 1, "in-progress": 2, "pending": 3}[status]] += 1
+            trend_day = (due - trend_start).days
+            if 0 <= trend_day < TREND_DAYS:
+                tally.trend_due[assignee][trend_day] += 1
+            if completed:
+                on_time = rng.random() < employee.ability + 0.05
+                finished = due if on_time else due + datetime.timedelta(days=rng.randint(1, 2))
+                minutes = hours * 60 + rng.randint(-20, 30)
+                quality = max(1, min(5, round(rng.gauss(1.5 + 3.5 * employee.ability, 0.7))))
+                difficulty = rng.randint(1, 5)
+                finish_hour = (hour + minutes // 60) % 24
+                stamp = f"{finished.isoformat()}T{finish_hour:02d}:{minutes % 60:02d}:00"
+                task.update(
+                    completedAt=stamp,
+                    difficultyRating=difficulty,
+                    qualityRating=quality,
+                    feedback={
+                        "employeeFeedback": {"difficultyRating": difficulty, "clarity": rng.randint(2, 5),
+                                             "hadIssues": quality < 3, "submittedAt": stamp},
+                        "supervisorFeedback": {"qualityRating": quality, "onTime": on_time,
+                                               "needsRetraining": quality < 2, "notes": "", "submittedAt": stamp},
+                    },
+                )
+                tally.completed[assignee] += 1
+                tally.on_time[assignee] += on_time
+                tally.quality[assignee] += quality
+                tally.minutes[assignee] += minutes
+                skill_counts = tally.skill_counts[assignee]
+                for skill_id in required:
+                    index = self._skill_index[skill_id]
+                    skill_counts[index] = skill_counts.get(index, 0) + 1
+                tally.started_on_time[weekday][hour] += on_time
+                tally.done[finished.weekday()][finish_hour] += 1
+                if 0 <= trend_day < TREND_DAYS:
+                    tally.trend_completed[assignee][trend_day] += 1
+            elif due < end:
+                tally.overdue[assignee] += 1
+            yield task
+        self._tally = tally
+
+    @property
+    def tally(self) -> Tally:
+        if self._tally is None:
+            for _ in self.tasks():
+                pass
+        return self._tally
+
+    # ---------------- Derived Datasets ----------------
+    def _performance(self, index: int) -> Record:
+        t = self.tally
+        completed = t.completed[index]
+        assigned = t.assigned[index]
+        trend_start = self.end - datetime.timedelta(days=TREND_DAYS - 1)
+        used = sorted(t.skill_counts[index].items(), key=lambda item: (-item[1], item[0]))[:3]
+        return {
+            "employeeId": self.user_id(index),
+            "department": self.roster[index].department,
+            "completionRate": round(completed / assigned * 100) if assigned else 0,
+            "averageTaskTime": round(t.minutes[index] / completed) if completed else 0,
+            "onTimeDeliveryRate": round(t.on_time[index] / completed * 100) if completed else 0,
+            "qualityScore": round(t.quality[index] / completed, 1) if completed else 0,
+            "tasksCompleted": completed,
+            "tasksOverdue": t.overdue[index],
+            "skillsUsed": [{"skillId": self.catalog[s]["id"], "count": count} for s, count in used],
+            "performanceTrend": [
+                {
+                    "date": (trend_start + datetime.timedelta(days=d)).isoformat(),
+                    "completionRate": round(t.trend_completed[index][d] / t.trend_due[index][d] * 100)
+                    if t.trend_due[index][d] else 0,
+                    "tasksCompleted": t.trend_completed[index][d],
+                }
+                for d in range(TREND_DAYS)
+            ],
+        }
+
+    def performance(self) -> Iterator[Record]:
+        return (self._performance(i) for i in range(self.user_count))
+
+    def reports(self) -> Iterator[Record]:
+        today = self.end.isoformat()
+        for date in sorted(self.tally.dates, reverse=True):
+            total, completed, in_progress, pending = self.tally.dates[date]
+            yield {
+                "date": date,
+                "totalTasks": total,
+                "completed": completed,
+                "inProgress": in_progress,
+                "pending": pending,
+                # As reports.summarize counts them: open tasks of a past date
+                "overdue": total - completed if date < today else 0,
+                "completionRate": round(completed / total * 100, 1) if total else 0.0,
+            }
+
+    def skill_evolution(self) -> Iterator[Record]:
+        rng = self._rng("skillEvolution")
+        for index, employee in enumerate(self.roster):
+            for skill_index, level, experience in employee.skills:
+                skill = self.catalog[skill_index]
+                history = []
+                for reached, date in enumerate(self._level_dates(experience, level), 1):
+                    entry: Record = {"date": date.isoformat(), "level": reached}
+                    if reached == 1:
+                        entry["milestone"] = f"Started {skill['name']} training"
+                    elif reached == level and skill.get("requiresCertification"):
+                        entry["milestone"] = f"{LEVELS[reached - 1].capitalize()} certification"
+                    elif rng.random() < 0.5:
+                        entry["milestone"] = f"Completed {LEVELS[reached - 1]} course"
+                    history.append(entry)
+                history.append({"date": self.end.isoformat(), "level": level})
+                yield {"employeeId": self.employee_id(index), "skillId": skill["id"], "history": history}
+
+    def heatmap(self) -> Iterator[Record]:
+        """
+        Per weekday and hour: completions per week, productivity (share of the
+        tasks started then that were done on time) and utilization (task hours
+        against the hours of the staff on shift)
+        """
+        weeks = max(1, (self.days + 7) / 7)
+        staff = {shift: 0 for shift in SHIFTS}
+        for employee in self.roster:
+            staff[employee.shift] += 1
+        on_shift = [0] * 24
+        for shift, hours in SHIFT_START_HOURS.items():
+            for hour in hours:
+                on_shift[hour] += staff[shift]
+        for day, name in enumerate(WEEKDAYS):
+            for hour in range(24):
+                t = self.tally
+                started = t.started[day][hour]
+                productivity = round(t.started_on_time[day][hour] / started * 100) if started else 0
+                utilization = min(100, round(t.scheduled[day][hour] / (on_shift[hour] * weeks) * 100)) \
+                    if on_shift[hour] else 0
+                yield {
+                    "hour": f"{hour:02d}:00",
+                    "day": name,
+                    "productivity": productivity,
+                    "tasksCompleted": round(t.done[day][hour] / weeks),
+                    "utilization": utilization,
+                    "status": cell_status(productivity, started),
+                }
+
+    def leaderboard(self, size: int = LEADERBOARD_SIZE) -> Iterator[Record]:
+        """Top employees by a blend of completion, on-time delivery and quality"""
+        def ranking(index: int) -> Tuple[float, int, int]:
+            record = self._performance(index)
+            # Ties go to the larger body of work, then the lower id
+            return overall_score(record), record["tasksCompleted"], -index
+
+        top = heapq.nlargest(size, (ranking(i) for i in range(self.user_count)))
+        for rank, (value, _, negative) in enumerate(top, 1):
+            index = -negative
+            employee = self.roster[index]
+            best = max(employee.skills, key=lambda s: (s[1], -s[0]))
+            yield {
+                "rank": rank,
+                "employeeId": self.employee_id(index),
+                "employeeName": employee.name,
+                "score": value,
+                "metric": "%",
+                "trend": trend(self._performance(index)),
+                "badge": f"{self.catalog[best[0]]['name']} {LEVELS[best[1] - 1].capitalize()}",
+            }
+
+
+# ---------------- Writers ----------------
+def _counted(records: Iterable[Record], counts: Dict[str, int], name: str) -> Iterator[Record]:
+    counts[name] = 0
+    for record in records:
+        counts[name] += 1
+        yield record
+
+
+def write_ndjson(generator: DatasetGenerator, directory: str, datasets: Sequence[str] = DATASETS) -> Dict[str, int]:
+    """One <dataset>.ndjson file per dataset; returns the record counts"""
+    os.makedirs(directory, exist_ok=True)
+    counts: Dict[str, int] = {}
+    for name in datasets:
+        with open(os.path.join(directory, f"{name}.ndjson"), "w", encoding="utf-8") as f:
+            for record in _counted(generator.dataset(name), counts, name):
+                f.write(json.dumps(record, separators=(",", ":")))
+                f.write("\n")
+    return counts
+
+
+def write_sqlite(generator: DatasetGenerator, path: str, datasets: Sequence[str] = DATASETS) -> Dict[str, int]:
+    """
+    Write the datasets into the app's SQLite schema, replacing what is there.
+    The store's collections go in their tables (the app loads them at start);
+    the other datasets get (key, data) tables of their own.
+    """
+    counts: Dict[str, int] = {}
+    storage = SQLiteStorage(path, flush_interval=0)
+    try:
+        for name in datasets:
+            if name in COLLECTIONS:
+                storage.replace(name, _counted(generator.dataset(name), counts, name), KEYS[name])
+    finally:
+        storage.close()
+    extras = [name for name in datasets if name in EXTRA_TABLES]
+    if extras:
+        conn = sqlite3.connect(path, isolation_level=None)
+        try:
+            for name in extras:
+                table = EXTRA_TABLES[name]
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (key PRIMARY KEY, data TEXT NOT NULL)")
+                conn.execute("BEGIN")
+                conn.execute(f"DELETE FROM {table}")
+                conn.executemany(
+                    f"INSERT INTO {table} (key, data) VALUES (?, ?)",
+                    ((KEYS[name](r), json.dumps(r, separators=(",", ":")))
+                     for r in _counted(generator.dataset(name), counts, name)),
+                )
+                conn.execute("COMMIT")
+        finally:
+            conn.close()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=90, help="days of task history before --end")
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=END_DATE, help="the dataset's today")
+    parser.add_argument("--skills", type=int, default=len(mockSkills), help="catalog size (mock skills first)")
+    parser.add_argument("--ndjson", metavar="DIR")
+    parser.add_argument("--sqlite", metavar="PATH")
+    parser.add_argument("--datasets", nargs="+", choices=DATASETS, default=list(DATASETS))
+    args = parser.parse_args()
+    if not args.ndjson and not args.sqlite:
+        parser.error("give --ndjson and/or --sqlite")
+
+    for target, write in ((args.ndjson, write_ndjson), (args.sqlite, write_sqlite)):
+        if not target:
+            continue
+        generator = DatasetGenerator(args.users, args.tasks, args.seed, args.days, args.end, args.skills)
+        start = time.perf_counter()
+        counts = write(generator, target, args.datasets)
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        print(f"{target}: {summary} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from store import Collection, Record, Store
+
+
+MAX_PENDING = 256
+HEARTBEAT_SECONDS = 15.0
+
+
+# ---------------- Subscribers ----------------
+class Subscriber:
+    """
+    One connected client: its filters and a bounded buffer of undelivered events.
+
+    Events are coalesced by key, so a slow client only ever receives the
+    latest state of a task. When more distinct keys are pending than the
+    buffer holds, the oldest are dropped and the client is told how many it
+    missed so it can catch up through /sync.
+    """
+
+    __slots__ = ("department", "shift", "assignee", "max_pending", "_pending", "_wakeup", "dropped")
+
+    def __init__(
+        self,
+        department: Optional[str] = None,
+        shift: Optional[str] = None,
+        assignee: Optional[str] = None,
+        max_pending: int = MAX_PENDING,
+    ):
+        self.department = department
+        self.shift = shift
+        self.assignee = assignee
+        self.max_pending = max_pending
+        self._pending: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self.dropped = 0
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return (
+            (self.assignee is None or event.get("assignedTo") == self.assignee)
+            and (self.department is None or event.get("department") == self.department)
+            and (self.shift is None or event.get("shift") == self.shift)
+        )
+
+    def offer(self, key: Any, event: Dict[str, Any]) -> None:
+        """Queue an event, replacing any pending event for the same key"""
+        if key in self._pending:
+            self._pending[key] = event
+            self._pending.move_to_end(key)
+        else:
+            if len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[key] = event
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Wait for pending events and take them all; empty on timeout"""
+        if not self._pending:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        batch: List[Dict[str, Any]] = []
+        if self.dropped:
+            batch.append({"type": "overflow", "dropped": self.dropped})
+            self.dropped = 0
+        batch.extend(self._pending.values())
+        self._pending.clear()
+        return batch
+
+
+# ---------------- Event Bus ----------------
+class EventBus:
+    """
+    Fans task events out to subscribers on the event loop.
+
+    ``publish`` may be called from any thread (sync endpoints run on a thread
+    pool); delivery is handed to the loop that owns the subscribers.
+    Subscribers are bucketed by their most selective filter so an event only
+    visits clients that could want it.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._unfiltered: Set[Subscriber] = set()
+        self._by_assignee: Dict[str, Set[Subscriber]] = {}
+        self._by_department: Dict[str, Set[Subscriber]] = {}
+        self._by_shift: Dict[str, Set[Subscriber]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _bucket(self, subscriber: Subscriber):
+        if subscriber.assignee is not None:
+            return self._by_assignee, subscriber.assignee
+        if subscriber.department is not None:
+            return self._by_department, subscriber.department
+        if subscriber.shift is not None:
+            return self._by_shift, subscriber.shift
+        return None, None
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        """Register a subscriber; must be called from the event loop"""
+        self._loop = asyncio.get_running_loop()
+        buckets, value = self._bucket(subscriber)
+        bucket = self._unfiltered if buckets is None else buckets.setdefault(value, set())
+        if subscriber not in bucket:
+            bucket.add(subscriber)
+            self._count += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        buckets, value = self._bucket(subscriber)
+        bucket = self._unfiltered if buckets is None else buckets.get(value)
+        if bucket is None or subscriber not in bucket:
+            return
+        bucket.discard(subscriber)
+        self._count -= 1
+        if buckets is not None and not bucket:
+            del buckets[value]
+
+    def publish(self, key: Any, event: Dict[str, Any]) -> None:
+        """Deliver an event to matching subscribers; safe to call from any thread"""
+        self._call(self._dispatch, key, event)
+
+    def broadcast(self, key: Any, event: Dict[str, Any]) -> None:
+        """Deliver an event to every subscriber regardless of filters"""
+        self._call(self._dispatch_all, key, event)
+
+    def _call(self, func, key: Any, event: Dict[str, Any]) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed() or not len(self):
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            func(key, event)
+        else:
+            loop.call_soon_threadsafe(func, key, event)
+
+    def _dispatch_all(self, key: Any, event: Dict[str, Any]) -> None:
+        for buckets in (self._by_assignee, self._by_department, self._by_shift):
+            for bucket in buckets.values():
+                for subscriber in bucket:
+                    subscriber.offer(key, event)
+        for subscriber in self._unfiltered:
+            subscriber.offer(key, event)
+
+    def _dispatch(self, key: Any, event: Dict[str, Any]) -> None:
+        candidates = [self._unfiltered]
+        for buckets, field in (
+            (self._by_assignee, "assignedTo"),
+            (self._by_department, "department"),
+            (self._by_shift, "shift"),
+        ):
+            bucket = buckets.get(event.get(field))
+            if bucket:
+                candidates.append(bucket)
+        for bucket in candidates:
+            for subscriber in bucket:
+                if subscriber.matches(event):
+                    subscriber.offer(key, event)
+
+
+# ---------------- Task Events ----------------
+def attach_task_events(store: Store, bus: EventBus) -> None:
+    """Publish an event on the bus for every task create, patch and delete"""
+
+    def route(task: Record) -> Dict[str, Any]:
+        assignee = store.users.get(task.get("assignedTo")) or {}
+        return {
+            "assignedTo": task.get("assignedTo"),
+            "department": assignee.get("department"),
+            "shift": assignee.get("shift"),
+        }
+
+    def on_change(collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            bus.broadcast(None, {"type": "reset", "version": store.version})
+            return
+        kind = "task.deleted" if new is None else "task.created" if old is None else "task.updated"
+        event = {"type": kind, "version": store.version, "id": key, "task": new, **route(new or old)}
+        bus.publish(key, event)
+        # A reassigned task must also reach clients watching its previous owner
+        if old is not None and new is not None and old.get("assignedTo") != new.get("assignedTo"):
+            bus.publish(key, {**event, **route(old)})
+
+    store.tasks.subscribe(on_change)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    lines = [f"event: {event['type']}"]
+    if "version" in event:
+        lines.append(f"id: {event['version']}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,408 @@
+import datetime
+import threading
+from collections import Counter
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from archive import TaskArchive
+from matching import SHIFT_HOURS
+from store import Collection, Record, Store
+
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+UNASSIGNED = "Unassigned"
+# Measures along the cube's first axis
+STARTED, ON_TIME, DONE, HOURS = range(4)
+MEASURES = 4
+# Skill slot 0 counts every task once; a task also counts under each skill it requires
+ANY_SKILL = 0
+PEAK = 80
+NORMAL = 40
+# Highlighted cells, as the dashboard lists them
+HIGHLIGHTS = 3
+IDLE = 20
+
+# (department, shift, skill slots, weekday, hour, (weekday, hour, task hours) per hour covered, on time,
+# completion slot, due date)
+Contribution = Tuple[
+    int, int, Tuple[int, ...], int, int, Tuple[Tuple[int, int, float], ...], bool, Optional[Tuple[int, int]], str
+]
+# (department slots or None for all, shift slots or None for all, skill slot)
+Filter = Tuple[Optional[Tuple[int, ...]], Optional[Tuple[int, ...]], int]
+
+
+def cell_status(productivity: float, started: float) -> str:
+    if not started:
+        return "idle"
+    if productivity >= PEAK:
+        return "peak"
+    return "normal" if productivity >= NORMAL else "bottleneck"
+
+
+def _hour(value: Any) -> Optional[int]:
+    """The hour of an "HH:MM" time, or of an ISO timestamp's time part"""
+    if not isinstance(value, str):
+        return None
+    text = value.partition("T")[2] if "T" in value else value
+    try:
+        return int(text[:2]) % 24
+    except ValueError:
+        return None
+
+
+def _weekday(value: Any) -> Optional[int]:
+    try:
+        return datetime.date.fromisoformat(str(value)[:10]).weekday()
+    except ValueError:
+        return None
+
+
+def task_hours(task: Record) -> float:
+    """Scheduled length from startTime to endTime, wrapping past midnight; one hour if unknown"""
+    try:
+        start_h, start_m = map(int, task["startTime"].split(":"))
+        end_h, end_m = map(int, task["endTime"].split(":"))
+    except (KeyError, AttributeError, ValueError):
+        return 1.0
+    minutes = (end_h * 60 + end_m - start_h * 60 - start_m) % (24 * 60)
+    return minutes / 60 or 1.0
+
+
+def hour_spread(day: int, task: Record) -> Tuple[Tuple[int, int, float], ...]:
+    """
+    (weekday, hour, hours) for each clock hour the task's schedule covers,
+    from startTime for task_hours, moving to the next weekday past midnight
+    """
+    try:
+        start_h, start_m = map(int, task["startTime"].split(":"))
+    except (KeyError, AttributeError, ValueError):
+        return ()
+    minute, end = start_h * 60 + start_m, start_h * 60 + start_m + round(task_hours(task) * 60)
+    spread = []
+    while minute < end:
+        hour = minute // 60
+        step = min((hour + 1) * 60, end) - minute
+        spread.append(((day + hour // 24) % 7, hour % 24, step / 60))
+        minute += step
+    return tuple(spread)
+
+
+def delivered_on_time(task: Record) -> bool:
+    """The supervisor's verdict when there is one, else completed no later than the due date"""
+    review = (task.get("feedback") or {}).get("supervisorFeedback") or {}
+    if review.get("onTime") is not None:
+        return bool(review["onTime"])
+    return str(task.get("completedAt") or "")[:10] <= str(task.get("dueDate"))
+
+
+# ---------------- Heatmap Cube ----------------
+class HeatmapCube:
+    """
+    Weekday x hour x department x shift x skill counters behind ``/heatmap``.
+
+    Each task adds to the slot of its due weekday and start hour (tasks
+    started, started and done on time), its scheduled hours to every hour
+    it covers, and, once completed, to the slot it was completed in. As with the reports, each task's
+    contribution is remembered, so a change moves it between cells instead
+    of rescanning the tasks; archived tasks keep counting, and a rebuild
+    reads them back from the ``archive`` so a restarted worker agrees with
+    one that saw them archived. A query sums the
+    cube over the departments and shifts it selects and reads one skill
+    slice. Results are cached per filter, and a task change drops only the
+    cached filters that could see it; a new dimension value, a change in
+    staffing or in the weeks covered drops them all. The arrays and the
+    cache have their own lock, which a writer holds only while it moves one
+    task, so queries never wait for the store's writer lock or a whole batch.
+    """
+
+    def __init__(self, store: Store, archive: Optional[TaskArchive] = None):
+        self.store = store
+        self.archive = archive
+        # Taken after the store's lock by writers, and never with it by readers
+        self._lock = threading.RLock()
+        self._departments: Dict[str, int] = {}
+        self._shifts: Dict[str, int] = {}
+        self._skills: Dict[str, int] = {}
+        self._cube = np.zeros((MEASURES, 7, 24, 0, 0, 1), dtype=np.float64)
+        self._contributions: Dict[Any, Contribution] = {}
+        # Tasks per due date, and how many distinct dates fall on each weekday
+        self._dates: Counter = Counter()
+        self._weeks = np.zeros(7, dtype=np.int64)
+        # Employees per (department, shift)
+        self._staff = np.zeros((0, 0), dtype=np.int64)
+        self._cache: Dict[Filter, Record] = {}
+        store.tasks.subscribe(self._on_task)
+        store.users.subscribe(self._on_user)
+        self.rebuild()
+
+    # ---- Dimensions ----
+    @staticmethod
+    def _slot(values: Dict[str, int], value: str, first: int = 0) -> int:
+        slot = values.get(value)
+        if slot is None:
+            slot = values[value] = len(values) + first
+        return slot
+
+    def _fit(self) -> None:
+        """Grow the cube and staff table to cover every dimension value seen so far"""
+        sizes = (len(self._departments), len(self._shifts), len(self._skills) + 1)
+        pad = [(0, 0)] * 3 + [(0, want - have) for want, have in zip(sizes, self._cube.shape[3:])]
+        if any(extra for _, extra in pad):
+            self._cube = np.pad(self._cube, pad)
+            self._staff = np.pad(self._staff, pad[3:5])
+            self._cache.clear()
+
+    def _member(self, user: Optional[Record]) -> Tuple[int, int]:
+        department = (user.get("department") if user else None) or UNASSIGNED
+        shift = (user.get("shift") if user else None) or UNASSIGNED
+        return self._slot(self._departments, department), self._slot(self._shifts, shift)
+
+    def _contribution(self, task: Optional[Record]) -> Optional[Contribution]:
+        if task is None:
+            return None
+        day, hour = _weekday(task.get("dueDate")), _hour(task.get("startTime"))
+        if day is None or hour is None:
+            return None
+        assignee = task.get("assignedTo")
+        department, shift = self._member(self.store.users.get(assignee) if assignee else None)
+        skills = (ANY_SKILL, *dict.fromkeys(
+            self._slot(self._skills, s, first=1) for s in task.get("requiredSkills") or () if isinstance(s, str)
+        ))
+        done = None
+        completed = task.get("status") == "completed"
+        if completed and task.get("completedAt"):
+            done_day, done_hour = _weekday(task["completedAt"]), _hour(task["completedAt"])
+            if done_day is not None and done_hour is not None:
+                done = (done_day, done_hour)
+        return (department, shift, skills, day, hour, hour_spread(day, task), completed and delivered_on_time(task),
+                done, str(task["dueDate"])[:10])
+
+    # ---- Updates ----
+    def _apply(self, contribution: Contribution, sign: int) -> None:
+        department, shift, skills, day, hour, spread, timely, done, due = contribution
+        cells = self._cube[:, day, hour, department, shift]
+        cells[STARTED, skills] += sign
+        for busy_day, busy_hour, hours in spread:
+            self._cube[HOURS, busy_day, busy_hour, department, shift, skills] += sign * hours
+        if timely:
+            cells[ON_TIME, skills] += sign
+        if done is not None:
+            self._cube[DONE, done[0], done[1], department, shift, skills] += sign
+        count = self._dates[due] + sign
+        if count:
+            self._dates[due] = count
+        else:
+            del self._dates[due]
+        if count == 0 or (count == 1 and sign > 0):
+            # A date appeared or vanished: the weeks covered by its weekday changed
+            self._weeks[day] += sign
+            self._cache.clear()
+        else:
+            self._invalidate(department, shift, skills)
+
+    def _invalidate(self, department: int, shift: int, skills: Sequence[int]) -> None:
+        self._cache = {
+            key: result for key, result in self._cache.items()
+            if not (
+                (key[0] is None or department in key[0])
+                and (key[1] is None or shift in key[1])
+                and key[2] in skills
+            )
+        }
+
+    def _move(self, key: Any, task: Optional[Record]) -> None:
+        before = self._contributions.pop(key, None)
+        after = self._contribution(task)
+        if before == after:
+            if after is not None:
+                self._contributions[key] = after
+            return
+        self._fit()
+        if before is not None:
+            self._apply(before, -1)
+        if after is not None:
+            self._apply(after, 1)
+            self._contributions[key] = after
+
+    def _on_task(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self.rebuild()
+            return
+        with self._lock:
+            if new is None and self.store.is_archiving:
+                # History: the task keeps counting, it just cannot change any more
+                self._contributions.pop(key, None)
+            else:
+                self._move(key, new)
+
+    def _on_user(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self.rebuild()
+            return
+        if old and new and all(old.get(f) == new.get(f) for f in ("department", "shift", "role")):
+            return
+        tasks = self.store.tasks
+        assigned = [(task_key, tasks.get(task_key)) for task_key in list(tasks.keys_for("assignedTo", key))]
+        with self._lock:
+            self._count_staff()
+            for task_key, task in assigned:
+                self._move(task_key, task)
+
+    def _count_staff(self) -> None:
+        employees = [self._member(user) for user in self.store.users.find("role", "employee")]
+        self._fit()
+        self._staff[:] = 0
+        for member in employees:
+            self._staff[member] += 1
+        self._cache.clear()
+
+    def _history(self) -> List[Contribution]:
+        """Contributions of the archived tasks no longer in the store"""
+        if self.archive is None:
+            return []
+        tasks = self.store.tasks
+        history = []
+        for month in self.archive.months():
+            for task in self.archive.read(month):
+                # A pass interrupted between writing and deleting leaves the task live too
+                if tasks.key_of(task) in tasks:
+                    continue
+                contribution = self._contribution(task)
+                if contribution is not None:
+                    history.append(contribution)
+        return history
+
+    def rebuild(self) -> None:
+        """Recount every task, live and archived, adding each measure in one vectorized pass"""
+        # A writer: the store's lock first, as for every other change
+        with self.store.lock, self._lock:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._contributions = {}
+        self._dates = Counter()
+        tasks = self.store.tasks
+        for task in tasks.all():
+            contribution = self._contribution(task)
+            if contribution is not None:
+                self._contributions[tasks.key_of(task)] = contribution
+        history = self._history()
+        self._count_staff()
+        self._cube[:] = 0
+        started: List[Tuple[int, ...]] = []
+        busy: List[Tuple[int, ...]] = []
+        hours: List[float] = []
+        timely: List[Tuple[int, ...]] = []
+        done: List[Tuple[int, ...]] = []
+        for department, shift, skills, day, hour, spread, on_time, finished, due in chain(
+            self._contributions.values(), history
+        ):
+            self._dates[due] += 1
+            for skill in skills:
+                slot = (day, hour, department, shift, skill)
+                started.append(slot)
+                for busy_day, busy_hour, length in spread:
+                    busy.append((busy_day, busy_hour, department, shift, skill))
+                    hours.append(length)
+                if on_time:
+                    timely.append(slot)
+                if finished is not None:
+                    done.append((*finished, department, shift, skill))
+        for measure, slots, weights in ((STARTED, started, 1), (HOURS, busy, hours), (ON_TIME, timely, 1),
+                                        (DONE, done, 1)):
+            if slots:
+                np.add.at(self._cube[measure], tuple(np.array(slots).T), weights)
+        self._weeks[:] = 0
+        for due in self._dates:
+            self._weeks[_weekday(due)] += 1
+        self._cache.clear()
+
+    # ---- Queries ----
+    def _skill_id(self, skill: Optional[str]) -> Optional[str]:
+        """The id of a skill given by id or name (case-insensitive); unknown names pass through"""
+        if skill is None:
+            return None
+        named = self.store.skills.get(skill) or next(
+            (s for s in self.store.skills.all() if str(s.get("name", "")).lower() == skill.lower()), None
+        )
+        return named["id"] if named else skill
+
+    def _filter(
+        self, team: Optional[List[str]], shift: Optional[List[str]], skill_id: Optional[str]
+    ) -> Optional[Filter]:
+        """Dimension slots for the given names (case-insensitive); None when one matches nothing"""
+        def slots(values: Dict[str, int], names: Optional[List[str]]) -> Optional[Tuple[int, ...]]:
+            if names is None:
+                return None
+            wanted = {n.lower() for n in names}
+            return tuple(sorted(slot for value, slot in values.items() if value.lower() in wanted))
+
+        departments, shifts = slots(self._departments, team), slots(self._shifts, shift)
+        skill_slot = ANY_SKILL if skill_id is None else self._skills.get(skill_id, -1)
+        if departments == () or shifts == () or skill_slot < 0:
+            return None
+        return departments, shifts, skill_slot
+
+    def query(
+        self, team: Optional[List[str]] = None, shift: Optional[List[str]] = None, skill: Optional[str] = None
+    ) -> Record:
+        """
+        The heatmap for the selected departments (``team``), shifts and one
+        skill: 7 x 24 cells plus the peak and idle hours the dashboard lists
+        """
+        # Store reads first: a writer holding the store's lock may be waiting for ours
+        skill_id = self._skill_id(skill)
+        with self._lock:
+            key = self._filter(team, shift, skill_id)
+            cached = self._cache.get(key)
+            if cached is None:
+                cached = self._compute(key)
+                if key is not None:
+                    self._cache[key] = cached
+            return cached
+
+    def _compute(self, key: Optional[Filter]) -> Record:
+        measures = np.zeros((MEASURES, 7, 24))
+        on_duty = np.zeros(24)
+        if key is not None:
+            departments, shifts, skill = key
+            cube, staff = self._cube[..., skill], self._staff
+            if departments is not None:
+                cube, staff = cube[:, :, :, list(departments)], staff[list(departments)]
+            if shifts is not None:
+                cube, staff = cube[..., list(shifts)], staff[:, list(shifts)]
+            measures = cube.sum(axis=(3, 4))
+            names = {slot: name for name, slot in self._shifts.items()}
+            shift_slots = shifts if shifts is not None else range(len(self._shifts))
+            for column, slot in enumerate(shift_slots):
+                hours = sorted(SHIFT_HOURS.get(names[slot], ()))
+                on_duty[hours] += staff[:, column].sum()
+
+        started = measures[STARTED]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            productivity = np.where(started > 0, measures[ON_TIME] / started * 100, 0)
+            weeks = np.maximum(self._weeks, 1)[:, None]
+            capacity = on_duty[None, :] * weeks
+            utilization = np.where(capacity > 0, np.minimum(measures[HOURS] / capacity * 100, 100), 0)
+        completed = measures[DONE] / weeks
+
+        cells = []
+        for day, name in enumerate(WEEKDAYS):
+            for hour in range(24):
+                score = int(round(productivity[day, hour]))
+                cells.append({
+                    "hour": f"{hour:02d}:00",
+                    "day": name,
+                    "productivity": score,
+                    "tasksCompleted": int(round(completed[day, hour])),
+                    "utilization": int(round(utilization[day, hour])),
+                    "status": cell_status(score, started[day, hour]),
+                })
+        peak = sorted((c for c in cells if c["status"] == "peak"), key=lambda c: -c["productivity"])
+        return {
+            "cells": cells,
+            "peakHours": peak[:HIGHLIGHTS],
+            "idleHours": [c for c in cells if c["productivity"] < IDLE][:HIGHLIGHTS],
+        }
@@ -0,0 +1,278 @@
+import random
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from matching import LEVELS
+from store import Collection, Record, Store, performance_key
+
+
+MAX_LEVEL = 32
+# Recent days of performanceTrend compared with the rest of the week for the trend arrow
+RECENT_DAYS = 3
+
+
+# ---------------- Indexable Skip List ----------------
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, height: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * height
+        # Level-0 steps to next[level]; to one past the end when there is none
+        self.width = [1] * height
+
+
+class RankedList:
+    """
+    Sorted distinct keys with insert, remove, rank and index lookups in
+    O(log n) expected time: a skip list whose links also record how many
+    keys they skip. Keys passed to the constructor are sorted and linked in
+    O(n log n) once, without a search per key.
+    """
+
+    def __init__(self, keys: Iterable[Any] = (), seed: int = 0):
+        self._rng = random.Random(seed)
+        self._head = _Node(None, MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        last = [self._head] * MAX_LEVEL
+        last_position = [0] * MAX_LEVEL
+        for position, key in enumerate(sorted(keys), 1):
+            height = self._height()
+            node = _Node(key, height)
+            for level in range(height):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_position[level]
+                last[level], last_position[level] = node, position
+            self._level = max(self._level, height)
+            self._size = position
+        for level in range(MAX_LEVEL):
+            last[level].width[level] = self._size + 1 - last_position[level]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _height(self) -> int:
+        height = 1
+        while height < MAX_LEVEL and self._rng.random() < 0.5:
+            height += 1
+        return height
+
+    def _path(self, key: Any) -> Tuple[List[_Node], List[int]]:
+        """The last node before ``key`` on each level, and its position (the head is 0)"""
+        update = [self._head] * self._level
+        positions = [0] * self._level
+        node, position = self._head, 0
+        for level in reversed(range(self._level)):
+            following = node.next[level]
+            while following is not None and following.key < key:
+                position += node.width[level]
+                node, following = following, following.next[level]
+            update[level], positions[level] = node, position
+        return update, positions
+
+    def insert(self, key: Any) -> None:
+        height = self._height()
+        if height > self._level:
+            # The head's new levels span everything so far
+            for level in range(self._level, height):
+                self._head.next[level] = None
+                self._head.width[level] = self._size + 1
+            self._level = height
+        update, positions = self._path(key)
+        position = positions[0] + 1
+        node = _Node(key, height)
+        for level in range(height):
+            before = update[level]
+            node.next[level] = before.next[level]
+            before.next[level] = node
+            skipped = position - positions[level]
+            node.width[level] = before.width[level] - skipped + 1
+            before.width[level] = skipped
+        for level in range(height, self._level):
+            update[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any) -> None:
+        update, _ = self._path(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for level in range(self._level):
+            before = update[level]
+            if before.next[level] is node:
+                before.width[level] += node.width[level] - 1
+                before.next[level] = node.next[level]
+            else:
+                before.width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key: Any) -> Optional[int]:
+        """Zero-based index of ``key``, or None when it is absent"""
+        update, positions = self._path(key)
+        node = update[0].next[0]
+        return positions[0] if node is not None and node.key == key else None
+
+    def slice(self, start: int, count: int) -> Iterator[Any]:
+        """Up to ``count`` keys from index ``start``"""
+        if start < 0 or start >= self._size:
+            return
+        node, remaining = self._head, start + 1
+        for level in reversed(range(self._level)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        while node is not None and count > 0:
+            yield node.key
+            node, count = node.next[0], count - 1
+
+
+# ---------------- Leaderboard ----------------
+class Metric(NamedTuple):
+    score: Callable[[Record], float]
+    # Unit the dashboard shows next to the score
+    unit: str
+
+
+def overall_score(record: Record) -> float:
+    """Completion, on-time delivery and quality (0-5, so scaled by 6) blended into one score"""
+    return round(
+        0.4 * (record.get("completionRate") or 0)
+        + 0.3 * (record.get("onTimeDeliveryRate") or 0)
+        + 6 * (record.get("qualityScore") or 0),
+        1,
+    )
+
+
+METRICS: Dict[str, Metric] = {
+    "overall": Metric(overall_score, "pts"),
+    "quality": Metric(lambda r: r.get("qualityScore") or 0, "/5"),
+    "onTime": Metric(lambda r: r.get("onTimeDeliveryRate") or 0, "%"),
+    "tasksCompleted": Metric(lambda r: r.get("tasksCompleted") or 0, "tasks"),
+}
+
+
+def trend(record: Record) -> str:
+    """Recent days' completions against the rest of the week's"""
+    days = [d.get("tasksCompleted") or 0 for d in record.get("performanceTrend") or ()]
+    if len(days) <= RECENT_DAYS:
+        return "same"
+    recent = sum(days[-RECENT_DAYS:]) / RECENT_DAYS
+    earlier = sum(days[:-RECENT_DAYS]) / (len(days) - RECENT_DAYS)
+    return "up" if recent > earlier * 1.1 else "down" if recent < earlier * 0.9 else "same"
+
+
+def badge(user: Optional[Record]) -> Optional[str]:
+    """The employee's strongest skill and its level, e.g. "CNC Machining Expert" """
+    skills = [s for s in (user or {}).get("skills") or () if s.get("level") in LEVELS]
+    if not skills:
+        return None
+    best = max(skills, key=lambda s: LEVELS[s["level"]])
+    return f"{best.get('skillName') or best.get('skillId')} {best['level'].capitalize()}"
+
+
+class Leaderboard:
+    """
+    Employees ranked by each metric of their performance rows.
+
+    Every metric keeps a RankedList of (-score, -tasksCompleted, employee)
+    keys, so ties go to the larger body of work and then the lower id. A
+    change to one performance row removes and re-inserts that employee's
+    keys in O(log n), and "top N" or "rank of X" never sorts the workforce.
+    Each employee's name, trend and badge are kept beside the keys, so a
+    read needs nothing from the store. The lists have their own lock, held
+    by a writer only while it moves one employee and by a reader only while
+    it walks the list, so reads never wait for the store's writer lock or a
+    whole batch.
+    """
+
+    def __init__(self, store: Store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._keys: Dict[Any, Dict[str, Tuple[float, float, str]]] = {}
+        self._ranked: Dict[str, RankedList] = {}
+        # Employee id -> the entry fields that are not the rank or score
+        self._profiles: Dict[str, Record] = {}
+        store.performance.subscribe(self._on_performance)
+        store.users.subscribe(self._on_user)
+        self.rebuild()
+
+    @staticmethod
+    def _entry_keys(employee_id: Any, record: Record) -> Dict[str, Tuple[float, float, str]]:
+        completed = record.get("tasksCompleted") or 0
+        return {name: (-metric.score(record), -completed, str(employee_id)) for name, metric in METRICS.items()}
+
+    def _profile(self, employee_id: Any, record: Record) -> Record:
+        user = self.store.users.get(employee_id)
+        return {"employeeName": (user or {}).get("name"), "trend": trend(record), "badge": badge(user)}
+
+    def rebuild(self) -> None:
+        keys, profiles = {}, {}
+        for record in self.store.performance.all():
+            employee_id = performance_key(record)
+            keys[employee_id] = self._entry_keys(employee_id, record)
+            profiles[str(employee_id)] = self._profile(employee_id, record)
+        ranked = {name: RankedList(entry[name] for entry in keys.values()) for name in METRICS}
+        with self._lock:
+            self._keys, self._ranked, self._profiles = keys, ranked, profiles
+
+    def _on_performance(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self.rebuild()
+            return
+        after = self._entry_keys(key, new) if new is not None else None
+        profile = self._profile(key, new) if new is not None else None
+        with self._lock:
+            before = self._keys.pop(key, None)
+            for name, ranked in self._ranked.items():
+                if before is not None:
+                    ranked.remove(before[name])
+                if after is not None:
+                    ranked.insert(after[name])
+            if after is not None:
+                self._keys[key] = after
+                self._profiles[str(key)] = profile
+            else:
+                self._profiles.pop(str(key), None)
+
+    def _on_user(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self.rebuild()
+            return
+        record = self.store.performance.get(key)
+        if record is not None:
+            profile = self._profile(key, record)
+            with self._lock:
+                self._profiles[str(key)] = profile
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _entry(self, metric: str, rank: int, key: Tuple[float, float, str]) -> Record:
+        """One ranked entry; caller holds the lock"""
+        employee_id = key[2]
+        profile = self._profiles[employee_id]
+        return {
+            "rank": rank,
+            "employeeId": employee_id,
+            "employeeName": profile["employeeName"],
+            "score": -key[0],
+            "metric": METRICS[metric].unit,
+            "trend": profile["trend"],
+            "badge": profile["badge"],
+        }
+
+    def top(self, metric: str = "overall", limit: int = 10, offset: int = 0) -> List[Record]:
+        """Ranks offset+1 to offset+limit; raises KeyError for an unknown metric"""
+        with self._lock:
+            keys = self._ranked[metric].slice(offset, limit)
+            return [self._entry(metric, offset + i + 1, key) for i, key in enumerate(keys)]
+
+    def rank(self, employee_id: Any, metric: str = "overall") -> Optional[Record]:
+        """One employee's place, or None when they have no performance row"""
+        with self._lock:
+            keys = self._keys.get(employee_id)
+            if keys is None:
+                return None
+            position = self._ranked[metric].rank(keys[metric])
+            return {**self._entry(metric, position + 1, keys[metric]), "of": len(self._keys)}
@@ -0,0 +1,182 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from store import Record, Store
+
+
+# Same weights as the dashboard's original calculateEmployeeMatch
+SKILL_WEIGHT = 0.4
+WORKLOAD_WEIGHT = 0.3
+PERFORMANCE_WEIGHT = 0.2
+AVAILABILITY_POINTS = 10
+
+LEVELS = {"beginner": 1, "intermediate": 2, "advanced": 3, "expert": 4}
+
+# Hours (0-23) at which a task may start for each shift
+SHIFT_HOURS = {
+    "Morning": set(range(0, 16)),
+    "Afternoon": set(range(14, 24)),
+    "Evening": set(range(14, 24)),
+    "Night": set(range(22, 24)) | set(range(0, 6)),
+}
+
+
+# ---------------- Roster Matrices ----------------
+class Roster:
+    """
+    Column-oriented view of the employees used for scoring.
+
+    ``has``, ``level`` and ``certified`` are employee x skill matrices;
+    ``workload``, ``performance`` and ``shift`` are per-employee vectors.
+    ``available`` is a shift x hour lookup table.
+    """
+
+    def __init__(self, employees: List[Record], skill_ids: List[str]):
+        self.employees = employees
+        self.columns: Dict[str, int] = {skill_id: i for i, skill_id in enumerate(skill_ids)}
+        for employee in employees:
+            for skill in employee.get("skills") or ():
+                self.columns.setdefault(skill.get("skillId"), len(self.columns))
+
+        n, m = len(employees), len(self.columns)
+        self.has = np.zeros((n, m), dtype=bool)
+        self.level = np.zeros((n, m), dtype=np.int8)
+        self.certified = np.zeros((n, m), dtype=bool)
+        self.workload = np.zeros(n, dtype=np.float32)
+        self.performance = np.zeros(n, dtype=np.float32)
+
+        shifts = list(SHIFT_HOURS)
+        shift_codes = {name: i for i, name in enumerate(shifts)}
+        self.shift = np.full(n, len(shifts), dtype=np.int8)
+        # Last row is for employees with an unknown shift: never available
+        self.available = np.zeros((len(shifts) + 1, 24), dtype=bool)
+        for name, hours in SHIFT_HOURS.items():
+            self.available[shift_codes[name], sorted(hours)] = True
+
+        for row, employee in enumerate(employees):
+            self.workload[row] = employee.get("currentWorkload") or 0
+            self.performance[row] = employee.get("performanceScore") or 0
+            self.shift[row] = shift_codes.get(employee.get("shift"), len(shifts))
+            for skill in employee.get("skills") or ():
+                col = self.columns[skill.get("skillId")]
+                self.has[row, col] = True
+                self.level[row, col] = LEVELS.get(skill.get("level"), 0)
+                self.certified[row, col] = any(
+                    c.get("status") == "active" for c in skill.get("certifications") or ()
+                )
+
+
+# ---------------- Match Engine ----------------
+class MatchEngine:
+    """Scores every employee for a task in one vectorized pass"""
+
+    def __init__(self, store: Store):
+        self.store = store
+        self._roster: Optional[Roster] = None
+        self._roster_version: Tuple[int, int] = (-1, -1)
+
+    def roster(self) -> Roster:
+        """The roster matrices, rebuilt only after users or skills change"""
+        version = (self.store.users.version, self.store.skills.version)
+        if self._roster is None or version != self._roster_version:
+            employees = self.store.users.find("role", "employee")
+            self._roster = Roster(employees, [s["id"] for s in self.store.skills.all()])
+            self._roster_version = version
+        return self._roster
+
+    def scores(self, required_skills: List[str], start_time: Optional[str]) -> Dict[str, np.ndarray]:
+        roster = self.roster()
+        n = len(roster.employees)
+        if required_skills:
+            cols = [roster.columns[s] for s in required_skills if s in roster.columns]
+            matched = roster.has[:, cols].sum(axis=1) if cols else np.zeros(n)
+            skill = matched * (100.0 / len(required_skills))
+        else:
+            skill = np.full(n, 100.0)
+        workload = 100.0 - roster.workload
+        hour = parse_hour(start_time)
+        available = roster.available[roster.shift, hour] if hour is not None else np.zeros(n, dtype=bool)
+        total = (
+            skill * SKILL_WEIGHT
+            + workload * WORKLOAD_WEIGHT
+            + roster.performance * PERFORMANCE_WEIGHT
+            + available * AVAILABILITY_POINTS
+        )
+        return {
+            # Round half up, like Math.round on the dashboard
+            "matchScore": np.floor(total + 0.5).astype(np.int32),
+            "skillMatch": skill,
+            "workloadScore": workload,
+            "performanceScore": roster.performance,
+            "availability": available,
+        }
+
+    def match(self, required_skills: List[str], start_time: Optional[str], limit: int = 10) -> List[Dict[str, Any]]:
+        """Top `limit` employees by match score, best first, with reasons"""
+        roster = self.roster()
+        if not roster.employees:
+            return []
+        scores = self.scores(required_skills, start_time)
+        total = scores["matchScore"]
+        limit = min(limit, len(total))
+        top = np.argpartition(-total, limit - 1)[:limit]
+        # Ties keep roster order so results are stable
+        top = top[np.lexsort((top, -total[top]))]
+        return [self._describe(roster, int(row), required_skills, scores) for row in top]
+
+    def _describe(self, roster: Roster, row: int, required_skills: List[str], scores) -> Dict[str, Any]:
+        employee = roster.employees[row]
+        reasons = []
+        for skill_id in required_skills:
+            skill = self.store.skills.get(skill_id)
+            name = skill.get("name") if skill else skill_id
+            col = roster.columns.get(skill_id)
+            if col is not None and roster.has[row, col]:
+                level = next(
+                    (s.get("level") for s in employee.get("skills") or () if s.get("skillId") == skill_id), None
+                )
+                certified = " (Certified)" if roster.certified[row, col] else ""
+                reasons.append({"type": "skill", "label": f"{name} - {level} level{certified}", "impact": "positive"})
+            elif skill:
+                reasons.append({"type": "skill", "label": f"Missing: {name}", "impact": "negative"})
+
+        workload = float(roster.workload[row])
+        if workload < 40:
+            reasons.append({"type": "workload", "label": f"Low current workload ({workload:g}%)", "impact": "positive"})
+        elif workload > 75:
+            reasons.append({"type": "workload", "label": f"High current workload ({workload:g}%)", "impact": "negative"})
+
+        performance = float(roster.performance[row])
+        if performance >= 90:
+            reasons.append({"type": "performance", "label": f"Excellent performance rating ({performance:g}/100)",
+                            "impact": "positive"})
+        elif performance < 75:
+            reasons.append({"type": "performance", "label": f"Below average performance ({performance:g}/100)",
+                            "impact": "neutral"})
+
+        available = bool(scores["availability"][row])
+        if available:
+            reasons.append({"type": "availability", "label": f"Available ({employee.get('shift')} shift)",
+                            "impact": "positive"})
+        else:
+            reasons.append({"type": "availability", "label": "Not on shift during task time", "impact": "negative"})
+
+        return {
+            "employee": employee,
+            "matchScore": int(scores["matchScore"][row]),
+            "reasons": reasons,
+            "skillMatch": float(scores["skillMatch"][row]),
+            "workloadScore": float(scores["workloadScore"][row]),
+            "performanceScore": performance,
+            "availability": available,
+        }
+
+
+def parse_hour(start_time: Optional[str]) -> Optional[int]:
+    """Hour from an "HH:MM" time, or None when missing or malformed"""
+    try:
+        hour = int(str(start_time).split(":")[0])
+    except ValueError:
+        return None
+    return hour if 0 <= hour < 24 else None
@@ -0,0 +1,307 @@
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STORE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                 0.05, 0.1, 0.25, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUANTILES = (0.5, 0.95, 0.99)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+# ---------------- Per-Thread Cells ----------------
+class Cells:
+    """
+    A row of counters that each thread increments in its own copy.
+
+    Nothing is shared between writers, so updates need no lock and none
+    are lost; readers sum the copies. Appending a new thread's row is a
+    single list append, which is atomic.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._rows: List[List[float]] = []
+
+    def mine(self) -> List[float]:
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = [0.0] * self.size
+            self._rows.append(row)
+        return row
+
+    def totals(self) -> List[float]:
+        totals = [0.0] * self.size
+        for row in list(self._rows):
+            for i, value in enumerate(row):
+                totals[i] += value
+        return totals
+
+
+# ---------------- Metric Families ----------------
+class Family:
+    """A named metric with one child per label combination"""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._children: Dict[Labels, Cells] = {}
+
+    def _cells(self, labels: Labels) -> Cells:
+        cells = self._children.get(labels)
+        if cells is None:
+            cells = self._children.setdefault(labels, Cells(self._width()))
+        return cells
+
+    def _width(self) -> int:
+        return 1
+
+    def _label_text(self, labels: Labels, extra: str = "") -> str:
+        pairs = [f'{name}="{escape(value)}"' for name, value in zip(self.labels, labels)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, cells in sorted(self._children.items()):
+            lines.extend(self._render_child(labels, cells.totals()))
+        return lines
+
+    def _render_child(self, labels: Labels, totals: List[float]) -> List[str]:
+        return [f"{self.name}{self._label_text(labels)} {format_value(totals[0])}"]
+
+
+class Counter(Family):
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._cells(labels).mine()[0] += amount
+
+
+class Gauge(Family):
+    """A value that goes up and down; each thread keeps its own delta"""
+
+    kind = "gauge"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._cells(labels).mine()[0] += amount
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self._cells(labels).mine()[0] -= amount
+
+
+class Histogram(Family):
+    """
+    Observations counted into fixed buckets, plus their sum.
+    Estimated quantiles are exported alongside as a separate gauge family.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def _width(self) -> int:
+        # One cell per bucket, one for +Inf, then the sum
+        return len(self.buckets) + 2
+
+    def observe(self, labels: Labels, value: float) -> None:
+        row = self._cells(labels).mine()
+        row[bisect.bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def time(self, labels: Labels) -> "Timer":
+        return Timer(self, labels)
+
+    def _render_child(self, labels: Labels, totals: List[float]) -> List[str]:
+        lines = []
+        cumulative = 0.0
+        for bound, count in zip(self.buckets + (float("inf"),), totals):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else format_value(bound)
+            bucket = self._label_text(labels, f'le="{le}"')
+            lines.append(f"{self.name}_bucket{bucket} {format_value(cumulative)}")
+        lines.append(f"{self.name}_sum{self._label_text(labels)} {format_value(totals[-1])}")
+        lines.append(f"{self.name}_count{self._label_text(labels)} {format_value(cumulative)}")
+        return lines
+
+    def quantiles(self, labels: Labels, quantiles: Iterable[float] = QUANTILES) -> Dict[float, Optional[float]]:
+        """Quantile estimates by linear interpolation within buckets; None before any observation"""
+        cells = self._children.get(labels)
+        counts = cells.totals()[:-1] if cells is not None else []
+        total = sum(counts)
+        estimates: Dict[float, Optional[float]] = {}
+        for q in quantiles:
+            if not total:
+                estimates[q] = None
+                continue
+            rank = q * total
+            seen = 0.0
+            for i, count in enumerate(counts):
+                if seen + count >= rank and count:
+                    low = self.buckets[i - 1] if i else 0.0
+                    # Past the last bound there is nothing to interpolate towards
+                    high = self.buckets[i] if i < len(self.buckets) else low
+                    estimates[q] = low + (high - low) * (rank - seen) / count
+                    break
+                seen += count
+        return estimates
+
+    def render_quantiles(self, name: str) -> List[str]:
+        lines = [f"# HELP {name} Estimated {self.name} quantiles", f"# TYPE {name} gauge"]
+        for labels in sorted(self._children):
+            for q, value in self.quantiles(labels).items():
+                if value is not None:
+                    label_text = self._label_text(labels, f'quantile="{q}"')
+                    lines.append(f"{name}{label_text} {format_value(value)}")
+        return lines
+
+
+class Timer:
+    """Context manager that observes its elapsed seconds into a histogram"""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(self.labels, time.perf_counter() - self.start)
+
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+# ---------------- Registry ----------------
+class Registry:
+    def __init__(self):
+        self.families: List[Family] = []
+        self._quantiles: List[Tuple[Histogram, str]] = []
+
+    def _add(self, family: Family) -> Family:
+        self.families.append(family)
+        return family
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        quantiles: Optional[str] = None,
+    ) -> Histogram:
+        """``quantiles`` names a gauge family that exports estimated p50/p95/p99"""
+        histogram = self._add(Histogram(name, help, labels, buckets))
+        if quantiles:
+            self._quantiles.append((histogram, quantiles))
+        return histogram
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self.families:
+            lines.extend(family.render())
+        for histogram, name in self._quantiles:
+            lines.extend(histogram.render_quantiles(name))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.counter("optiwork_http_requests_total", "HTTP requests by route, method and status",
+                            ("route", "method", "status"))
+ERRORS = REGISTRY.counter("optiwork_http_errors_total", "Requests that failed with a 5xx or an exception",
+                          ("route", "method"))
+IN_FLIGHT = REGISTRY.gauge("optiwork_http_requests_in_flight", "Requests being handled now")
+LATENCY = REGISTRY.histogram("optiwork_http_request_duration_seconds", "Time from request to last body byte",
+                             ("route", "method"), quantiles="optiwork_http_request_duration_quantile_seconds")
+REQUEST_BYTES = REGISTRY.histogram("optiwork_http_request_size_bytes", "Request body sizes",
+                                   ("route", "method"), SIZE_BUCKETS)
+RESPONSE_BYTES = REGISTRY.histogram("optiwork_http_response_size_bytes", "Response body sizes as sent",
+                                    ("route", "method"), SIZE_BUCKETS)
+STORE_SECONDS = REGISTRY.histogram(
+    "optiwork_store_operation_seconds",
+    "Time in store work: index lookups, sorting and paging, record fetches, scans and serialization",
+    ("collection", "operation"), STORE_BUCKETS, quantiles="optiwork_store_operation_quantile_seconds",
+)
+
+
+# ---------------- Metrics Middleware ----------------
+class MetricsMiddleware:
+    """
+    Records latency, body sizes, status and in-flight count for every HTTP
+    request, labelled by route template (not the raw path) so ids do not
+    create new series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        received = sent = 0
+        status = 500
+
+        async def receive_wrapper() -> Message:
+            nonlocal received
+            message = await receive()
+            received += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal sent, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            else:
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            IN_FLIGHT.dec()
+            route = scope.get("route")
+            labels = (route.path if route is not None else "unmatched", scope["method"])
+            LATENCY.observe(labels, time.perf_counter() - start)
+            REQUEST_BYTES.observe(labels, received)
+            RESPONSE_BYTES.observe(labels, sent)
+            REQUESTS.inc((*labels, str(status)))
+            if status >= 500:
+                ERRORS.inc(labels)
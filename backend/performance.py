@@ -0,0 +1,423 @@
+import datetime
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from heatmap import delivered_on_time
+from reports import today_iso
+from store import Collection, Record, Store
+
+
+# Rolling windows reported per employee, in days up to and including today
+WINDOWS = (1, 7, 30)
+# Days of performanceTrend
+TREND_DAYS = 7
+# Skills listed in skillsUsed
+SKILLS_USED = 3
+# Counters of one due date's bucket
+DUE, DONE, ON_TIME, QUALITY, RATED, MINUTES, OPEN = range(7)
+BUCKET = 7
+
+# What one task adds to its assignee's figures:
+# (assignee, due day ordinal, completed, on time, quality rating, minutes taken, required skills)
+Contribution = Tuple[str, Optional[int], bool, bool, Optional[float], int, Tuple[str, ...]]
+
+
+def day_ordinal(value: Any) -> Optional[int]:
+    try:
+        return datetime.date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+def task_minutes(task: Record) -> int:
+    """Minutes from startTime to the time of day in completedAt, wrapping past midnight; 0 if unknown"""
+    try:
+        start_h, start_m = map(int, task["startTime"].split(":"))
+        done_h, done_m = map(int, str(task["completedAt"])[11:16].split(":"))
+    except (KeyError, AttributeError, ValueError):
+        return 0
+    return (done_h * 60 + done_m - start_h * 60 - start_m) % (24 * 60)
+
+
+def quality_rating(task: Record) -> Optional[float]:
+    rating = task.get("qualityRating")
+    if rating is None:
+        rating = ((task.get("feedback") or {}).get("supervisorFeedback") or {}).get("qualityRating")
+    return rating if isinstance(rating, (int, float)) and not isinstance(rating, bool) else None
+
+
+def rates(due: int, done: int, on_time: int, quality: float, rated: int, minutes: int) -> Record:
+    """The rate fields of a performance row, rounded as the dashboard shows them"""
+    return {
+        "completionRate": round(done / due * 100) if due else 0,
+        "averageTaskTime": round(minutes / done) if done else 0,
+        "onTimeDeliveryRate": round(on_time / done * 100) if done else 0,
+        "qualityScore": round(quality / rated, 1) if rated else 0,
+    }
+
+
+def _due_for(done: int, rate: Any) -> int:
+    """Tasks due behind a completion count at a completion rate in percent"""
+    return round(done * 100 / rate) if rate else done
+
+
+class Account:
+    """One employee's running totals, and per-day buckets for the recent windows"""
+
+    __slots__ = ("assigned", "completed", "on_time", "quality", "rated", "minutes", "overdue", "skills", "days")
+
+    def __init__(self):
+        self.assigned = 0
+        self.completed = 0
+        self.on_time = 0
+        self.quality = 0.0
+        self.rated = 0
+        self.minutes = 0
+        # Open tasks due before today
+        self.overdue = 0
+        self.skills: Counter = Counter()
+        # Due day ordinal -> bucket, from the start of the longest window on
+        self.days: Dict[int, List[float]] = {}
+
+    def copy(self) -> "Account":
+        account = Account()
+        for field in ("assigned", "completed", "on_time", "quality", "rated", "minutes", "overdue"):
+            setattr(account, field, getattr(self, field))
+        account.skills = Counter(self.skills)
+        account.days = {day: list(bucket) for day, bucket in self.days.items()}
+        return account
+
+    def add(self, contribution: Contribution, sign: int, today: int, first_day: int) -> None:
+        _, day, completed, on_time, quality, minutes, skills = contribution
+        self.assigned += sign
+        if completed:
+            self.completed += sign
+            self.on_time += sign * on_time
+            self.minutes += sign * minutes
+            if quality is not None:
+                self.quality += sign * quality
+                self.rated += sign
+            for skill in skills:
+                self.skills[skill] += sign
+                if not self.skills[skill]:
+                    del self.skills[skill]
+        elif day is not None and day < today:
+            self.overdue += sign
+        if day is not None and day >= first_day:
+            bucket = self.days.get(day)
+            if bucket is None:
+                bucket = self.days[day] = [0] * BUCKET
+            bucket[DUE] += sign
+            if completed:
+                bucket[DONE] += sign
+                bucket[ON_TIME] += sign * on_time
+                bucket[MINUTES] += sign * minutes
+                if quality is not None:
+                    bucket[QUALITY] += sign * quality
+                    bucket[RATED] += sign
+            else:
+                bucket[OPEN] += sign
+            if not bucket[DUE]:
+                del self.days[day]
+
+    def roll(self, today: int, day: int, first_day: int) -> None:
+        """Move from ``today`` to the later ``day``: open work due in between becomes overdue"""
+        self.overdue += sum(b[OPEN] for d, b in self.days.items() if today <= d < day)
+        for stale in [d for d in self.days if d < first_day]:
+            del self.days[stale]
+
+    def window(self, today: int, days: int) -> Record:
+        """Figures of the tasks due in the ``days`` days up to today"""
+        total = [0] * BUCKET
+        overdue = 0
+        for day in range(today - days + 1, today + 1):
+            bucket = self.days.get(day)
+            if bucket is not None:
+                for field in range(BUCKET):
+                    total[field] += bucket[field]
+                if day < today:
+                    overdue += bucket[OPEN]
+        return {
+            "tasksDue": total[DUE],
+            "tasksCompleted": total[DONE],
+            "tasksOverdue": overdue,
+            **rates(total[DUE], total[DONE], total[ON_TIME], total[QUALITY], total[RATED], total[MINUTES]),
+        }
+
+    def dump(self, employee_id: str) -> Record:
+        """The totals as a ``store.baselines`` record, which ``restore`` reads back"""
+        return {
+            "employeeId": employee_id,
+            "tasksAssigned": self.assigned,
+            "tasksCompleted": self.completed,
+            "onTime": self.on_time,
+            "quality": self.quality,
+            "rated": self.rated,
+            "minutes": self.minutes,
+            "tasksOverdue": self.overdue,
+            "skills": dict(self.skills),
+            "days": {
+                datetime.date.fromordinal(day).isoformat(): list(bucket) for day, bucket in sorted(self.days.items())
+            },
+        }
+
+
+def restore(baseline: Record, first_day: int) -> Account:
+    """An account from a dumped baseline; day buckets before ``first_day`` are dropped"""
+    account = Account()
+    account.assigned = baseline.get("tasksAssigned") or 0
+    account.completed = baseline.get("tasksCompleted") or 0
+    account.on_time = baseline.get("onTime") or 0
+    account.quality = baseline.get("quality") or 0
+    account.rated = baseline.get("rated") or 0
+    account.minutes = baseline.get("minutes") or 0
+    account.overdue = baseline.get("tasksOverdue") or 0
+    account.skills = Counter(baseline.get("skills") or {})
+    days = ((day_ordinal(date), list(bucket)) for date, bucket in (baseline.get("days") or {}).items())
+    account.days = {day: bucket for day, bucket in days if day is not None and day >= first_day}
+    return account
+
+
+def seeded(row: Record, first_day: int) -> Account:
+    """
+    The figures a seeded performance row stands for, estimated from its
+    rates (the counts behind a rate are rounded, so it reads back the same
+    to within a point). Rows written before baselines were kept apart carry
+    theirs in a ``baseline`` field.
+    """
+    if isinstance(row.get("baseline"), dict):
+        return restore(row["baseline"], first_day)
+    account = Account()
+    completed = row.get("tasksCompleted") or 0
+    on_time_rate = (row.get("onTimeDeliveryRate") or 0) / 100
+    quality = row.get("qualityScore") or 0
+    minutes = row.get("averageTaskTime") or 0
+    account.completed = completed
+    account.assigned = _due_for(completed, row.get("completionRate"))
+    account.on_time = round(completed * on_time_rate)
+    account.quality = quality * completed
+    account.rated = completed if quality else 0
+    account.minutes = minutes * completed
+    account.overdue = row.get("tasksOverdue") or 0
+    account.skills = Counter({s["skillId"]: s.get("count") or 0 for s in row.get("skillsUsed") or () if "skillId" in s})
+    for entry in row.get("performanceTrend") or ():
+        day = day_ordinal(entry.get("date"))
+        done = entry.get("tasksCompleted") or 0
+        if day is not None and day >= first_day and done:
+            # The day's split is unknown; it is taken to follow the row's rates
+            account.days[day] = [_due_for(done, entry.get("completionRate")), done, round(done * on_time_rate),
+                                 quality * done, done if quality else 0, minutes * done, 0]
+    return account
+
+
+def materialize(employee_id: str, department: Optional[str], account: Account, today: int) -> Record:
+    """The performance record for one employee: lifetime figures, the last week by day, and each window"""
+    trend = []
+    for day in range(today - TREND_DAYS + 1, today + 1):
+        bucket = account.days.get(day) or [0] * BUCKET
+        trend.append({
+            "date": datetime.date.fromordinal(day).isoformat(),
+            "completionRate": round(bucket[DONE] / bucket[DUE] * 100) if bucket[DUE] else 0,
+            "tasksCompleted": bucket[DONE],
+        })
+    used = sorted(account.skills.items(), key=lambda item: (-item[1], item[0]))[:SKILLS_USED]
+    return {
+        "employeeId": employee_id,
+        "department": department,
+        **rates(account.assigned, account.completed, account.on_time, account.quality, account.rated,
+                account.minutes),
+        "tasksCompleted": account.completed,
+        "tasksOverdue": account.overdue,
+        "skillsUsed": [{"skillId": skill, "count": count} for skill, count in used],
+        "performanceTrend": trend,
+        "windows": {f"{days}d": account.window(today, days) for days in WINDOWS},
+    }
+
+
+# ---------------- Performance Book ----------------
+class PerformanceBook:
+    """
+    Employee performance rows kept up to date from task changes.
+
+    Each task's contribution is remembered, so a create, update or delete
+    (such as ``update_task`` completing a task) adds to or takes from its
+    assignee's running totals and one bucket of their due-date ring, then
+    rewrites that one row in ``store.performance``; inside a store batch
+    each row is rewritten once at the end. The buckets cover the longest
+    window plus any later due dates, so the 1, 7 and 30-day windows and the
+    week's trend are sums over at most 30 buckets, never over tasks.
+
+    Every row starts from a baseline: what its seeded figures stand for, and
+    later the tasks moved to the archive, which still count but cannot
+    change any more. Baselines are kept in ``store.baselines``, which is
+    persisted but never served, so a restart reads them back instead of
+    counting the tasks in the store twice. Rows are never deleted
+    for want of tasks. Overdue counts and the windows depend on the current
+    date, so every row is re-materialized when the day rolls over (see
+    ``refresh``).
+    """
+
+    def __init__(self, store: Store, today: Callable[[], str] = today_iso):
+        self.store = store
+        self._clock = today
+        self.today = today()
+        self._day = day_ordinal(self.today)
+        # Baseline plus the tasks in the store, per employee
+        self._accounts: Dict[str, Account] = {}
+        self._baselines: Dict[str, Account] = {}
+        # Departments of seeded rows, for employees without a user record
+        self._departments: Dict[str, Optional[str]] = {}
+        self._contributions: Dict[Any, Contribution] = {}
+        # Employees changed during a store batch, published once it ends
+        self._dirty: Set[str] = set()
+        store.on_batch_end(self._end_batch)
+        store.users.subscribe(self._on_user)
+        store.tasks.subscribe(self._on_task)
+        store.performance.subscribe(self._on_performance)
+        self._seed()
+        self.rebuild()
+
+    @property
+    def _first_day(self) -> int:
+        """Due days before this one have no bucket"""
+        return self._day - max(WINDOWS) + 1
+
+    def _seed(self) -> None:
+        """Take the saved baselines, and estimate one for each seeded row without"""
+        self._baselines = {
+            str(saved["employeeId"]): restore(saved, self._first_day) for saved in self.store.baselines.all()
+        }
+        self._departments = {}
+        estimated = []
+        for row in self.store.performance.all():
+            employee = str(row.get("employeeId"))
+            if employee not in self._baselines:
+                self._baselines[employee] = seeded(row, self._first_day)
+                estimated.append(employee)
+            self._departments[employee] = row.get("department")
+        # Saved before the rows are rewritten with the live tasks counted in
+        self._save(estimated)
+
+    def _save(self, employees: Iterable[str]) -> None:
+        for employee in employees:
+            self.store.baselines.insert(self._baselines[employee].dump(employee))
+
+    @staticmethod
+    def _contribution(task: Optional[Record]) -> Optional[Contribution]:
+        if task is None or task.get("assignedTo") is None:
+            return None
+        completed = task.get("status") == "completed"
+        return (
+            str(task["assignedTo"]),
+            day_ordinal(task["dueDate"]) if task.get("dueDate") else None,
+            completed,
+            completed and delivered_on_time(task),
+            quality_rating(task) if completed else None,
+            task_minutes(task) if completed else 0,
+            tuple(task.get("requiredSkills") or ()) if completed else (),
+        )
+
+    def _account(self, employee: str) -> Account:
+        account = self._accounts.get(employee)
+        if account is None:
+            baseline = self._baselines.get(employee)
+            account = self._accounts[employee] = baseline.copy() if baseline is not None else Account()
+        return account
+
+    def _move(self, key: Any, task: Optional[Record], employees: Set[str]) -> None:
+        """Re-count one task, collecting the employees whose rows changed"""
+        before = self._contributions.get(key)
+        after = self._contribution(task)
+        if before == after:
+            return
+        if before is not None:
+            self._account(before[0]).add(before, -1, self._day, self._first_day)
+            employees.add(before[0])
+            del self._contributions[key]
+        if after is not None:
+            self._account(after[0]).add(after, 1, self._day, self._first_day)
+            employees.add(after[0])
+            self._contributions[key] = after
+
+    def _on_task(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self.rebuild()
+            return
+        if new is None and self.store.is_archiving:
+            # History: the task still counts, it just cannot change any more
+            contribution = self._contributions.pop(key, None)
+            if contribution is not None:
+                employee = contribution[0]
+                baseline = self._baselines.get(employee)
+                if baseline is None:
+                    baseline = self._baselines[employee] = Account()
+                baseline.add(contribution, 1, self._day, self._first_day)
+                self._save([employee])
+                self._publish([employee])
+            return
+        employees: Set[str] = set()
+        self._move(key, new, employees)
+        self._publish(employees)
+
+    def _on_user(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self._publish(self._accounts)
+        elif str(key) in self._accounts and (old or {}).get("department") != (new or {}).get("department"):
+            self._publish([str(key)])
+
+    def _on_performance(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        # A bulk load replaced the rows: they are the new baselines
+        if key is None:
+            self._seed()
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recount every task from scratch, on top of the baselines"""
+        self._accounts = {employee: baseline.copy() for employee, baseline in self._baselines.items()}
+        self._contributions = {}
+        for task in self.store.tasks.all():
+            key = self.store.tasks.key_of(task)
+            self._move(key, task, set())
+        self._publish(self._accounts)
+
+    def _end_batch(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        self._publish(dirty)
+
+    def _publish(self, employees: Iterable[str]) -> None:
+        if self.store.in_batch:
+            self._dirty.update(employees)
+            return
+        performance = self.store.performance
+        for employee in list(employees):
+            user = self.store.users.get(employee)
+            department = user.get("department") if user else self._departments.get(employee)
+            row = materialize(employee, department, self._accounts[employee], self._day)
+            # Unchanged rows (most of them, on a restart) are not written again
+            if performance.get(employee) != row:
+                performance.insert(row)
+
+    def refresh(self) -> None:
+        """Move the windows to the current date, re-materializing every row once a day"""
+        today = self._clock()
+        if today == self.today:
+            return
+        with self.store.lock:
+            if today == self.today:
+                return
+            day = day_ordinal(today)
+            if day < self._day:
+                # The clock went back: buckets before the old window are gone, so recount
+                self.today, self._day = today, day
+                self.rebuild()
+                return
+            first_day = day - max(WINDOWS) + 1
+            for account in (*self._accounts.values(), *self._baselines.values()):
+                account.roll(self._day, day, first_day)
+            self.today, self._day = today, day
+            with self.store.recomputing():
+                self._publish(self._accounts)
+
+    def record(self, employee_id: str) -> Optional[Record]:
+        self.refresh()
+        return self.store.performance.get(employee_id)
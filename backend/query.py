@@ -0,0 +1,131 @@
+import base64
+import bisect
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from metrics import STORE_SECONDS
+from store import Collection, Record, Snapshot
+
+
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ---------------- Cursors ----------------
+def encode_cursor(key: str) -> str:
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode(), altchars=b"-_", validate=True).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor(cursor)
+
+
+def split_param(value: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated query parameter; None when absent"""
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+# ---------------- Selection ----------------
+def select_keys(
+    collection: Union[Collection, Snapshot],
+    equals: Optional[Dict[str, Sequence[Any]]] = None,
+    ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+) -> Optional[set]:
+    """
+    Intersect index buckets for the given filters.
+
+    ``equals`` maps a field to the values it may take (OR within a field,
+    AND across fields); ``ranges`` maps a field to inclusive (low, high)
+    bounds. Returns None when no filter applies, meaning "every key".
+    """
+    candidates: List[set] = []
+    for field, values in (equals or {}).items():
+        if values is None:
+            continue
+        keys = set()
+        for value in values:
+            keys.update(collection.keys_for(field, value))
+        candidates.append(keys)
+    for field, (low, high) in (ranges or {}).items():
+        if low is None and high is None:
+            continue
+        candidates.append(collection.keys_between(field, low, high))
+
+    if not candidates:
+        return None
+    candidates.sort(key=len)
+    selected = candidates[0]
+    for keys in candidates[1:]:
+        selected = selected & keys
+        if not selected:
+            break
+    return selected
+
+
+def paginate(
+    collection: Union[Collection, Snapshot],
+    keys: Optional[set],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Order keys by primary key and return the page after ``cursor``.
+
+    The next cursor is None once the last page has been served.
+    """
+    ordered = collection.sorted_keys() if keys is None else sorted(keys)
+    start = 0
+    if cursor:
+        start = bisect.bisect_right(ordered, decode_cursor(cursor))
+    if limit is None:
+        return ordered[start:], None
+    page = ordered[start:start + limit]
+    more = start + limit < len(ordered)
+    return page, encode_cursor(page[-1]) if more and page else None
+
+
+def project(record: Record, fields: Optional[List[str]], key_field: str = "id") -> Record:
+    """Keep only the requested fields (the primary key is always included)"""
+    if not fields:
+        return record
+    projected = {key_field: record.get(key_field)} if key_field in record else {}
+    for field in fields:
+        if field in record:
+            projected[field] = record[field]
+    return projected
+
+
+def run_query(
+    collection: Collection,
+    equals: Optional[Dict[str, Sequence[Any]]] = None,
+    ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    key_field: str = "id",
+) -> Tuple[List[Record], Optional[str]]:
+    """Filter through indexes, page by primary key and project the results"""
+    # Every step reads the same version, however many writes land meanwhile
+    snapshot = collection.snapshot()
+    started = time.perf_counter()
+    keys = select_keys(snapshot, equals, ranges)
+    selected = time.perf_counter()
+    page, next_cursor = paginate(snapshot, keys, cursor, limit)
+    paged = time.perf_counter()
+    records = [snapshot.get(key) for key in page]
+    if fields:
+        records = [project(record, fields, key_field) for record in records]
+    fetched = time.perf_counter()
+    STORE_SECONDS.observe((collection.name, "index_lookup"), selected - started)
+    STORE_SECONDS.observe((collection.name, "sort_page"), paged - selected)
+    STORE_SECONDS.observe((collection.name, "fetch"), fetched - paged)
+    return records, next_cursor
@@ -0,0 +1,223 @@
+import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from store import Collection, Record, Store
+
+
+# Task status -> report counter
+STATUS_FIELDS = {"completed": "completed", "in-progress": "inProgress", "pending": "pending"}
+COUNTERS = ("totalTasks", "completed", "inProgress", "pending")
+UNASSIGNED = "Unassigned"
+
+ALL = ("all", "")
+Scope = Tuple[str, str]
+Tally = Dict[str, int]
+# What one task adds to the reports: (dueDate, status, department, shift)
+Contribution = Tuple[str, Optional[str], str, str]
+
+
+def today_iso() -> str:
+    return datetime.date.today().isoformat()
+
+
+def summarize(tally: Tally, past: bool) -> Record:
+    """Report counters for one tally; open tasks of a past date are overdue"""
+    total = tally["totalTasks"]
+    completed = tally["completed"]
+    return {
+        "totalTasks": total,
+        "completed": completed,
+        "inProgress": tally["inProgress"],
+        "pending": tally["pending"],
+        "overdue": total - completed if past else 0,
+        "completionRate": round(completed / total * 100, 1) if total else 0.0,
+    }
+
+
+def materialize(date: str, scopes: Dict[Scope, Tally], today: str) -> Record:
+    """The report record for one date, with per-department and per-shift breakdowns"""
+    past = date < today
+    breakdown: Dict[str, Dict[str, Record]] = {"department": {}, "shift": {}}
+    for (kind, name), tally in sorted(scopes.items()):
+        if kind in breakdown:
+            breakdown[kind][name] = summarize(tally, past)
+    return {
+        "date": date,
+        **summarize(scopes[ALL], past),
+        "byDepartment": breakdown["department"],
+        "byShift": breakdown["shift"],
+    }
+
+
+def add_contribution(tallies: Dict[str, Dict[Scope, Tally]], contribution: Contribution, sign: int) -> None:
+    date, status, department, shift = contribution
+    scopes = tallies.setdefault(date, {})
+    field = STATUS_FIELDS.get(status)
+    for scope in (ALL, ("department", department), ("shift", shift)):
+        tally = scopes.get(scope)
+        if tally is None:
+            tally = scopes[scope] = dict.fromkeys(COUNTERS, 0)
+        tally["totalTasks"] += sign
+        if field:
+            tally[field] += sign
+        if tally["totalTasks"] == 0:
+            del scopes[scope]
+    if not scopes:
+        del tallies[date]
+
+
+# ---------------- Report Book ----------------
+class ReportBook:
+    """
+    Daily reports kept up to date from task changes.
+
+    Each task's contribution (due date, status, and its assignee's department
+    and shift) is remembered, so a create, update or delete only moves that
+    task between a handful of counters and rewrites one row in
+    ``store.reports``; inside a store batch each row is rewritten once at the
+    end. Dates with no tasks keep whatever row was seeded for them, which is
+    also how dates moved to the archive keep theirs: archived tasks stay in
+    the counters but are no longer tracked. ``overdue`` depends on the
+    current date, so rows are re-materialized when the day rolls over (see
+    ``refresh``).
+    """
+
+    def __init__(self, store: Store, today: Callable[[], str] = today_iso):
+        self.store = store
+        self._clock = today
+        self.today = today()
+        self._tallies: Dict[str, Dict[Scope, Tally]] = {}
+        self._contributions: Dict[Any, Contribution] = {}
+        # Dates whose rows in store.reports this book wrote
+        self._owned: Set[str] = set()
+        # Dates changed during a store batch, published once it ends
+        self._dirty: Set[str] = set()
+        store.on_batch_end(self._end_batch)
+        store.users.subscribe(self._on_user)
+        store.tasks.subscribe(self._on_task)
+        store.reports.subscribe(self._on_reports)
+        self.rebuild()
+
+    def _contribution(self, task: Optional[Record]) -> Optional[Contribution]:
+        if task is None or not task.get("dueDate"):
+            return None
+        user = self.store.users.get(task.get("assignedTo"))
+        department = (user.get("department") if user else None) or UNASSIGNED
+        shift = (user.get("shift") if user else None) or UNASSIGNED
+        return str(task["dueDate"]), task.get("status"), department, shift
+
+    def _move(self, key: Any, task: Optional[Record], dates: Set[str]) -> None:
+        """Re-count one task, collecting the dates whose rows changed"""
+        before = self._contributions.get(key)
+        after = self._contribution(task)
+        if before == after:
+            return
+        if before is not None:
+            add_contribution(self._tallies, before, -1)
+            dates.add(before[0])
+            del self._contributions[key]
+        if after is not None:
+            add_contribution(self._tallies, after, 1)
+            dates.add(after[0])
+            self._contributions[key] = after
+
+    def _on_task(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self.rebuild()
+            return
+        if new is None and self.store.is_archiving:
+            # History: the task still counts, it just cannot change any more.
+            # Its row now stands for tasks a recount cannot see, like a seeded one
+            contribution = self._contributions.pop(key, None)
+            if contribution is not None:
+                self._owned.discard(contribution[0])
+            return
+        dates: Set[str] = set()
+        self._move(key, new, dates)
+        self._publish(dates)
+
+    def _on_user(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if key is None:
+            self.rebuild()
+            return
+        if old and new and (old.get("department"), old.get("shift")) == (new.get("department"), new.get("shift")):
+            return
+        dates: Set[str] = set()
+        tasks = self.store.tasks
+        for task_key in list(tasks.keys_for("assignedTo", key)):
+            self._move(task_key, tasks.get(task_key), dates)
+        self._publish(dates)
+
+    def _on_reports(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        # A bulk load replaced the rows; put the live ones back
+        if key is None:
+            self._owned.clear()
+            self._publish(self._tallies)
+
+    def rebuild(self) -> None:
+        """Recount every task from scratch"""
+        stale = set(self._tallies)
+        self._tallies = {}
+        self._contributions = {}
+        for task in self.store.tasks.all():
+            key = self.store.tasks.key_of(task)
+            self._move(key, task, stale)
+        self._publish(stale | set(self._tallies))
+
+    def _end_batch(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        self._publish(dirty)
+
+    def _publish(self, dates: Iterable[str]) -> None:
+        if self.store.in_batch:
+            self._dirty.update(dates)
+            return
+        reports = self.store.reports
+        for date in dates:
+            scopes = self._tallies.get(date)
+            if scopes:
+                report = materialize(date, scopes, self.today)
+                # A rebuild in every worker's startup leaves most rows as they are stored
+                if reports.get(date) != report:
+                    reports.insert(report)
+                self._owned.add(date)
+            elif date in self._owned:
+                reports.delete(date)
+                self._owned.discard(date)
+
+    def refresh(self) -> None:
+        """Re-materialize the dates whose overdue count changed since the last call"""
+        today = self._clock()
+        if today == self.today:
+            return
+        with self.store.lock:
+            if today == self.today:
+                return
+            low, high = sorted((self.today, today))
+            self.today = today
+            with self.store.recomputing():
+                self._publish([d for d in self._tallies if low <= d < high])
+
+    def report(self, date: str) -> Optional[Record]:
+        self.refresh()
+        return self.store.reports.get(date)
+
+    def all(self) -> List[Record]:
+        """Every report row, newest date first"""
+        self.refresh()
+        reports = self.store.reports.snapshot()
+        return [reports.get(date) for date in reversed(reports.sorted_keys())]
+
+    def check(self) -> List[str]:
+        """Dates whose stored row differs from a full recount of the tasks"""
+        tallies: Dict[str, Dict[Scope, Tally]] = {}
+        for task in self.store.tasks.all():
+            contribution = self._contribution(task)
+            if contribution is not None:
+                add_contribution(tallies, contribution, 1)
+        mismatched = []
+        for date in sorted(set(tallies) | self._owned):
+            expected = materialize(date, tallies[date], self.today) if date in tallies else None
+            if self.store.reports.get(date) != expected:
+                mismatched.append(date)
+        return mismatched
@@ -0,0 +1,264 @@
+import gzip
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import STORE_SECONDS
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library encoder is used instead
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip is offered without it
+    brotli = None
+
+
+# Smaller bodies are not worth a compressor's time (and may not shrink)
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Compressed bodies kept per (path, query, ETag, coding)
+COMPRESSED_CACHE_SIZE = 64
+# Encoded bodies kept, most recently used first; per-employee entries come and go
+ENCODED_CACHE_SIZE = 4096
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by ``dumps``"""
+
+    def render(self, content: Any) -> bytes:
+        with STORE_SECONDS.time(("response", "serialize")):
+            return dumps(content)
+
+
+def join_object(fragments: Dict[str, bytes]) -> bytes:
+    """A JSON object assembled from already encoded member values"""
+    return b"{" + b",".join(dumps(name) + b":" + value for name, value in fragments.items()) + b"}"
+
+
+def etag_for(epoch: str, version: Any) -> str:
+    """Strong validator for a version; tuples of versions are joined with dots"""
+    if isinstance(version, tuple):
+        version = ".".join(str(v) for v in version)
+    return f'"{epoch}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists this ETag (or is "*")"""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # A weak comparison is what RFC 9110 asks of If-None-Match
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# ---------------- Encoded Response Cache ----------------
+class EncodedCache:
+    """
+    Encoded JSON bodies keyed by name, each valid for one data version.
+
+    An entry is rebuilt when it is asked for with a different version, so an
+    unchanged collection is encoded once however often it is polled. The
+    cached bytes are immutable and are handed to every response as is.
+    Rebuilds are timed as a scan (``build``) and a serialization, labelled
+    by the name (or the first element of a tuple name).
+    Concurrent rebuilds of one entry are harmless: the last one wins and a
+    stale winner is rebuilt on the next request. At most ``max_entries``
+    are kept; the least recently used go first.
+    """
+
+    def __init__(self, max_entries: int = ENCODED_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: Hashable, version: Any, build: Callable[[], Any]) -> bytes:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(name)
+                return entry[1]
+        label = name if isinstance(name, str) else str(name[0])
+        started = time.perf_counter()
+        content = build()
+        built = time.perf_counter()
+        body = dumps(content)
+        STORE_SECONDS.observe((label, "scan"), built - started)
+        STORE_SECONDS.observe((label, "serialize"), time.perf_counter() - built)
+        with self._lock:
+            self._entries[name] = (version, body)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# ---------------- Compression ----------------
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, GZIP_LEVEL, mtime=0)
+
+
+def choose_coding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred content coding the client accepts: br when available, then gzip"""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+# ---------------- HTTP Caching Middleware ----------------
+def lookup(table: Dict[str, Any], path: str) -> Any:
+    """The entry for a path, else for the nearest key ending in "/" above it"""
+    found = table.get(path)
+    if found is not None:
+        return found
+    parent = path.rpartition("/")[0] + "/"
+    while parent != "/":
+        found = table.get(parent)
+        if found is not None:
+            return found
+        parent = parent[:-1].rpartition("/")[0] + "/"
+    return None
+
+
+class HTTPCachingMiddleware:
+    """
+    Conditional GETs, Cache-Control and compression for JSON responses.
+
+    ``validators`` maps a path to a function returning the current ETag of
+    everything served under it (any query string); a key ending in "/"
+    covers every path below it. The ETag is checked against If-None-Match
+    before the endpoint runs, so a revalidation never reaches the handler,
+    and is added to the response otherwise. ``policies`` maps a path, or a
+    prefix key the same way, to its Cache-Control value. JSON bodies of at
+    least ``minimum_size`` bytes are compressed with the best coding the
+    client accepts; for responses with an ETag the compressed bytes are
+    cached, so each version of a resource is compressed once per coding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        validators: Dict[str, Callable[[], str]],
+        policies: Dict[str, str],
+        minimum_size: int = COMPRESS_MIN_BYTES,
+        cache_size: int = COMPRESSED_CACHE_SIZE,
+    ):
+        self.app = app
+        self.validators = validators
+        self.policies = policies
+        self.minimum_size = minimum_size
+        self.cache_size = cache_size
+        self._compressed: "OrderedDict[Tuple[str, bytes, str, str], bytes]" = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        request_headers = Headers(scope=scope)
+        validator = lookup(self.validators, path)
+        etag = validator() if validator is not None else None
+        policy = lookup(self.policies, path)
+        if etag is not None and etag_matches(request_headers.get("if-none-match"), etag):
+            headers = [(b"etag", etag.encode())]
+            if policy:
+                headers.append((b"cache-control", policy.encode()))
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        coding = choose_coding(request_headers.get("accept-encoding"))
+        cache_key = (path, scope.get("query_string", b""), etag or "", coding or "")
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if message["status"] == 200:
+                    if etag is not None and "etag" not in headers:
+                        headers["ETag"] = etag
+                    if policy and "cache-control" not in headers:
+                        headers["Cache-Control"] = policy
+                # Only whole JSON bodies are buffered; streams go straight through
+                if headers.get("content-type", "").startswith("application/json") \
+                        and "content-encoding" not in headers:
+                    start = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start["headers"])
+            if len(body) >= self.minimum_size:
+                headers.add_vary_header("Accept-Encoding")
+                if coding is not None:
+                    body = self._compress(body, coding, cache_key if etag is not None else None)
+                    headers["Content-Encoding"] = coding
+                    headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(self, body: bytes, coding: str, key: Optional[Tuple[str, bytes, str, str]]) -> bytes:
+        if key is None:
+            return compress(body, coding)
+        cached = self._compressed.get(key)
+        if cached is not None:
+            self._compressed.move_to_end(key)
+            return cached
+        compressed = self._compressed[key] = compress(body, coding)
+        while len(self._compressed) > self.cache_size:
+            self._compressed.popitem(last=False)
+        return compressed
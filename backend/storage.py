@@ -0,0 +1,557 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ids import MAX_WORKER
+from store import Collection, Record, Store
+
+
+COLLECTIONS = ("users", "tasks", "skills", "reports", "performance", "baselines")
+BATCH_SIZE = 1000
+FLUSH_INTERVAL = 0.05
+# Change log rows kept for workers that fall behind; older ones are pruned
+CHANGE_LOG_ROWS = 100_000
+POLL_INTERVAL = 0.005
+# Seconds a claimed worker id stays reserved without renewal (the flusher renews it)
+WORKER_LEASE = 60.0
+# Seconds a commit waits for another worker's write lock before it fails and is retried
+BUSY_TIMEOUT = 5.0
+# Collections each worker derives from others instead of taking them from the log
+DERIVED = ("reports", "performance", "baselines")
+
+log = logging.getLogger(__name__)
+
+# Change log data of a delete that moved the record to an archive (see Store.archiving)
+ARCHIVED = ""
+
+# (seq, origin, collection, key, JSON data); key None replaces the collection, data None
+# deletes and ARCHIVED archives
+Entry = Tuple[int, str, str, Any, Optional[str]]
+
+
+# ---------------- Storage Backends ----------------
+class Storage:
+    """Where the store's collections live between restarts"""
+
+    def is_empty(self) -> bool:
+        raise NotImplementedError
+
+    def load(self) -> Dict[str, List[Record]]:
+        """Every collection's records, in the order they were first written"""
+        raise NotImplementedError
+
+    def put(self, collection: str, key: Any, record: Record) -> None:
+        raise NotImplementedError
+
+    def delete(self, collection: str, key: Any) -> None:
+        raise NotImplementedError
+
+    def archive(self, collection: str, key: Any) -> None:
+        """Drop a record that was moved to an archive; a delete unless other workers must know"""
+        self.delete(collection, key)
+
+    def replace(self, collection: str, records: Iterable[Record], key_of) -> None:
+        """Drop a collection's contents and write the given records instead"""
+        raise NotImplementedError
+
+    def batch(self) -> ContextManager[None]:
+        """Group the writes made inside the block into one commit"""
+        return nullcontext()
+
+    def last_seq(self) -> int:
+        """Newest change log sequence number; 0 for storage that keeps no log"""
+        return 0
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class MemoryStorage(Storage):
+    """Keeps copies in process memory; nothing survives a restart"""
+
+    def __init__(self):
+        self._data: Dict[str, Dict[Any, Record]] = {name: {} for name in COLLECTIONS}
+
+    def is_empty(self) -> bool:
+        return not any(self._data.values())
+
+    def load(self) -> Dict[str, List[Record]]:
+        return {name: [dict(r) for r in rows.values()] for name, rows in self._data.items()}
+
+    def put(self, collection: str, key: Any, record: Record) -> None:
+        self._data[collection][key] = dict(record)
+
+    def delete(self, collection: str, key: Any) -> None:
+        self._data[collection].pop(key, None)
+
+    def replace(self, collection: str, records: Iterable[Record], key_of) -> None:
+        self._data[collection] = {key_of(r): dict(r) for r in records}
+
+
+class SQLiteStorage(Storage):
+    """
+    One table per collection in a SQLite database in WAL mode.
+
+    Rows hold the record as JSON; tasks also get assignee, status and due date
+    columns with indexes so the file can be queried directly. Writes are
+    coalesced per row and committed in batches: when ``batch_size`` rows are
+    pending, or at most ``flush_interval`` seconds after the first one, by a
+    background flusher. Writes inside ``batch()`` commit together at its end.
+    All statements are fixed strings run through the connection's prepared
+    statement cache.
+
+    A write is therefore acknowledged before it is durable: a process crash
+    loses up to ``flush_interval`` seconds of writes. ``batch_size=1``
+    commits every write (or batch) before it returns instead. A commit that
+    fails, e.g. on a locked database, keeps its rows pending; the flusher
+    logs the error and tries again on its next pass.
+
+    A ``shared`` database may be open in several worker processes at once:
+    every commit also appends its rows to a ``changes`` log, numbered in
+    commit order and tagged with this connection's ``origin``, which
+    ``ChangeFeed`` replays in the other workers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        shared: bool = False,
+        busy_timeout: float = BUSY_TIMEOUT,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.origin: Optional[str] = os.urandom(6).hex() if shared else None
+        # Holder of a claimed worker number (see claim_worker)
+        self._owner = self.origin or os.urandom(6).hex()
+        self._lease: Optional[float] = None
+        self._renewed = 0.0
+        # Workers sharing the file queue on its write lock; BEGIN IMMEDIATE waits up to busy_timeout
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL loses no committed data on an application crash
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        self._lock = threading.RLock()
+        self._batching = 0
+        # (collection, key) -> JSON text, None for a delete or ARCHIVED; last write wins
+        self._pending: Dict[Tuple[str, Any], Optional[str]] = {}
+        # Writes are dropped while suspended (changes replayed from the log are already stored)
+        self._suspended = 0
+        self._committed: List[Callable[[List[Tuple[int, str, Any]]], None]] = []
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, args=(flush_interval,), daemon=True)
+            self._flusher.start()
+
+    def _create_tables(self) -> None:
+        for name in COLLECTIONS:
+            extra = ", assigned_to TEXT, status TEXT, due_date TEXT" if name == "tasks" else ""
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (key PRIMARY KEY, data TEXT NOT NULL{extra})")
+        for column in ("assigned_to", "status", "due_date"):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS tasks_{column} ON tasks ({column})")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS changes "
+            "(seq INTEGER PRIMARY KEY, origin TEXT NOT NULL, collection TEXT NOT NULL, key, data TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS workers (worker INTEGER PRIMARY KEY, origin TEXT NOT NULL, seen REAL NOT NULL)"
+        )
+
+    def is_empty(self) -> bool:
+        self.flush()
+        return not any(
+            self._conn.execute(f"SELECT 1 FROM {name} LIMIT 1").fetchone() for name in COLLECTIONS
+        )
+
+    def load(self) -> Dict[str, List[Record]]:
+        self.flush()
+        return {name: self.load_collection(name) for name in COLLECTIONS}
+
+    def load_collection(self, name: str) -> List[Record]:
+        with self._lock:
+            return [json.loads(data) for (data,) in self._conn.execute(f"SELECT data FROM {name} ORDER BY rowid")]
+
+    def put(self, collection: str, key: Any, record: Record) -> None:
+        if not self._suspended:
+            self._queue(collection, key, json.dumps(record, separators=(",", ":"), default=str))
+
+    def delete(self, collection: str, key: Any) -> None:
+        if not self._suspended:
+            self._queue(collection, key, None)
+
+    def archive(self, collection: str, key: Any) -> None:
+        if not self._suspended:
+            self._queue(collection, key, ARCHIVED)
+
+    def _queue(self, collection: str, key: Any, data: Optional[str]) -> None:
+        with self._lock:
+            self._pending[(collection, key)] = data
+            if len(self._pending) >= self.batch_size and not self._batching:
+                self._write_due()
+
+    def replace(self, collection: str, records: Iterable[Record], key_of) -> None:
+        if self._suspended:
+            return
+        with self._lock:
+            self._write()
+            # Encoded as they are inserted, so a generated stream is never held whole
+            rows = ((key_of(r), json.dumps(r, separators=(",", ":"), default=str)) for r in records)
+            with self._transaction():
+                self._conn.execute(f"DELETE FROM {collection}")
+                self._upsert(collection, rows)
+                committed = self._log([((collection, None), None)])
+            self._announce(committed)
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """Drop the writes made inside the block; the caller must keep other writers out"""
+        with self._lock:
+            self._suspended += 1
+            try:
+                yield
+            finally:
+                self._suspended -= 1
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        # Holding the lock also keeps the background flusher from committing half a batch
+        with self._lock:
+            self._batching += 1
+            try:
+                yield
+            finally:
+                self._batching -= 1
+                if not self._batching:
+                    self._write_due()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write()
+
+    def _write(self) -> None:
+        """Commit everything pending in one transaction; caller holds the lock"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            self._commit(pending)
+        except BaseException:
+            # Back in the queue for the next commit; anything written since is newer
+            pending.update(self._pending)
+            self._pending = pending
+            raise
+
+    def _try_write(self) -> None:
+        """``_write``, logging a failed commit instead of raising; its rows stay pending"""
+        try:
+            self._write()
+        except sqlite3.OperationalError:
+            log.exception("Committing %d pending rows to %s failed; will retry", len(self._pending), self.path)
+
+    def _write_due(self) -> None:
+        # Synchronous commits (batch_size=1) let the writer hear about a failure
+        if self.batch_size == 1:
+            self._write()
+        else:
+            self._try_write()
+
+    def _commit(self, pending: Dict[Tuple[str, Any], Optional[str]]) -> None:
+        upserts: Dict[str, List[Tuple[Any, str]]] = {}
+        deletes: Dict[str, List[Tuple[Any]]] = {}
+        for (collection, key), data in pending.items():
+            if data is None or data == ARCHIVED:
+                deletes.setdefault(collection, []).append((key,))
+            else:
+                upserts.setdefault(collection, []).append((key, data))
+        with self._transaction():
+            for collection, keys in deletes.items():
+                self._conn.executemany(f"DELETE FROM {collection} WHERE key = ?", keys)
+            for collection, rows in upserts.items():
+                self._upsert(collection, rows)
+            committed = self._log(pending.items())
+        self._announce(committed)
+
+    def _log(self, rows: Iterable[Tuple[Tuple[str, Any], Optional[str]]]) -> List[Tuple[int, str, Any]]:
+        """Append rows to the change log inside the open transaction; (seq, collection, key) per row"""
+        if self.origin is None:
+            return []
+        # BEGIN IMMEDIATE holds the write lock, so no other process can take these numbers
+        (last,) = self._conn.execute("SELECT coalesce(max(seq), 0) FROM changes").fetchone()
+        entries = [
+            (seq, self.origin, collection, key, data)
+            for seq, ((collection, key), data) in enumerate(rows, last + 1)
+        ]
+        self._conn.executemany("INSERT INTO changes VALUES (?, ?, ?, ?, ?)", entries)
+        self._conn.execute("DELETE FROM changes WHERE seq <= ?", (last + len(entries) - CHANGE_LOG_ROWS,))
+        return [(seq, collection, key) for seq, _, collection, key, _ in entries]
+
+    def _announce(self, committed: List[Tuple[int, str, Any]]) -> None:
+        if committed:
+            for callback in self._committed:
+                callback(committed)
+
+    def on_commit(self, callback: Callable[[List[Tuple[int, str, Any]]], None]) -> None:
+        """Called with (seq, collection, key) for every logged row this connection commits"""
+        self._committed.append(callback)
+
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT coalesce(max(seq), 0) FROM changes").fetchone()[0]
+
+    def changes_after(self, seq: int) -> Optional[List[Entry]]:
+        """Log entries newer than ``seq``, or None once pruning has dropped some of them"""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT seq, origin, collection, key, data FROM changes WHERE seq > ? ORDER BY seq", (seq,)
+            ).fetchall()
+        # Sequence numbers have no gaps, so a jump means rows were pruned
+        if entries and entries[0][0] != seq + 1:
+            return None
+        return entries
+
+    def claim_worker(self, lease: float = WORKER_LEASE) -> int:
+        """
+        The lowest worker number no live connection to this database holds,
+        reserved for this one until ``close`` (or ``lease`` seconds without
+        a renewal, after a crash). Raises RuntimeError when all are taken.
+        """
+        with self._lock:
+            self.flush()
+            now = time.time()
+            # BEGIN IMMEDIATE: two workers starting together cannot pick the same number
+            with self._transaction():
+                self._conn.execute("DELETE FROM workers WHERE seen < ?", (now - lease,))
+                taken = {worker for (worker,) in self._conn.execute("SELECT worker FROM workers")}
+                worker = next((w for w in range(MAX_WORKER + 1) if w not in taken), None)
+                if worker is None:
+                    raise RuntimeError(f"All {MAX_WORKER + 1} worker ids of {self.path} are in use")
+                self._conn.execute("INSERT INTO workers VALUES (?, ?, ?)", (worker, self._owner, now))
+            self._lease = lease
+            self._renewed = now
+            return worker
+
+    def _renew_worker(self) -> None:
+        """Keep a claimed worker number reserved; caller holds the lock"""
+        now = time.time()
+        if self._lease is None or now - self._renewed < self._lease / 4:
+            return
+        self._conn.execute("UPDATE workers SET seen = ? WHERE origin = ?", (now, self._owner))
+        self._renewed = now
+
+    def data_version(self) -> int:
+        """Moves whenever another connection commits to the database"""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _upsert(self, collection: str, rows: Iterable[Tuple[Any, str]]) -> None:
+        if collection == "tasks":
+            self._conn.executemany(
+                "INSERT INTO tasks (key, data, assigned_to, status, due_date) "
+                "VALUES (?1, ?2, json_extract(?2, '$.assignedTo'), json_extract(?2, '$.status'), "
+                "json_extract(?2, '$.dueDate')) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data, assigned_to = excluded.assigned_to, "
+                "status = excluded.status, due_date = excluded.due_date",
+                rows,
+            )
+        else:
+            self._conn.executemany(
+                f"INSERT INTO {collection} (key, data) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                rows,
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # Take the write lock up front; a deferred BEGIN can fail to upgrade under contention
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            self._conn.execute("COMMIT")
+        except BaseException:
+            # Also after a failed COMMIT, which leaves the transaction open
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            with self._lock:
+                self._try_write()
+                try:
+                    self._renew_worker()
+                except sqlite3.OperationalError:
+                    # Locked past the busy timeout; the lease has time to spare until the next pass
+                    pass
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        if self._lease is not None:
+            # Free the worker number for the next process; a crash leaves it to expire instead
+            self._conn.execute("DELETE FROM workers WHERE origin = ?", (self._owner,))
+        self._conn.close()
+
+
+def open_storage(location: Optional[str], shared: bool = False) -> Storage:
+    """
+    SQLite at the given path; ":memory:" or nothing keeps data in process memory.
+    A shared database logs its changes for other worker processes.
+    """
+    if not location or location == ":memory:":
+        return MemoryStorage()
+    return SQLiteStorage(location, shared=shared)
+
+
+# ---------------- Store Persistence ----------------
+def attach_storage(store: Store, storage: Storage) -> None:
+    """Mirror every change to the store's collections into storage"""
+
+    def stored(collection: Collection, record: Record) -> Record:
+        # Users are saved with their password hash so logins survive a restart
+        if collection is store.users:
+            encoded = store.credentials.encoded(collection.key_of(record))
+            if encoded is not None:
+                return {**record, "password": encoded}
+        return record
+
+    def on_change(collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        if store.is_recomputing:
+            # Rows every worker re-derives alike (see Store.recomputing)
+            return
+        if key is None:
+            storage.replace(collection.name, (stored(collection, r) for r in collection.all()), collection.key_of)
+        elif new is None and store.is_archiving:
+            storage.archive(collection.name, key)
+        elif new is None:
+            storage.delete(collection.name, key)
+        else:
+            storage.put(collection.name, key, stored(collection, new))
+
+    for collection in store.collections.values():
+        collection.subscribe(on_change)
+    # Store batches commit as one storage transaction
+    store.add_batch_context(storage.batch)
+
+
+# ---------------- Shared State ----------------
+class ChangeFeed:
+    """
+    Keeps this worker's store in step with other processes sharing the database.
+
+    A background thread polls ``PRAGMA data_version``, which only moves when
+    another connection commits, and applies the new change log entries to
+    the store; the store's listeners then update derived state and caches
+    as for local writes. Records are last-writer-wins in log order: an entry
+    older than this worker's own committed write to the same record is
+    skipped, so every worker converges on the newest version. Derived
+    collections are not taken from the log; each worker derives them itself.
+    A worker that falls behind the pruned log reloads everything.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        storage: SQLiteStorage,
+        since: int,
+        derived: Iterable[str] = DERIVED,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        self.store = store
+        self.storage = storage
+        # Last log entry applied (or known to be reflected in the store)
+        self.seq = since
+        self.derived = set(derived)
+        # (collection, key) -> seq of this worker's newest committed write, until the feed passes it
+        self._own: Dict[Tuple[str, Any], int] = {}
+        self._data_version = storage.data_version()
+        storage.on_commit(self._on_commit)
+        self._closed = threading.Event()
+        self._poller: Optional[threading.Thread] = None
+        if poll_interval > 0:
+            self._poller = threading.Thread(target=self._poll_loop, args=(poll_interval,), daemon=True)
+            self._poller.start()
+
+    def _on_commit(self, committed: List[Tuple[int, str, Any]]) -> None:
+        for seq, collection, key in committed:
+            self._own[(collection, key)] = seq
+
+    def poll(self) -> int:
+        """Apply what other workers committed since the last poll; returns the entries applied"""
+        version = self.storage.data_version()
+        if version == self._data_version:
+            return 0
+        with self.store.lock:
+            # Number our own pending writes first so they order against the foreign ones
+            self.storage.flush()
+            entries = self.storage.changes_after(self.seq)
+            with self.storage.suspended():
+                if entries is None:
+                    self._reload()
+                    self._data_version = version
+                    return 0
+                applied = 0
+                for seq, origin, collection, key, data in entries:
+                    if (
+                        origin != self.storage.origin
+                        and collection not in self.derived
+                        and self._own.get((collection, key), 0) < seq
+                    ):
+                        self._apply(collection, key, data)
+                        applied += 1
+                    self.seq = seq
+            self._own = {k: seq for k, seq in self._own.items() if seq > self.seq}
+            # Only now: a poll that fails part way is retried on the next tick
+            self._data_version = version
+        return applied
+
+    def _apply(self, name: str, key: Any, data: Optional[str]) -> None:
+        collection = self.store.collections[name]
+        if key is None:
+            records = self.storage.load_collection(name)
+            if collection is self.store.users:
+                self.store.load_users(records)
+            else:
+                collection.load(records)
+        elif data is None:
+            collection.delete(key)
+        elif data == ARCHIVED:
+            with self.store.archiving():
+                collection.delete(key)
+        else:
+            record = json.loads(data)
+            if collection is self.store.users:
+                password = record.pop("password", None)
+                if password is not None:
+                    self.store.credentials.set(key, password)
+            collection.insert(record)
+
+    def _reload(self) -> None:
+        self.seq = self.storage.last_seq()
+        self._own.clear()
+        self.store.load(**self.storage.load())
+
+    def _poll_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.poll()
+            except sqlite3.OperationalError:
+                # Another process held the database past the busy timeout; try again next tick
+                continue
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._poller is not None:
+            self._poller.join()
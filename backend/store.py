@@ -0,0 +1,782 @@
+import bisect
+import os
+import threading
+from collections import deque
+from collections.abc import MutableMapping
+from contextlib import ExitStack, contextmanager
+from typing import (
+    Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Protocol, Set,
+    Tuple, Union,
+)
+
+from auth import Credentials
+from compact import task_codec
+
+
+Record = Dict[str, Any]
+KeyFunc = Union[str, Callable[[Record], Any]]
+# A plain field name, or (name, func) where func yields every value to index under
+IndexSpec = Union[str, Tuple[str, Callable[[Record], Iterable[Any]]]]
+# Called as listener(collection, key, old, new) after every mutation: old is None
+# for inserts, new is None for deletes, and key is None when load() replaced everything
+Listener = Callable[["Collection", Any, Optional[Record], Optional[Record]], None]
+
+
+class Codec(Protocol):
+    """How a collection keeps its records in memory (see compact.RecordCodec)"""
+
+    def encode(self, record: Record) -> Any: ...
+
+    def decode(self, stored: Any) -> Record: ...
+
+
+CHANGE_LOG_SIZE = 10_000
+# Entries per ChunkedMap chunk: what one write after a publish copies
+CHUNK_SIZE = 256
+
+
+# ---------------- Locking ----------------
+class WriterLock:
+    """Reentrant lock that can tell whether the calling thread holds it"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._owner: Optional[int] = None
+        self._depth = 0
+
+    def acquire(self) -> None:
+        self._lock.acquire()
+        self._owner = threading.get_ident()
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if not self._depth:
+            self._owner = None
+        self._lock.release()
+
+    def held(self) -> bool:
+        return self._owner == threading.get_ident()
+
+    def __enter__(self) -> "WriterLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+# ---------------- Chunked maps ----------------
+class ChunkedMap(MutableMapping):
+    """
+    An insertion-ordered dict whose ``copy()`` shares storage with the original.
+
+    Entries are kept in chunks of up to ``CHUNK_SIZE`` in insertion order,
+    and a second set of chunks, split by key hash, records which chunk holds
+    each key. A copy copies only the two lists of chunks; each side copies a
+    chunk the first time it writes to it, so a write after a copy costs one
+    or two chunks instead of the whole map. As with a dict, updates keep
+    their position and a deleted key inserted again goes to the end.
+    """
+
+    __slots__ = ("_rows", "_slots", "_own_rows", "_own_slots", "_len", "_fill")
+
+    def __init__(self, items: Union[Mapping, Iterable[Tuple[Any, Any]]] = ()):
+        # Entries in insertion order, CHUNK_SIZE inserts per chunk
+        self._rows: List[Dict[Any, Any]] = []
+        # key -> number of its chunk in _rows, split by hash over a power of two
+        self._slots: List[Dict[Any, int]] = [{}]
+        # Chunks this map may change in place (copied or created since the last copy())
+        self._own_rows: Set[int] = set()
+        self._own_slots: Set[int] = {0}
+        self._len = 0
+        # Inserts into the last chunk of _rows
+        self._fill = CHUNK_SIZE
+        entries = list(dict(items).items())
+        if entries:
+            self._rows = [dict(entries[i:i + CHUNK_SIZE]) for i in range(0, len(entries), CHUNK_SIZE)]
+            self._own_rows = set(range(len(self._rows)))
+            self._len = len(entries)
+            self._fill = len(self._rows[-1])
+            count = 1
+            while count * CHUNK_SIZE < self._len:
+                count *= 2
+            self._rehash(count)
+
+    def copy(self) -> "ChunkedMap":
+        other = ChunkedMap.__new__(ChunkedMap)
+        other._rows = list(self._rows)
+        other._slots = list(self._slots)
+        other._own_rows = set()
+        other._own_slots = set()
+        other._len = self._len
+        other._fill = self._fill
+        # Both sides now share every chunk
+        self._own_rows = set()
+        self._own_slots = set()
+        return other
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._slots[hash(key) & (len(self._slots) - 1)]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        row = self._slots[hash(key) & (len(self._slots) - 1)].get(key)
+        if row is None:
+            return default
+        return self._rows[row][key]
+
+    def __getitem__(self, key: Any) -> Any:
+        row = self._slots[hash(key) & (len(self._slots) - 1)].get(key)
+        if row is None:
+            raise KeyError(key)
+        return self._rows[row][key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        row = self._slots[hash(key) & (len(self._slots) - 1)].get(key)
+        if row is not None:
+            self._row(row)[key] = value
+            return
+        row = self._append_row()
+        self._row(row)[key] = value
+        self._slot(hash(key) & (len(self._slots) - 1))[key] = row
+        self._len += 1
+        if self._len > len(self._slots) * CHUNK_SIZE:
+            self._rehash(len(self._slots) * 2)
+
+    def __delitem__(self, key: Any) -> None:
+        slot = hash(key) & (len(self._slots) - 1)
+        row = self._slots[slot].get(key)
+        if row is None:
+            raise KeyError(key)
+        del self._slot(slot)[key]
+        del self._row(row)[key]
+        self._len -= 1
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in self._rows:
+            yield from row
+
+    def values(self) -> Iterator[Any]:  # type: ignore[override]
+        for row in self._rows:
+            yield from row.values()
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:  # type: ignore[override]
+        for row in self._rows:
+            yield from row.items()
+
+    def _row(self, number: int) -> Dict[Any, Any]:
+        if number not in self._own_rows:
+            self._rows[number] = dict(self._rows[number])
+            self._own_rows.add(number)
+        return self._rows[number]
+
+    def _slot(self, number: int) -> Dict[Any, int]:
+        if number not in self._own_slots:
+            self._slots[number] = dict(self._slots[number])
+            self._own_slots.add(number)
+        return self._slots[number]
+
+    def _append_row(self) -> int:
+        """The number of the chunk a new key goes into, opening one when the last is full"""
+        if self._fill == CHUNK_SIZE:
+            if len(self._rows) >= 2 * (self._len // CHUNK_SIZE + 1):
+                # Mostly deleted: pack the entries into as few chunks as they need
+                self._pack()
+            self._rows.append({})
+            self._own_rows.add(len(self._rows) - 1)
+            self._fill = 0
+        self._fill += 1
+        return len(self._rows) - 1
+
+    def _pack(self) -> None:
+        entries = list(self.items())
+        self._rows = [dict(entries[i:i + CHUNK_SIZE]) for i in range(0, len(entries), CHUNK_SIZE)]
+        self._own_rows = set(range(len(self._rows)))
+        self._fill = CHUNK_SIZE
+        self._rehash(len(self._slots))
+
+    def _rehash(self, count: int) -> None:
+        slots: List[Dict[Any, int]] = [{} for _ in range(count)]
+        mask = count - 1
+        for number, row in enumerate(self._rows):
+            for key in row:
+                slots[hash(key) & mask][key] = number
+        self._slots = slots
+        self._own_slots = set(range(count))
+
+
+def own_bucket(bucket: Mapping[Any, None]) -> MutableMapping:
+    """
+    A writable copy of a shared index bucket. Buckets larger than a chunk
+    become ChunkedMaps, so copying them again costs a chunk, not the bucket.
+    """
+    if len(bucket) <= CHUNK_SIZE:
+        return dict(bucket)
+    if isinstance(bucket, ChunkedMap):
+        return bucket.copy()
+    return ChunkedMap(bucket)
+
+
+# ---------------- Snapshots ----------------
+class Snapshot:
+    """
+    One published version of a collection's records and indexes.
+
+    Nothing in a snapshot changes after it is published, so it can be read
+    from any thread without locking. Sorted views are built lazily on first
+    use; two readers racing to build one compute the same list. With a
+    ``decode`` function, items are stored encoded and every read returns a
+    newly decoded record.
+    """
+
+    __slots__ = ("version", "key_of", "_items", "_indexes", "_sorted_keys", "_sorted_values", "_decode")
+
+    def __init__(
+        self,
+        version: int,
+        key_of: Callable[[Record], Any],
+        items: Mapping[Any, Any],
+        indexes: Dict[str, Mapping[Any, Mapping[Any, None]]],
+        decode: Optional[Callable[[Any], Record]] = None,
+    ):
+        self.version = version
+        self.key_of = key_of
+        self._items = items
+        self._indexes = indexes
+        self._sorted_keys: Optional[List[Any]] = None
+        self._sorted_values: Dict[str, List[Any]] = {}
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._items
+
+    def all(self) -> List[Record]:
+        if self._decode is not None:
+            return [self._decode(stored) for stored in self._items.values()]
+        return list(self._items.values())
+
+    def get(self, key: Any) -> Optional[Record]:
+        stored = self._items.get(key)
+        if self._decode is not None and stored is not None:
+            return self._decode(stored)
+        return stored
+
+    def find(self, field: str, value: Any) -> List[Record]:
+        """Return records whose indexed field equals value, in insertion order"""
+        keys = self._indexes[field].get(value, ())
+        if self._decode is not None:
+            return [self._decode(self._items[k]) for k in keys]
+        return [self._items[k] for k in keys]
+
+    def find_one(self, field: str, value: Any) -> Optional[Record]:
+        keys = self._indexes[field].get(value)
+        if not keys:
+            return None
+        return self.get(next(iter(keys)))
+
+    def has_index(self, field: str) -> bool:
+        return field in self._indexes
+
+    def keys_for(self, field: str, value: Any) -> Iterable[Any]:
+        """Primary keys in an index bucket, without materializing records"""
+        return self._indexes[field].get(value, {}).keys()
+
+    def values_between(self, field: str, low: Any = None, high: Any = None) -> List[Any]:
+        """Distinct indexed values in [low, high], ascending; either bound may be open"""
+        values = self._sorted_values.get(field)
+        if values is None:
+            values = self._sorted_values[field] = sorted(
+                v for v in self._indexes[field] if v is not None
+            )
+        start = bisect.bisect_left(values, low) if low is not None else 0
+        stop = bisect.bisect_right(values, high) if high is not None else len(values)
+        return values[start:stop]
+
+    def keys_between(self, field: str, low: Any = None, high: Any = None) -> set:
+        """Primary keys whose indexed value lies in [low, high]; either bound may be open"""
+        index = self._indexes[field]
+        keys = set()
+        for value in self.values_between(field, low, high):
+            keys.update(index[value])
+        return keys
+
+    def sorted_keys(self) -> List[Any]:
+        """All primary keys in ascending order"""
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._items)
+        return self._sorted_keys
+
+
+# ---------------- Collections ----------------
+class Collection:
+    """
+    Records held in a primary-key dict with secondary indexes on selected fields.
+
+    Readers get immutable snapshots; writers serialize on one lock (shared by
+    every collection of a store) and change a private draft. Records and
+    indexes are ChunkedMaps: the first write after a publish copies only
+    their lists of chunks, each chunk and index bucket is copied the first
+    time a write touches it, and the published snapshot is never modified. Reads take no lock while the
+    snapshot is current. Once writes are pending, single lookups read the
+    draft under the lock, and only ``snapshot()`` (queries, range scans)
+    publishes it, so a run of writes pays for at most one copy per query.
+    Reads made while holding the lock (listeners, batches) see the draft.
+
+    A ``codec`` changes how records are held: each is stored as
+    ``codec.encode(record)`` and decoded on every read, so readers and
+    listeners still get plain dicts.
+    """
+
+    def __init__(
+        self,
+        key: KeyFunc = "id",
+        indexes: Iterable[IndexSpec] = (),
+        name: str = "",
+        lock: Optional[WriterLock] = None,
+        codec: Optional[Codec] = None,
+    ):
+        self.name = name
+        # Store version of the last change to this collection
+        self.version = 0
+        self.lock = lock or WriterLock()
+        self._listeners: List[Listener] = []
+        self._key = key if callable(key) else (lambda record, field=key: record.get(field))
+        self._extractors: Dict[str, Callable[[Record], Iterable[Any]]] = {}
+        for spec in indexes:
+            if isinstance(spec, str):
+                self._extractors[spec] = lambda record, field=spec: (record.get(field),)
+            else:
+                name, func = spec
+                self._extractors[name] = func
+        self._encode = codec.encode if codec is not None else None
+        self._decode = codec.decode if codec is not None else None
+        self._items = ChunkedMap()
+        self._indexes: Dict[str, ChunkedMap] = {name: ChunkedMap() for name in self._extractors}
+        self._published = Snapshot(0, self._key, self._items, self._indexes, self._decode)
+        # True while the draft is the published snapshot (no writes since)
+        self._shared = True
+        # Index buckets the draft already copied, as (index name, value)
+        self._owned: set = set()
+        # What the draft changed that invalidates the snapshot's sorted views
+        self._keys_changed = False
+        self._values_changed: set = set()
+
+    def snapshot(self) -> Snapshot:
+        """
+        The current version, for reads that must see one consistent state.
+        Inside a write (the caller holds the lock) this is a view of the
+        unpublished draft and is only valid until the lock is released.
+        """
+        if self._shared:
+            return self._published
+        if self.lock.held():
+            return self._draft()
+        with self.lock:
+            return self._publish()
+
+    def _draft(self) -> Snapshot:
+        """A view of the unpublished draft, valid while the caller holds the lock"""
+        return Snapshot(self.version, self._key, self._items, self._indexes, self._decode)
+
+    def _publish(self) -> Snapshot:
+        if not self._shared:
+            previous = self._published
+            snapshot = Snapshot(self.version, self._key, self._items, self._indexes, self._decode)
+            if not self._keys_changed:
+                snapshot._sorted_keys = previous._sorted_keys
+            sorted_values = dict(previous._sorted_values)
+            for name in self._values_changed:
+                sorted_values.pop(name, None)
+            snapshot._sorted_values = sorted_values
+            self._published = snapshot
+            self._shared = True
+        return self._published
+
+    def _begin(self) -> None:
+        """Make the draft private before the first write after a publish"""
+        if self._shared:
+            self._items = self._items.copy()
+            self._indexes = {name: index.copy() for name, index in self._indexes.items()}
+            self._owned = set()
+            self._keys_changed = False
+            self._values_changed = set()
+            self._shared = False
+
+    def __len__(self) -> int:
+        if self._shared:
+            return len(self._published)
+        with self.lock:
+            return len(self._items)
+
+    def __contains__(self, key: Any) -> bool:
+        if self._shared:
+            return key in self._published
+        with self.lock:
+            return key in self._items
+
+    def key_of(self, record: Record) -> Any:
+        return self._key(record)
+
+    def subscribe(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def all(self) -> List[Record]:
+        if self._shared:
+            return self._published.all()
+        with self.lock:
+            return self._draft().all()
+
+    def get(self, key: Any) -> Optional[Record]:
+        if self._shared:
+            return self._published.get(key)
+        with self.lock:
+            return self._draft().get(key)
+
+    def find(self, field: str, value: Any) -> List[Record]:
+        """Return records whose indexed field equals value, in insertion order"""
+        if self._shared:
+            return self._published.find(field, value)
+        with self.lock:
+            return self._draft().find(field, value)
+
+    def find_one(self, field: str, value: Any) -> Optional[Record]:
+        if self._shared:
+            return self._published.find_one(field, value)
+        with self.lock:
+            return self._draft().find_one(field, value)
+
+    def has_index(self, field: str) -> bool:
+        return field in self._extractors
+
+    def keys_for(self, field: str, value: Any) -> Iterable[Any]:
+        """Primary keys in an index bucket, without materializing records"""
+        return self.snapshot().keys_for(field, value)
+
+    def keys_between(self, field: str, low: Any = None, high: Any = None) -> set:
+        """Primary keys whose indexed value lies in [low, high]; either bound may be open"""
+        return self.snapshot().keys_between(field, low, high)
+
+    def sorted_keys(self) -> List[Any]:
+        """All primary keys in ascending order"""
+        return self.snapshot().sorted_keys()
+
+    def _stored(self, key: Any) -> Optional[Record]:
+        """The draft's record for a key, decoded; caller holds the lock"""
+        stored = self._items.get(key)
+        if self._decode is not None and stored is not None:
+            return self._decode(stored)
+        return stored
+
+    def load(self, records: Iterable[Record], copy: bool = True) -> None:
+        """
+        Replace the contents with copies of the given records. Pass
+        ``copy=False`` for records nobody else holds. Encoded records are
+        never copies of the caller's dicts.
+        """
+        encode = self._encode
+        copy = copy and encode is None
+        with self.lock:
+            # A fresh draft: nothing is shared with the published snapshot.
+            # Plain dicts while loading, chunked once at the end
+            self._items = {}
+            self._indexes = {name: {} for name in self._extractors}
+            self._owned = set()
+            self._shared = False
+            self._keys_changed = True
+            self._values_changed = set(self._extractors)
+            for record in records:
+                if copy:
+                    record = dict(record)
+                key = self._key(record)
+                old = self._stored(key)
+                if old is not None:
+                    self._unindex(key, old)
+                self._items[key] = encode(record) if encode is not None else record
+                self._index(key, record)
+            self._items = ChunkedMap(self._items)
+            self._indexes = {name: ChunkedMap(index) for name, index in self._indexes.items()}
+            self._notify(None, None, None)
+            self._publish()
+
+    def insert(self, record: Record) -> Record:
+        key = self._key(record)
+        with self.lock:
+            self._begin()
+            old = self._stored(key)
+            if old is not None:
+                self._unindex(key, old)
+            else:
+                self._keys_changed = True
+            self._items[key] = self._encode(record) if self._encode is not None else record
+            self._index(key, record)
+            self._notify(key, old, record)
+        return record
+
+    def update(self, key: Any, changes: Record) -> Optional[Record]:
+        """Replace the record with a changed copy and move it between index buckets"""
+        with self.lock:
+            old = self._stored(key)
+            if old is None:
+                return None
+            self._begin()
+            record = {**old, **changes}
+            self._unindex(key, old)
+            self._items[key] = self._encode(record) if self._encode is not None else record
+            self._index(key, record)
+            self._notify(key, old, record)
+        return record
+
+    def delete(self, key: Any) -> Optional[Record]:
+        with self.lock:
+            if key not in self._items:
+                return None
+            self._begin()
+            record = self._stored(key)
+            del self._items[key]
+            self._keys_changed = True
+            self._unindex(key, record)
+            self._notify(key, record, None)
+        return record
+
+    def _notify(self, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        for listener in self._listeners:
+            listener(self, key, old, new)
+
+    def _index(self, key: Any, record: Record) -> None:
+        for name, index in self._indexes.items():
+            for value in self._extractors[name](record):
+                bucket = index.get(value)
+                if bucket is None:
+                    bucket = index[value] = {}
+                    self._owned.add((name, value))
+                    self._values_changed.add(name)
+                elif (name, value) not in self._owned:
+                    bucket = index[value] = own_bucket(bucket)
+                    self._owned.add((name, value))
+                bucket[key] = None
+
+    def _unindex(self, key: Any, record: Record) -> None:
+        for name, index in self._indexes.items():
+            for value in self._extractors[name](record):
+                bucket = index.get(value)
+                if bucket is None or key not in bucket:
+                    continue
+                if len(bucket) == 1:
+                    del index[value]
+                    self._owned.discard((name, value))
+                    self._values_changed.add(name)
+                    continue
+                if (name, value) not in self._owned:
+                    bucket = index[value] = own_bucket(bucket)
+                    self._owned.add((name, value))
+                del bucket[key]
+
+
+def login_identifiers(record: Record) -> Tuple[Any, ...]:
+    """Every identifier a user may sign in with: id, employeeId or email"""
+    return tuple(dict.fromkeys(v for v in (record.get("id"), record.get("employeeId"), record.get("email")) if v))
+
+
+def performance_key(record: Record) -> Any:
+    """Performance rows are keyed by employee; older rows use snake_case"""
+    return record.get("employeeId") or record.get("employee_id")
+
+
+# ---------------- Store ----------------
+class Change(NamedTuple):
+    version: int
+    collection: str
+    key: Any
+    deleted: bool
+
+
+class Store:
+    """
+    Indexed in-memory repository for the API's collections.
+
+    Every mutation bumps a monotonically increasing version and is appended
+    to a bounded change log, so clients can ask for what changed since the
+    version they last saw. A bulk load compacts the log; ``epoch`` changes
+    whenever the process restarts so stale client versions are detected.
+    """
+
+    def __init__(self, log_size: int = CHANGE_LOG_SIZE, compact_tasks: bool = True):
+        # Serializes writers across every collection; readers never take it
+        # unless they find unpublished writes (see Collection)
+        self.lock = WriterLock()
+        self.users = Collection(
+            "id",
+            indexes=("employeeId", "email", "role", "department", "shift", ("login", login_identifiers)),
+            name="users",
+            lock=self.lock,
+        )
+        self.credentials = Credentials()
+        # Tasks dominate memory: scalars in slots, checklists and feedback as blobs
+        self.tasks = Collection(
+            "id",
+            indexes=("assignedTo", "status", "dueDate", "priority"),
+            name="tasks",
+            lock=self.lock,
+            codec=task_codec() if compact_tasks else None,
+        )
+        self.skills = Collection("id", name="skills", lock=self.lock)
+        self.reports = Collection("date", name="reports", lock=self.lock)
+        self.performance = Collection(
+            performance_key, indexes=("department",), name="performance", lock=self.lock
+        )
+        # What each performance row is counted on top of (see PerformanceBook); never sent to clients
+        self.baselines = Collection(performance_key, name="baselines", lock=self.lock)
+        self.collections: Dict[str, Collection] = {
+            c.name: c for c in (self.users, self.tasks, self.skills, self.reports, self.performance, self.baselines)
+        }
+        # The collections clients see (/sync, /bootstrap)
+        self.served: Dict[str, Collection] = {
+            name: c for name, c in self.collections.items() if c is not self.baselines
+        }
+
+        self._batch_depth = 0
+        self._archive_depth = 0
+        self._recompute_depth = 0
+        self._batch_contexts: List[Callable[[], ContextManager[Any]]] = []
+        self._batch_end: List[Callable[[], None]] = []
+        self.epoch = os.urandom(6).hex()
+        self.version = 0
+        self._log: "deque[Change]" = deque(maxlen=log_size)
+        # Oldest version the log can still answer "changes since" for
+        self._log_floor = 0
+        for collection in self.collections.values():
+            collection.subscribe(self._record)
+
+    def _record(self, collection: Collection, key: Any, old: Optional[Record], new: Optional[Record]) -> None:
+        self.version += 1
+        collection.version = self.version
+        if key is None:
+            self._log.clear()
+            self._log_floor = self.version
+            return
+        if len(self._log) == self._log.maxlen:
+            self._log_floor = self._log[0].version
+        self._log.append(Change(self.version, collection.name, key, new is None))
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Apply many changes under the lock, so readers see all of them or none.
+        Listeners may defer derived work until the end, which runs before the
+        registered batch contexts (such as a storage commit) exit.
+        """
+        with self.lock, ExitStack() as stack:
+            for context in self._batch_contexts:
+                stack.enter_context(context())
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    for callback in self._batch_end:
+                        callback()
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    @contextmanager
+    def archiving(self) -> Iterator[None]:
+        """
+        Deletes inside the block move records to an archive instead of
+        discarding them. Listeners that keep history (such as daily reports)
+        check ``is_archiving`` and keep what those records contributed.
+        """
+        with self.lock:
+            self._archive_depth += 1
+            try:
+                yield
+            finally:
+                self._archive_depth -= 1
+
+    @property
+    def is_archiving(self) -> bool:
+        return self._archive_depth > 0
+
+    @contextmanager
+    def recomputing(self) -> Iterator[None]:
+        """
+        Changes inside the block re-derive rows because the date moved on.
+        Every worker makes them for itself, and a restart derives them
+        again, so storage does not persist them.
+        """
+        with self.lock:
+            self._recompute_depth += 1
+            try:
+                yield
+            finally:
+                self._recompute_depth -= 1
+
+    @property
+    def is_recomputing(self) -> bool:
+        return self._recompute_depth > 0
+
+    def on_batch_end(self, callback: Callable[[], None]) -> None:
+        self._batch_end.append(callback)
+
+    def add_batch_context(self, context: Callable[[], ContextManager[Any]]) -> None:
+        """Enter ``context()`` around every batch, inside the lock"""
+        self._batch_contexts.append(context)
+
+    def changes_since(self, since: int) -> Optional[Dict[str, Dict[Any, bool]]]:
+        """
+        Map collection name -> {key: deleted} for everything changed after ``since``.
+        Returns None when the log no longer reaches back that far.
+        """
+        if since < self._log_floor or since > self.version:
+            return None
+        changed: Dict[str, Dict[Any, bool]] = {}
+        for change in reversed(tuple(self._log)):
+            if change.version <= since:
+                break
+            changed.setdefault(change.collection, {}).setdefault(change.key, change.deleted)
+        return changed
+
+    def load(
+        self,
+        users: Iterable[Record] = (),
+        tasks: Iterable[Record] = (),
+        skills: Iterable[Record] = (),
+        reports: Iterable[Record] = (),
+        performance: Iterable[Record] = (),
+        baselines: Iterable[Record] = (),
+    ) -> None:
+        """Replace every collection, rebuilding all indexes"""
+        with self.lock:
+            self.load_users(users)
+            self.tasks.load(tasks)
+            self.skills.load(skills)
+            self.reports.load(reports)
+            # Before the rows, which are read on top of them
+            self.baselines.load(baselines)
+            self.performance.load(performance)
+
+    def load_users(self, users: Iterable[Record]) -> None:
+        """Load users, moving passwords out of the records into the credential store"""
+        records = []
+        self.credentials.clear()
+        for user in users:
+            record = dict(user)
+            password = record.pop("password", None)
+            if password is not None:
+                self.credentials.set(record.get("id"), password)
+            records.append(record)
+        self.users.load(records, copy=False)
+
+    def authenticate(self, username: str, password: str) -> Tuple[Optional[Record], bool]:
+        """Resolve a login identifier and check its password in constant work"""
+        user = self.users.find_one("login", username)
+        ok = self.credentials.verify(user.get("id") if user else None, password)
+        return user, ok
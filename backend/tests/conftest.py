@@ -0,0 +1,4 @@
+import os
+
+# The API tests run against the in-memory backend so they never touch a database file
+os.environ.setdefault("OPTIWORK_DB", ":memory:")
@@ -0,0 +1,58 @@
+from analytics import AnalyticsEngine
+from matching import MatchEngine
+from store import Store
+
+
+def make_engine():
+    store = Store()
+    store.load(
+        users=[
+            {"id": "1", "role": "employee", "currentWorkload": 80, "skills": [{"skillId": "skill-1"}]},
+            {"id": "2", "role": "employee", "currentWorkload": 20, "skills": []},
+        ],
+        tasks=[
+            {"id": "a", "status": "pending", "requiredSkills": ["skill-1"]},
+            {"id": "b", "status": "in-progress", "requiredSkills": ["skill-1", "skill-2"]},
+            {"id": "c", "status": "completed", "requiredSkills": ["skill-1"],
+             "feedback": {"supervisorFeedback": {"qualityRating": 2}}},
+        ],
+        skills=[{"id": "skill-1", "name": "CNC Machining"}, {"id": "skill-2", "name": "MIG Welding"}],
+        performance=[
+            {"employeeId": "1", "completionRate": 90, "onTimeDeliveryRate": 90, "qualityScore": 4.5,
+             "tasksCompleted": 100, "skillsUsed": [{"skillId": "skill-1", "count": 75}]},
+            {"employeeId": "2", "completionRate": 95, "onTimeDeliveryRate": 95, "qualityScore": 4.8,
+             "tasksCompleted": 50, "skillsUsed": []},
+        ],
+    )
+    return store, AnalyticsEngine(store, MatchEngine(store))
+
+
+def test_gaps_follow_open_tasks_and_roster():
+    store, engine = make_engine()
+    gaps = {g["skillId"]: g for g in engine.skill_gaps()}
+    assert (gaps["skill-1"]["demand"], gaps["skill-1"]["supply"], gaps["skill-1"]["gap"]) == (2, 1, 1)
+    assert (gaps["skill-2"]["demand"], gaps["skill-2"]["supply"], gaps["skill-2"]["gap"]) == (1, 0, 1)
+    assert gaps["skill-1"]["utilization"] == 75
+
+    analytics = engine.analytics()
+    assert analytics["overallUtilization"] == 50
+    assert analytics["topPerformers"] == ["2", "1"]
+    assert analytics["skillsInDemand"] == ["skill-1", "skill-2"]
+    assert analytics["reworkIncidents"] == 1
+    assert analytics["trainingNeeded"][0] == {"skillId": "skill-1", "employeeIds": ["2"]}
+
+    store.tasks.update("a", {"status": "completed"})
+    store.tasks.delete("c")
+    gaps = {g["skillId"]: g for g in engine.skill_gaps()}
+    assert gaps["skill-1"]["demand"] == 1
+    assert engine.analytics()["reworkIncidents"] == 0
+
+
+def test_results_are_cached_until_a_mutation():
+    store, engine = make_engine()
+    first = engine.analytics()
+    assert engine.analytics() is first
+    store.users.update("2", {"skills": [{"skillId": "skill-1"}]})
+    second = engine.analytics()
+    assert second is not first
+    assert {g["skillId"]: g["supply"] for g in second["skillUtilization"]}["skill-1"] == 2
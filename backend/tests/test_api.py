@@ -1,6 +1,10 @@
+from datetime import date
+
 import pytest
 from httpx import AsyncClient
 from app import app
+from responses import EncodedCache
+from data.mockData import mockTasks
 
 @pytest.mark.asyncio
 async def test_users_and_tasks():
@@ -27,3 +31,279 @@ async def test_create_task_and_get():
         r2 = await ac.get(f"/tasks/{t['id']}")
         assert r2.status_code == 200
         assert r2.json()['id'] == t['id']
+
+@pytest.mark.asyncio
+async def test_login_by_any_identifier():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        for username in ('1', 'EMP001'):
+            r = await ac.post('/login', json={"username": username, "password": "emp1122"})
+            assert r.status_code == 200
+            assert r.json()['user']['id'] == '1'
+            assert 'password' not in r.json()['user']
+
+        r = await ac.post('/login', json={"username": "admin@company.com", "password": "admin123"})
+        assert r.status_code == 200
+
+        r = await ac.post('/login', json={"username": "EMP001", "password": "wrong"})
+        assert r.status_code == 401
+        r2 = await ac.post('/login', json={"username": "EMP999", "password": "emp1122"})
+        assert r2.status_code == 401
+        assert r2.json() == r.json()
+
+        users = (await ac.get('/users')).json()
+        assert all('password' not in u for u in users)
+
+@pytest.mark.asyncio
+async def test_task_filters_pagination_and_projection():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        await ac.post('/reset')
+        for day in ('2025-10-20', '2025-10-21', '2025-10-22'):
+            payload = {"title": f"Audit {day}", "assignedTo": "2", "priority": "low", "dueDate": day,
+                       "checklist": [{"id": "1", "text": "Check", "completed": False}]}
+            assert (await ac.post('/tasks', json=payload)).status_code == 200
+
+        r = await ac.get('/tasks', params={"assignedTo": "2", "dueFrom": "2025-10-21", "fields": "title,dueDate"})
+        tasks = r.json()
+        assert [t['dueDate'] for t in tasks] == ['2025-10-21', '2025-10-22']
+        assert set(tasks[0]) == {'id', 'title', 'dueDate'}
+
+        r = await ac.get('/tasks', params={"priority": "low,high", "limit": 2})
+        assert len(r.json()) == 2
+        cursor = r.headers['x-next-cursor']
+        r2 = await ac.get('/tasks', params={"priority": "low,high", "limit": 2, "cursor": cursor})
+        assert len(r2.json()) == 2
+        assert 'x-next-cursor' not in r2.headers
+        ids = [t['id'] for t in r.json() + r2.json()]
+        assert ids == sorted(ids) and len(set(ids)) == 4
+
+        r = await ac.get('/users', params={"role": "manager", "fields": "name"})
+        assert r.json() == [{"id": "admin", "name": "Admin User"}]
+        assert (await ac.get('/tasks', params={"cursor": "%%%"})).status_code == 400
+
+@pytest.mark.asyncio
+async def test_sync_returns_only_changes():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        await ac.post('/reset')
+        snapshot = (await ac.get('/sync')).json()
+        assert snapshot['full'] is True
+        assert len(snapshot['tasks']['upserted']) == len(mockTasks)
+        assert 'analytics' in snapshot
+
+        params = {"since": snapshot['version'], "epoch": snapshot['epoch']}
+        created = (await ac.post('/tasks', json={"title": "Restock bins"})).json()
+        await ac.patch('/tasks/1', json={"status": "in-progress"})
+        await ac.delete('/tasks/1')
+
+        delta = (await ac.get('/sync', params=params)).json()
+        assert delta['full'] is False
+        assert [t['id'] for t in delta['tasks']['upserted']] == [created['id']]
+        assert delta['tasks']['deleted'] == ['1']
+        assert delta['users'] == {"upserted": [], "deleted": []}
+        # Task 1 was the only task due that day, so its report row goes too
+        assert delta['reports'] == {"upserted": [], "deleted": ['2025-10-14']}
+        # Employee 1's performance row follows task 1, but outlives it
+        assert [r['employeeId'] for r in delta['performance']['upserted']] == ['1']
+        assert delta['performance']['deleted'] == []
+        assert delta['version'] == snapshot['version'] + 7
+        # The rollups follow the changed tasks; an empty delta leaves them out
+        assert delta['analytics'] and 'skillGaps' in delta
+        quiet = (await ac.get('/sync', params={"since": delta['version'], "epoch": snapshot['epoch']})).json()
+        assert 'analytics' not in quiet and 'skillGaps' not in quiet
+
+        await ac.post('/reset')
+        assert (await ac.get('/sync', params=params)).json()['full'] is True
+
+@pytest.mark.asyncio
+async def test_match_ranks_employees():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        await ac.post('/reset')
+        r = await ac.post('/tasks/match', json={"requiredSkills": ["skill-1"], "startTime": "09:00", "limit": 3})
+        assert r.status_code == 200
+        matches = r.json()
+        assert len(matches) == 3
+        best = matches[0]
+        assert best['employee']['id'] == '1'
+        assert best['matchScore'] == 88
+        assert best['availability'] is True
+        assert best['reasons'][0]['label'] == 'CNC Machining - expert level (Certified)'
+        scores = [m['matchScore'] for m in matches]
+        assert scores == sorted(scores, reverse=True)
+
+@pytest.mark.asyncio
+async def test_reports_reflect_task_changes():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        before = (await ac.get('/reports/2031-01-02'))
+        assert before.status_code == 404
+        payload = {"title": "Audit", "assignedTo": "1", "assignedBy": "4", "dueDate": "2031-01-02"}
+        t = (await ac.post('/tasks', json=payload)).json()
+        report = (await ac.get('/reports/2031-01-02')).json()
+        assert (report['totalTasks'], report['pending']) == (1, 1)
+
+        await ac.patch(f"/tasks/{t['id']}", json={"status": "completed"})
+        report = (await ac.get('/reports/2031-01-02')).json()
+        assert report['completionRate'] == 100.0
+
+        await ac.delete(f"/tasks/{t['id']}")
+        assert (await ac.get('/reports/2031-01-02')).status_code == 404
+
+@pytest.mark.asyncio
+async def test_batch_create_and_patch_report_per_item():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        body = [{"title": "Load coils", "dueDate": "2031-02-01"}, {"description": "no title"}, "oops"]
+        r = (await ac.post('/tasks:batch', json=body)).json()
+        assert (r['succeeded'], r['failed']) == (1, 2)
+        assert [x['ok'] for x in r['results']] == [True, False, False]
+        assert 'title' in r['results'][1]['error']
+        created = r['results'][0]['id']
+        assert (await ac.get(f'/tasks/{created}')).json()['title'] == 'Load coils'
+
+        ndjson = '{"title": "A"}\n{"title": "B", "priority": "high"}\nnot json\n'
+        r = (await ac.post('/tasks:batch', content=ndjson,
+                           headers={'content-type': 'application/x-ndjson'})).json()
+        assert [x['ok'] for x in r['results']] == [True, True, False]
+        assert r['results'][2]['error'].startswith('Invalid JSON')
+
+        patch = [{"id": created, "status": "completed"}, {"id": "missing", "status": "completed"},
+                 {"id": created, "title": None}]
+        r = (await ac.patch('/tasks:batch', json=patch)).json()
+        assert [x['ok'] for x in r['results']] == [True, False, False]
+        task = (await ac.get(f'/tasks/{created}')).json()
+        assert task['status'] == 'completed' and task['completedAt']
+        assert task['title'] == 'Load coils'
+
+        assert (await ac.post('/tasks:batch', json={"title": "x"})).status_code == 400
+        await ac.post('/reset')
+
+@pytest.mark.asyncio
+async def test_unchanged_collections_answer_304():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        r = await ac.get('/skills')
+        etag = r.headers['etag']
+        assert r.status_code == 200 and r.json()
+        r2 = await ac.get('/skills', headers={'If-None-Match': etag})
+        assert r2.status_code == 304 and r2.content == b''
+
+        r = await ac.get('/tasks')
+        etag = r.headers['etag']
+        created = (await ac.post('/tasks', json={"title": "Fresh"})).json()
+        r2 = await ac.get('/tasks', headers={'If-None-Match': etag})
+        assert r2.status_code == 200 and r2.headers['etag'] != etag
+        assert created['id'] in {t['id'] for t in r2.json()}
+
+@pytest.mark.asyncio
+async def test_polled_endpoints_are_conditional_and_compressed():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        r = await ac.get('/users?role=employee', headers={'Accept-Encoding': 'gzip'})
+        assert r.headers['cache-control'] == 'private, no-cache'
+        assert r.headers['content-encoding'] == 'gzip'
+        assert r.num_bytes_downloaded < len(r.content)
+        assert all(u['role'] == 'employee' for u in r.json())
+        r2 = await ac.get('/users?role=employee', headers={'If-None-Match': r.headers['etag']})
+        assert r2.status_code == 304 and r2.headers['cache-control'] == 'private, no-cache'
+
+        r = await ac.get('/skills', headers={'Accept-Encoding': 'gzip'})
+        assert r.headers['cache-control'] == 'private, max-age=300'
+        # Small bodies are sent as they are
+        r = await ac.get('/health', headers={'Accept-Encoding': 'gzip'})
+        assert 'content-encoding' not in r.headers and 'etag' not in r.headers
+
+@pytest.mark.asyncio
+async def test_bootstrap_matches_the_separate_endpoints():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        r = await ac.get('/bootstrap')
+        data = r.json()
+        for key, path in (('users', '/users'), ('tasks', '/tasks'), ('skillGaps', '/skill-gaps'),
+                          ('trainingSuggestions', '/training-suggestions'), ('analytics', '/analytics')):
+            assert data[key] == (await ac.get(path)).json()
+        r2 = await ac.get('/bootstrap', headers={'If-None-Match': r.headers['etag']})
+        assert r2.status_code == 304
+
+        r = await ac.get('/bootstrap/employee/1')
+        assert r.headers['cache-control'] == 'private, no-cache'
+        mine = r.json()
+        assert mine['user']['id'] == '1'
+        assert mine['tasks'] and all(t['assignedTo'] == '1' for t in mine['tasks'])
+        assert mine['performance'] == (await ac.get('/performance/1')).json()
+        assert mine['trainingSuggestions'] == (await ac.get('/training-suggestions/1')).json()
+        assert (await ac.get('/bootstrap/employee/nobody')).status_code == 404
+
+@pytest.mark.asyncio
+async def test_metrics_are_labelled_by_route():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        await ac.get('/tasks/1')
+        await ac.get('/tasks?status=pending')
+        await ac.get('/no-such-path')
+        text = (await ac.get('/metrics')).text
+        assert 'optiwork_http_request_duration_seconds_count{route="/tasks/{task_id}",method="GET"}' in text
+        assert 'optiwork_http_requests_total{route="unmatched",method="GET",status="404"}' in text
+        assert 'optiwork_http_request_duration_quantile_seconds{route="/tasks",method="GET",quantile="0.99"}' in text
+        assert 'optiwork_store_operation_seconds_count{collection="tasks",operation="index_lookup"}' in text
+        assert 'optiwork_http_requests_in_flight 1' in text
+
+@pytest.mark.asyncio
+async def test_heatmap_filters_follow_task_changes():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        # 2031-01-06 is a Monday; user 2 works in Production on the Evening shift
+        payload = {"title": "Weld", "assignedTo": "2", "dueDate": "2031-01-06", "startTime": "15:00",
+                   "endTime": "17:00", "requiredSkills": ["skill-7"]}
+        t = (await ac.post('/tasks', json=payload)).json()
+        mine = {'team': 'production', 'shift': 'Evening', 'skill': 'TIG Welding'}
+        cell = (await ac.get('/heatmap', params=mine)).json()['cells'][15]
+        assert (cell['day'], cell['hour'], cell['status']) == ('Mon', '15:00', 'bottleneck')
+
+        await ac.patch(f"/tasks/{t['id']}", json={"status": "completed", "completedAt": "2031-01-06T16:30:00"})
+        data = (await ac.get('/heatmap', params=mine)).json()
+        assert data['cells'][15]['productivity'] == 100
+        assert data['peakHours'][0]['hour'] == '15:00'
+        other = (await ac.get('/heatmap', params={'team': 'Quality Control', 'skill': 'all'})).json()
+        assert other['cells'][15]['productivity'] < 100
+        assert (await ac.get('/heatmap', params={'team': 'team-z'})).json()['peakHours'] == []
+        await ac.delete(f"/tasks/{t['id']}")
+
+@pytest.mark.asyncio
+async def test_leaderboard_ranks_and_follows_performance():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        top = (await ac.get('/leaderboard', params={'metric': 'quality', 'limit': 3})).json()
+        assert [e['rank'] for e in top] == [1, 2, 3]
+        assert [e['score'] for e in top] == sorted((e['score'] for e in top), reverse=True)
+        last = (await ac.get(f"/leaderboard/{top[-1]['employeeId']}", params={'metric': 'quality'})).json()
+        assert last['rank'] == 3 and last['of'] >= 3
+        assert (await ac.get('/leaderboard', params={'metric': 'speed'})).status_code == 400
+        assert (await ac.get('/leaderboard/nobody')).status_code == 404
+
+@pytest.mark.asyncio
+async def test_performance_follows_task_completion():
+    async with AsyncClient(app=app, base_url='http://test') as ac:
+        await ac.post('/reset')
+        assert (await ac.get('/performance/2')).json()['tasksCompleted'] == 130
+        today = date.today().isoformat()
+        t = (await ac.post('/tasks', json={"title": "Deburr", "assignedTo": "2", "dueDate": today,
+                                           "startTime": "08:00"})).json()
+        row = (await ac.get('/performance/2')).json()
+        assert (row['tasksCompleted'], row['windows']['1d']['tasksDue']) == (130, 1)
+        await ac.patch(f"/tasks/{t['id']}", json={"status": "completed"})
+        row = (await ac.get('/performance/2')).json()
+        listed = {r['employeeId']: r for r in (await ac.get('/performance', params={'department': 'Production'})).json()}
+        assert listed['2'] == row
+        assert (row['tasksCompleted'], row['windows']['7d']['tasksCompleted']) == (131, 1)
+        assert row['windows']['1d']['completionRate'] == 100
+
+        # Baselines are server bookkeeping: no row carries one, and /sync does not send them
+        rows = [row, *listed.values(), *(await ac.get('/bootstrap')).json()['performance'],
+                (await ac.get('/bootstrap/employee/2')).json()['performance']]
+        synced = (await ac.get('/sync')).json()
+        rows += synced['performance']['upserted']
+        assert all('baseline' not in r for r in rows)
+        assert 'baselines' not in synced
+        await ac.post('/reset')
+
+
+def test_encoded_cache_evicts_the_least_recently_used():
+    cache = EncodedCache(max_entries=2)
+    cache.get('a', 1, lambda: 1)
+    cache.get('b', 1, lambda: 2)
+    cache.get('a', 1, lambda: 3)
+    cache.get('c', 1, lambda: 4)
+    assert len(cache) == 2
+    assert cache.get('a', 1, lambda: 5) == b'1'
+    assert cache.get('b', 1, lambda: 6) == b'6'
@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+
+from archive import Archiver, TaskArchive
+from reports import ReportBook
+from storage import ChangeFeed, SQLiteStorage, attach_storage
+from store import Store
+
+
+def make_store():
+    store = Store()
+    store.load(tasks=[
+        {"id": "a", "status": "completed", "dueDate": "2025-08-10", "completedAt": "2025-08-10T09:00:00"},
+        {"id": "b", "status": "completed", "dueDate": "2025-08-10", "completedAt": "2025-08-11T09:00:00"},
+        # An open task keeps its whole day hot
+        {"id": "c", "status": "completed", "dueDate": "2025-08-20", "completedAt": "2025-08-20T09:00:00"},
+        {"id": "d", "status": "pending", "dueDate": "2025-08-20"},
+        # Finished after the cutoff: still recent
+        {"id": "e", "status": "completed", "dueDate": "2025-09-02", "completedAt": "2025-10-20T09:00:00"},
+        {"id": "f", "status": "completed", "dueDate": "2025-09-03", "completedAt": "2025-09-03T09:00:00"},
+        {"id": "g", "status": "pending", "dueDate": "2025-12-01"},
+    ])
+    return store
+
+
+def test_finished_days_move_to_monthly_partitions(tmp_path):
+    store = make_store()
+    book = ReportBook(store, today=lambda: "2025-12-01")
+    archive = TaskArchive(str(tmp_path))
+    archiver = Archiver(store, archive, keep_days=60, interval=0, today=lambda: "2025-12-01")
+    assert archiver.cutoff() == "2025-10-02"
+
+    assert archiver.run() == 3
+    assert sorted(t["id"] for t in store.tasks.all()) == ["c", "d", "e", "g"]
+    assert archive.months() == ["2025-08", "2025-09"]
+    assert [t["id"] for t in archive.query()] == ["a", "b", "f"]
+    assert [t["id"] for t in archive.query("2025-09-01", "2025-09-30")] == ["f"]
+    assert archive.query("2025-08-11", "2025-08-31") == []
+    assert archive.query(equals={"id": ["b"], "status": None})[0]["completedAt"] == "2025-08-11T09:00:00"
+
+    # Reports keep counting archived tasks, and a recount does not flag them
+    assert book.report("2025-08-10")["completed"] == 2
+    assert book.check() == []
+    assert archiver.run() == 0
+
+    # A repeated append is read back once
+    archive.append([{"id": "f", "dueDate": "2025-09-03", "status": "completed", "title": "again"}])
+    assert [t.get("title") for t in archive.query("2025-09-01", "2025-09-30")] == ["again"]
+    archive.clear()
+    assert archive.months() == []
+
+
+def test_other_workers_keep_archived_tasks_in_their_reports(tmp_path):
+    path = str(tmp_path / "optiwork.db")
+    workers = []
+    for _ in range(2):
+        storage = SQLiteStorage(path, flush_interval=0, shared=True)
+        store = Store()
+        if storage.is_empty():
+            attach_storage(store, storage)
+            store.load(tasks=make_store().tasks.all())
+        else:
+            store.load(**storage.load())
+            attach_storage(store, storage)
+        workers.append((storage, store, ChangeFeed(store, storage, storage.last_seq(), poll_interval=0)))
+    (storage_a, store_a, _), (storage_b, store_b, feed_b) = workers
+    book_b = ReportBook(store_b, today=lambda: "2025-12-01")
+
+    Archiver(store_a, TaskArchive(str(tmp_path / "archive")), keep_days=60, interval=0,
+             today=lambda: "2025-12-01").run()
+    storage_a.flush()
+    assert feed_b.poll() == 3
+    assert "a" not in store_b.tasks
+    assert book_b.report("2025-08-10")["totalTasks"] == 2
+    storage_a.close()
+    storage_b.close()
+
+
+def _append_many(directory, worker):
+    archive = TaskArchive(directory)
+    for i in range(20):
+        # Incompressible notes, so each member takes several writes
+        archive.append([{"id": f"{worker}-{i}-{j}", "dueDate": "2025-08-10", "notes": os.urandom(4000).hex()}
+                        for j in range(20)])
+
+
+def test_processes_appending_at_once_leave_a_readable_partition(tmp_path):
+    processes = [multiprocessing.Process(target=_append_many, args=(str(tmp_path), w)) for w in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert len(list(TaskArchive(str(tmp_path)).read("2025-08"))) == 3 * 20 * 20
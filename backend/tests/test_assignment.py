@@ -0,0 +1,55 @@
+from assignment import BatchPlanner
+from matching import MatchEngine
+from store import Store
+
+
+def make_engine(workload_a=0):
+    store = Store()
+    store.load(
+        users=[
+            {"id": "a", "role": "employee", "shift": "Morning", "currentWorkload": workload_a,
+             "performanceScore": 100, "skills": [{"skillId": "skill-1", "level": "expert"}]},
+            {"id": "b", "role": "employee", "shift": "Morning", "currentWorkload": 0,
+             "performanceScore": 50, "skills": []},
+            {"id": "c", "role": "employee", "shift": "Night", "currentWorkload": 0,
+             "performanceScore": 100, "skills": [{"skillId": "skill-1", "level": "expert"}]},
+        ],
+        skills=[{"id": "skill-1", "name": "CNC Machining"}],
+    )
+    return MatchEngine(store)
+
+
+def task(task_id, required=(), start="09:00", end="13:00"):
+    return {"id": task_id, "requiredSkills": list(required), "startTime": start, "endTime": end,
+            "dueDate": "2025-10-20"}
+
+
+def test_scarce_specialist_goes_to_the_task_only_they_can_do():
+    planner = BatchPlanner(make_engine(), min_skill_match=100)
+    plan = planner.plan([task("generic"), task("cnc", ["skill-1"])])
+    assert {a["taskId"]: a["employeeId"] for a in plan["assignments"]} == {"cnc": "a", "generic": "b"}
+    assert plan["unassigned"] == []
+    assert plan["objective"] == sum(a["score"] for a in plan["assignments"])
+    assert plan["workload"] == {"a": 50.0, "b": 50.0}
+
+
+def test_workload_cap_overlaps_and_shift_windows_are_respected():
+    planner = BatchPlanner(make_engine(workload_a=90))
+    plan = planner.plan([
+        task("morning-1"),
+        task("morning-2", start="10:00", end="11:00"),
+        task("night", start="23:00", end="01:00"),
+    ])
+    placed = {a["taskId"]: a["employeeId"] for a in plan["assignments"]}
+    # a is near its cap, b can hold only one of the overlapping morning tasks
+    assert placed["night"] == "c"
+    assert len([t for t in ("morning-1", "morning-2") if t in placed]) == 1
+    assert [u["taskId"] for u in plan["unassigned"]] in (["morning-1"], ["morning-2"])
+
+
+def test_existing_assignments_block_their_time():
+    planner = BatchPlanner(make_engine())
+    planner.reserve([dict(task("busy"), assignedTo="b"), dict(task("busy-a"), assignedTo="a")])
+    plan = planner.plan([task("new", start="12:00", end="12:30")])
+    assert plan["assignments"] == []
+    assert plan["unassigned"][0]["taskId"] == "new"
@@ -0,0 +1,33 @@
+import sys
+import threading
+
+from auth import Credentials, hash_password
+
+
+def test_remembered_logins_survive_concurrent_verifies():
+    credentials = Credentials(cache_size=2)
+    for i in range(3):
+        credentials.set(str(i), hash_password(f"pw{i}", iterations=1))
+    errors = []
+
+    def badge_in(offset):
+        try:
+            for n in range(2000):
+                i = (n + offset) % 3
+                assert credentials.verify(str(i), f"pw{i}")
+        except Exception as exc:  # noqa: BLE001 - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=badge_in, args=(k,)) for k in range(8)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+    assert len(credentials._verified) <= 2
+    assert not credentials.verify("0", "wrong") and not credentials.verify("nobody", "pw0")
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from events import EventBus, Subscriber, attach_task_events
+from store import Store
+
+
+def make_store():
+    store = Store()
+    store.load(
+        users=[
+            {"id": "1", "department": "Production", "shift": "Morning"},
+            {"id": "2", "department": "Assembly", "shift": "Night"},
+        ],
+        tasks=[{"id": "t1", "assignedTo": "1", "status": "pending"}],
+    )
+    return store
+
+
+@pytest.mark.asyncio
+async def test_events_are_filtered_by_assignee_department_and_shift():
+    store = make_store()
+    bus = EventBus()
+    attach_task_events(store, bus)
+    production = bus.subscribe(Subscriber(department="Production"))
+    night = bus.subscribe(Subscriber(shift="Night"))
+    everyone = bus.subscribe(Subscriber())
+
+    store.tasks.update("t1", {"status": "in-progress"})
+    store.tasks.insert({"id": "t2", "assignedTo": "2", "status": "pending"})
+
+    assert [e["id"] for e in await production.next_batch(0.1)] == ["t1"]
+    assert [e["type"] for e in await night.next_batch(0.1)] == ["task.created"]
+    assert [e["id"] for e in await everyone.next_batch(0.1)] == ["t1", "t2"]
+    assert await production.next_batch(0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_coalesces_and_reports_drops():
+    store = make_store()
+    bus = EventBus()
+    attach_task_events(store, bus)
+    slow = bus.subscribe(Subscriber(max_pending=2))
+
+    for status in ("in-progress", "completed"):
+        store.tasks.update("t1", {"status": status})
+    store.tasks.insert({"id": "t2", "assignedTo": "2"})
+    store.tasks.insert({"id": "t3", "assignedTo": "2"})
+
+    batch = await slow.next_batch(0.1)
+    assert batch[0] == {"type": "overflow", "dropped": 1}
+    assert [e["id"] for e in batch[1:]] == ["t2", "t3"]
+
+
+@pytest.mark.asyncio
+async def test_publish_from_worker_thread_and_unsubscribe():
+    store = make_store()
+    bus = EventBus()
+    attach_task_events(store, bus)
+    subscriber = bus.subscribe(Subscriber(assignee="1"))
+
+    await asyncio.to_thread(store.tasks.delete, "t1")
+    batch = await subscriber.next_batch(1.0)
+    assert batch[0]["type"] == "task.deleted"
+
+    bus.unsubscribe(subscriber)
+    assert len(bus) == 0
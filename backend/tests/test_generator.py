@@ -0,0 +1,65 @@
+import json
+from collections import Counter
+
+from data.generator import DATASETS, DatasetGenerator, write_ndjson, write_sqlite
+from storage import SQLiteStorage
+from store import Store
+
+
+def test_same_seed_same_data_and_datasets_are_independent():
+    first = DatasetGenerator(users=50, tasks=400, seed=3)
+    second = DatasetGenerator(users=50, tasks=400, seed=3)
+    assert list(first.performance()) == list(second.performance())
+    assert list(first.tasks()) == list(second.tasks())
+    # Generating users first does not change the tasks
+    third = DatasetGenerator(users=50, tasks=400, seed=3)
+    list(third.users())
+    assert list(third.tasks()) == list(first.tasks())
+    assert list(DatasetGenerator(users=50, tasks=400, seed=4).tasks()) != list(first.tasks())
+
+
+def test_derived_datasets_agree_with_the_tasks():
+    generator = DatasetGenerator(users=40, tasks=2000, seed=1)
+    users = {u["id"]: u for u in generator.users()}
+    tasks = list(generator.tasks())
+    assert all(t["assignedTo"] in users for t in tasks)
+
+    completed = Counter(t["assignedTo"] for t in tasks if t["status"] == "completed")
+    for record in generator.performance():
+        assert record["tasksCompleted"] == completed[record["employeeId"]]
+        assert record["department"] == users[record["employeeId"]]["department"]
+
+    reports = {r["date"]: r for r in generator.reports()}
+    assert sum(r["totalTasks"] for r in reports.values()) == len(tasks)
+    assert sum(r["completed"] for r in reports.values()) == sum(completed.values())
+
+    heatmap = list(generator.heatmap())
+    assert len(heatmap) == 7 * 24
+    leaders = list(generator.leaderboard(5))
+    assert [r["rank"] for r in leaders] == [1, 2, 3, 4, 5]
+    assert [r["score"] for r in leaders] == sorted((r["score"] for r in leaders), reverse=True)
+
+    for evolution in generator.skill_evolution():
+        user = users[str(int(evolution["employeeId"][3:]))]
+        skill = next(s for s in user["skills"] if s["skillId"] == evolution["skillId"])
+        levels = [h["level"] for h in evolution["history"]]
+        assert levels == sorted(levels)
+        assert ["beginner", "intermediate", "advanced", "expert"][levels[-1] - 1] == skill["level"]
+
+
+def test_writers_stream_to_ndjson_and_the_app_schema(tmp_path):
+    generator = DatasetGenerator(users=20, tasks=300, seed=2)
+    counts = write_ndjson(generator, str(tmp_path / "out"))
+    assert set(counts) == set(DATASETS)
+    with open(tmp_path / "out" / "tasks.ndjson") as f:
+        assert [json.loads(line) for line in f] == list(DatasetGenerator(users=20, tasks=300, seed=2).tasks())
+
+    path = str(tmp_path / "seed.db")
+    write_sqlite(DatasetGenerator(users=20, tasks=300, seed=2), path)
+    storage = SQLiteStorage(path, flush_interval=0)
+    store = Store()
+    store.load(**storage.load())
+    storage.close()
+    assert len(store.tasks) == 300 and len(store.users) == 21
+    assert store.authenticate("EMP000001", "emp1122")[1]
+    assert store.authenticate("admin", "admin123")[1]
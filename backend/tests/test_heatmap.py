@@ -0,0 +1,105 @@
+import threading
+
+from archive import TaskArchive
+from heatmap import DONE, HOURS, STARTED, HeatmapCube, hour_spread
+from store import Store
+
+
+def make_store():
+    store = Store()
+    store.load(
+        users=[
+            {"id": "1", "role": "employee", "department": "Production", "shift": "Morning"},
+            {"id": "2", "role": "employee", "department": "Quality", "shift": "Night"},
+        ],
+        skills=[{"id": "s1", "name": "Welding"}, {"id": "s2", "name": "Assembly"}],
+        tasks=[
+            # Mondays, started at 08:00 and 22:00
+            {"id": "a", "assignedTo": "1", "status": "completed", "dueDate": "2025-10-13", "startTime": "08:00",
+             "endTime": "10:00", "completedAt": "2025-10-13T09:30:00", "requiredSkills": ["s1", "s2"]},
+            {"id": "b", "assignedTo": "1", "status": "pending", "dueDate": "2025-10-13", "startTime": "08:00",
+             "endTime": "09:00", "requiredSkills": ["s1"]},
+            {"id": "c", "assignedTo": "2", "status": "completed", "dueDate": "2025-10-20", "startTime": "22:00",
+             "endTime": "23:00", "completedAt": "2025-10-22T23:00:00", "requiredSkills": ["s2"]},
+        ],
+    )
+    return store
+
+
+def test_slices_and_roll_ups():
+    cube = HeatmapCube(make_store())
+    monday_8 = 8
+    everyone = cube.query()
+    assert everyone["cells"][monday_8]["productivity"] == 50
+    # Completions per week of data; no task is due on a Wednesday, so that counts as one week
+    assert everyone["cells"][2 * 24 + 23]["tasksCompleted"] == 1
+    assert cube.query(skill="s2")["cells"][monday_8]["productivity"] == 100
+    assert cube.query(skill="welding")["cells"][monday_8]["productivity"] == 50
+    assert cube.query(team=["quality"])["cells"][monday_8]["status"] == "idle"
+    late = cube.query(shift=["night"])["cells"][22]
+    assert (late["productivity"], late["status"]) == (0, "bottleneck")
+    # Two task hours against one Morning employee over two Mondays
+    assert cube.query(team=["Production"])["cells"][monday_8]["utilization"] == 100
+    # Task a's second hour counts where it is worked, not at its start
+    assert cube.query(team=["Production"])["cells"][monday_8 + 1]["utilization"] == 50
+    assert cube._cube[HOURS, 0, monday_8, ..., 0].sum() == 2
+    assert cube.query(skill="unknown")["peakHours"] == []
+    # Rolled up over every skill, each task counts once
+    assert cube._cube[STARTED, 0, monday_8, ..., 0].sum() == 2
+    assert cube._cube[DONE, 0, 9, ..., 0].sum() == 1
+
+
+def test_archived_tasks_count_after_a_restart(tmp_path):
+    store, archive = make_store(), TaskArchive(str(tmp_path))
+    cube = HeatmapCube(store, archive)
+    archive.append([store.tasks.get("a")])
+    with store.batch(), store.archiving():
+        store.tasks.delete("a")
+    assert cube._cube[DONE, 0, 9, ..., 0].sum() == 1
+    # A worker started now reads the archived task back instead of dropping it
+    restarted = HeatmapCube(store, archive)
+    assert restarted._cube[DONE, 0, 9, ..., 0].sum() == 1
+    assert restarted.query() == cube.query() and restarted.query(skill="s2") == cube.query(skill="s2")
+    cube.rebuild()
+    assert (cube._cube == restarted._cube).all()
+
+
+def test_hours_spread_over_the_schedule():
+    task = {"startTime": "23:30", "endTime": "01:15"}
+    assert hour_spread(6, task) == ((6, 23, 0.5), (0, 0, 1.0), (0, 1, 0.25))
+    assert hour_spread(0, {"startTime": "08:00"}) == ((0, 8, 1.0),)
+
+
+def test_changes_update_the_cube_and_only_the_filters_they_touch():
+    store = make_store()
+    cube = HeatmapCube(store)
+    production, quality = cube.query(team=["Production"]), cube.query(team=["Quality"])
+    store.tasks.update("b", {"status": "completed", "completedAt": "2025-10-13T09:00:00"})
+    assert cube.query(team=["Quality"]) is quality
+    assert cube.query(team=["Production"]) is not production
+    assert cube.query(team=["Production"])["cells"][8]["productivity"] == 100
+
+    store.tasks.insert({"id": "d", "assignedTo": "2", "status": "pending", "dueDate": "2025-10-14",
+                        "startTime": "01:00", "requiredSkills": ["s3"]})
+    store.users.update("1", {"department": "Quality"})
+    fresh = HeatmapCube(store)
+    for team in (None, ["Quality"], ["Production"]):
+        assert cube.query(team=team, skill="s3") == fresh.query(team=team, skill="s3")
+        assert cube.query(team=team) == fresh.query(team=team)
+    store.tasks.delete("a")
+    store.tasks.delete("d")
+    assert cube.query() == HeatmapCube(store).query()
+
+
+def test_queries_do_not_wait_for_the_writer_lock():
+    store = make_store()
+    cube = HeatmapCube(store)
+    with store.batch():
+        store.tasks.update("b", {"status": "completed", "completedAt": "2025-10-13T09:00:00"})
+        # Another thread reads while this batch holds the store's lock
+        results = []
+        reader = threading.Thread(target=lambda: results.append(cube.query(team=["Production"], skill="welding")))
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+        assert results[0]["cells"][8]["productivity"] == 100
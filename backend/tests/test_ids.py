@@ -0,0 +1,47 @@
+import threading
+
+from ids import EPOCH_MS, IdGenerator, id_timestamp_ms, id_worker
+
+
+def test_ids_are_time_ordered_and_decodable():
+    now = [EPOCH_MS + 5_000]
+    gen = IdGenerator(7, clock=lambda: now[0])
+    first = gen.next_id()
+    now[0] += 1
+    second = gen.next_id()
+    assert first < second and len(first) == len(second) == 19
+    assert id_timestamp_ms(first) == EPOCH_MS + 5_000
+    assert id_worker(second) == 7
+
+
+def test_clock_going_backwards_or_sequence_overflow_never_repeats():
+    now = [EPOCH_MS + 10_000]
+    gen = IdGenerator(1, clock=lambda: now[0])
+    ids = gen.next_ids(5000)
+    now[0] -= 3_000
+    ids += [gen.next_id() for _ in range(5000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    # The overflow borrowed milliseconds ahead of the (stuck) clock
+    assert id_timestamp_ms(ids[-1]) == EPOCH_MS + 10_002
+
+
+def test_concurrent_threads_and_workers_get_unique_ids():
+    generators = [IdGenerator(1), IdGenerator(2)]
+    results = [[] for _ in range(8)]
+
+    def run(i):
+        gen = generators[i % 2]
+        out = results[i]
+        for _ in range(20_000):
+            out.append(gen.next_id())
+        out.extend(gen.next_ids(20_000))
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    every = [x for out in results for x in out]
+    assert len(set(every)) == len(every) == 8 * 40_000
+    assert all(out[:20_000] == sorted(out[:20_000]) for out in results)
@@ -0,0 +1,67 @@
+import bisect
+import random
+import threading
+
+from leaderboard import Leaderboard, RankedList
+from store import Store
+
+
+def test_ranked_list_matches_a_sorted_list():
+    rng = random.Random(7)
+    initial = rng.sample(range(1000), 50)
+    ranked, expected = RankedList(initial), sorted(initial)
+    for _ in range(2000):
+        if expected and rng.random() < 0.5:
+            key = rng.choice(expected)
+            ranked.remove(key)
+            expected.remove(key)
+        else:
+            key = rng.randrange(1000)
+            if key not in expected:
+                ranked.insert(key)
+                bisect.insort(expected, key)
+    assert len(ranked) == len(expected)
+    assert list(ranked.slice(0, len(expected))) == expected
+    assert list(ranked.slice(10, 5)) == expected[10:15]
+    assert all(ranked.rank(key) == i for i, key in enumerate(expected))
+    assert ranked.rank(-1) is None
+
+
+def test_leaderboard_follows_performance_changes():
+    store = Store()
+    store.load(
+        users=[{"id": "1", "name": "Kumar", "skills": [{"skillId": "s1", "skillName": "Welding", "level": "expert"}]}],
+        performance=[
+            {"employeeId": "1", "completionRate": 90, "onTimeDeliveryRate": 90, "qualityScore": 4.5,
+             "tasksCompleted": 10, "performanceTrend": [{"tasksCompleted": 1}] * 4 + [{"tasksCompleted": 3}] * 3},
+            {"employeeId": "2", "completionRate": 80, "onTimeDeliveryRate": 95, "qualityScore": 4.5, "tasksCompleted": 20},
+            {"employeeId": "3", "completionRate": 70, "onTimeDeliveryRate": 70, "qualityScore": 3.0, "tasksCompleted": 5},
+        ],
+    )
+    board = Leaderboard(store)
+    first = board.top()[0]
+    assert (first["employeeId"], first["score"], first["trend"], first["badge"]) == ("1", 90.0, "up", "Welding Expert")
+    # Equal quality: the larger body of work ranks first
+    assert [e["employeeId"] for e in board.top("quality")] == ["2", "1", "3"]
+
+    store.performance.update("3", {"tasksCompleted": 50})
+    assert board.rank("3", "tasksCompleted")["rank"] == 1
+    store.performance.delete("2")
+    assert [e["employeeId"] for e in board.top("quality")] == ["1", "3"]
+    assert board.rank("2") is None and board.rank("3")["of"] == 2
+    assert [(e["rank"], e["employeeId"]) for e in board.top(offset=1)] == [(2, "3")]
+
+
+def test_reads_do_not_wait_for_the_writer_lock():
+    store = Store()
+    store.load(performance=[{"employeeId": str(i), "tasksCompleted": i} for i in range(5)])
+    board = Leaderboard(store)
+    with store.batch():
+        store.performance.update("0", {"tasksCompleted": 9})
+        # Another thread reads while this batch holds the store's lock
+        results = []
+        reader = threading.Thread(target=lambda: results.extend(board.top("tasksCompleted", 1)))
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+        assert results[0]["employeeId"] == "0"
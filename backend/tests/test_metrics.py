@@ -0,0 +1,33 @@
+import threading
+
+from metrics import Histogram, Registry
+
+
+def test_counts_from_every_thread_are_summed():
+    registry = Registry()
+    counter = registry.counter("hits_total", "Hits", ("route",))
+
+    def work():
+        for _ in range(10_000):
+            counter.inc(("/a",))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 'hits_total{route="/a"} 80000' in registry.render()
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 0.2, 0.4))
+    for value in (0.05, 0.1, 0.15, 0.3):
+        histogram.observe(("/a",), value)
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    quantiles = histogram.quantiles(("/a",))
+    assert quantiles[0.5] == 0.1
+    assert 0.2 < quantiles[0.99] <= 0.4
+    assert histogram.quantiles(("/b",)) == {0.5: None, 0.95: None, 0.99: None}
@@ -0,0 +1,92 @@
+from data.generator import DatasetGenerator
+from performance import PerformanceBook
+from store import Store
+
+
+def test_rows_match_the_generated_performance():
+    generator = DatasetGenerator(users=40, tasks=2000, seed=1)
+    store = Store(compact_tasks=True)
+    store.load(users=list(generator.users()), tasks=list(generator.tasks()))
+    PerformanceBook(store, today=lambda: generator.end.isoformat())
+    for expected in generator.performance():
+        record = store.performance.get(expected["employeeId"])
+        assert {field: record[field] for field in expected} == expected
+        assert record["windows"]["30d"]["tasksDue"] >= record["windows"]["7d"]["tasksDue"]
+
+
+def test_rows_follow_task_changes_and_the_date():
+    today = ["2025-10-14"]
+    store = Store()
+    store.load(
+        users=[{"id": "1", "department": "Production"}],
+        tasks=[
+            {"id": "a", "assignedTo": "1", "status": "pending", "dueDate": "2025-10-14", "startTime": "07:00",
+             "requiredSkills": ["skill-1"]},
+            {"id": "b", "assignedTo": "1", "status": "pending", "dueDate": "2025-10-15"},
+            {"id": "c", "assignedTo": "1", "status": "completed", "dueDate": "2025-09-01",
+             "startTime": "09:00", "completedAt": "2025-09-02T10:30:00", "qualityRating": 3},
+        ],
+        performance=[{"employeeId": "2", "department": "Quality", "tasksCompleted": 9}],
+    )
+    book = PerformanceBook(store, today=lambda: today[0])
+    row = book.record("1")
+    assert (row["completionRate"], row["tasksCompleted"], row["onTimeDeliveryRate"]) == (33, 1, 0)
+    assert row["windows"]["1d"]["tasksDue"] == 1 and row["windows"]["30d"]["tasksCompleted"] == 0
+
+    store.tasks.update("a", {"status": "completed", "completedAt": "2025-10-14T07:50:00", "qualityRating": 5})
+    row = book.record("1")
+    assert (row["tasksCompleted"], row["averageTaskTime"], row["qualityScore"]) == (2, 70, 4.0)
+    assert row["windows"]["1d"] == {"tasksDue": 1, "tasksCompleted": 1, "tasksOverdue": 0, "completionRate": 100,
+                                    "averageTaskTime": 50, "onTimeDeliveryRate": 100, "qualityScore": 5.0}
+    assert row["skillsUsed"] == [{"skillId": "skill-1", "count": 1}]
+    assert row["performanceTrend"][-1] == {"date": "2025-10-14", "completionRate": 100, "tasksCompleted": 1}
+
+    # Task b falls due and passes unfinished; the windows move with the date
+    today[0] = "2025-10-16"
+    row = book.record("1")
+    assert row["tasksOverdue"] == 1 and row["windows"]["7d"]["tasksOverdue"] == 1
+    assert row["windows"]["1d"]["tasksDue"] == 0
+    assert row["performanceTrend"][-1]["date"] == "2025-10-16"
+    # Recounting from scratch agrees with the incremental state
+    book.rebuild()
+    assert book.record("1") == row
+
+    # Archived tasks keep counting; a restart reads them back from the saved baseline, not the tasks
+    with store.batch(), store.archiving():
+        store.tasks.delete("c")
+    assert book.record("1")["tasksCompleted"] == 2
+    assert store.baselines.get("1")["tasksCompleted"] == 1 and "baseline" not in book.record("1")
+    restarted = Store()
+    restarted.load(users=store.users.all(), tasks=store.tasks.all(), performance=store.performance.all(),
+                   baselines=store.baselines.all())
+    assert PerformanceBook(restarted, today=lambda: today[0]).record("1") == book.record("1")
+
+    with store.batch():
+        store.tasks.delete("a")
+        store.tasks.delete("b")
+        assert store.performance.get("1")["tasksCompleted"] == 2
+    # Rows outlive the employee's live tasks
+    assert store.performance.get("1")["tasksCompleted"] == 1
+    store.tasks.insert({"id": "d", "assignedTo": "1", "status": "pending", "dueDate": "2025-10-16"})
+    assert store.performance.get("1")["windows"]["1d"]["tasksDue"] == 1
+
+
+def test_seeded_rows_are_the_baseline():
+    store = Store()
+    store.load(
+        users=[{"id": "2", "department": "Quality"}],
+        performance=[{"employeeId": "2", "department": "Quality", "completionRate": 88, "averageTaskTime": 60,
+                      "onTimeDeliveryRate": 90, "qualityScore": 4.3, "tasksCompleted": 130, "tasksOverdue": 10,
+                      "skillsUsed": [{"skillId": "skill-1", "count": 70}]}],
+    )
+    book = PerformanceBook(store, today=lambda: "2025-10-14")
+    row = book.record("2")
+    assert (row["completionRate"], row["averageTaskTime"], row["onTimeDeliveryRate"]) == (88, 60, 90)
+    assert (row["qualityScore"], row["tasksCompleted"], row["tasksOverdue"]) == (4.3, 130, 10)
+    assert row["windows"]["30d"]["tasksDue"] == 0
+
+    store.tasks.insert({"id": "a", "assignedTo": "2", "status": "completed", "dueDate": "2025-10-14",
+                        "completedAt": "2025-10-14T10:00:00", "qualityRating": 5, "requiredSkills": ["skill-1"]})
+    row = book.record("2")
+    assert (row["tasksCompleted"], row["skillsUsed"]) == (131, [{"skillId": "skill-1", "count": 71}])
+    assert row["windows"]["1d"]["tasksCompleted"] == 1
@@ -0,0 +1,87 @@
+import random
+
+from reports import ReportBook
+from store import Store
+
+
+def make_store():
+    store = Store()
+    store.load(
+        users=[
+            {"id": "1", "department": "Production", "shift": "Morning"},
+            {"id": "2", "department": "Quality", "shift": "Night"},
+        ],
+        tasks=[
+            {"id": "a", "assignedTo": "1", "status": "completed", "dueDate": "2025-10-14"},
+            {"id": "b", "assignedTo": "2", "status": "pending", "dueDate": "2025-10-14"},
+        ],
+        reports=[{"date": "2025-10-01", "totalTasks": 5, "completed": 5}],
+    )
+    return store
+
+
+def test_reports_follow_task_changes():
+    store = make_store()
+    book = ReportBook(store, today=lambda: "2025-10-15")
+    report = book.report("2025-10-14")
+    assert (report["totalTasks"], report["completed"], report["pending"], report["overdue"]) == (2, 1, 1, 1)
+    assert report["completionRate"] == 50.0
+    assert report["byDepartment"]["Quality"]["pending"] == 1
+    assert report["byShift"]["Morning"]["completed"] == 1
+
+    store.tasks.update("b", {"status": "completed"})
+    assert book.report("2025-10-14")["completionRate"] == 100.0
+    store.tasks.insert({"id": "c", "status": "in-progress", "dueDate": "2025-10-16"})
+    assert book.report("2025-10-16")["byDepartment"] == {
+        "Unassigned": {"totalTasks": 1, "completed": 0, "inProgress": 1, "pending": 0, "overdue": 0,
+                       "completionRate": 0.0}
+    }
+    store.tasks.delete("c")
+    assert book.report("2025-10-16") is None
+    # Seeded history for dates without tasks is left alone
+    assert [r["date"] for r in book.all()] == ["2025-10-14", "2025-10-01"]
+
+
+def test_overdue_rolls_over_with_the_date():
+    store = make_store()
+    today = ["2025-10-14"]
+    book = ReportBook(store, today=lambda: today[0])
+    assert book.report("2025-10-14")["overdue"] == 0
+    today[0] = "2025-10-15"
+    assert book.report("2025-10-14")["overdue"] == 1
+
+
+def test_incremental_reports_match_a_full_recount():
+    store = make_store()
+    book = ReportBook(store, today=lambda: "2025-10-15")
+    rng = random.Random(3)
+    for step in range(2000):
+        key = str(rng.randrange(200))
+        action = rng.random()
+        if action < 0.1:
+            store.tasks.delete(key)
+        elif action < 0.15:
+            store.users.update(rng.choice("12"), {"department": rng.choice(["Production", "Quality", "Assembly"])})
+        else:
+            store.tasks.insert({
+                "id": key,
+                "assignedTo": rng.choice(["1", "2", None]),
+                "status": rng.choice(["pending", "in-progress", "completed"]),
+                "dueDate": f"2025-10-{rng.randint(10, 20)}",
+            })
+    assert book.check() == []
+    store.load(users=store.users.all(), tasks=store.tasks.all())
+    assert book.check() == []
+
+
+def test_store_batch_rewrites_each_row_once():
+    store = make_store()
+    book = ReportBook(store, today=lambda: "2025-10-15")
+    writes = []
+    store.reports.subscribe(lambda collection, key, old, new: writes.append(key))
+    with store.batch():
+        for i in range(50):
+            store.tasks.insert({"id": f"n{i}", "status": "pending", "dueDate": "2025-10-14"})
+        assert book.report("2025-10-14")["totalTasks"] == 2
+    assert writes == ["2025-10-14"]
+    assert book.report("2025-10-14")["totalTasks"] == 52
@@ -0,0 +1,210 @@
+import json
+import sqlite3
+
+import pytest
+
+from app import open_store
+import storage as storage_module
+from reports import ReportBook
+from storage import ChangeFeed, MemoryStorage, SQLiteStorage, attach_storage
+from store import Store
+
+
+def fill(store):
+    store.load(
+        users=[{"id": "1", "email": "kumar@optiwork.com", "password": "secret"}],
+        tasks=[
+            {"id": "a", "assignedTo": "1", "status": "pending", "dueDate": "2025-10-14"},
+            {"id": "b", "assignedTo": "1", "status": "pending", "dueDate": "2025-10-15"},
+        ],
+    )
+    store.tasks.update("a", {"status": "completed"})
+    store.tasks.insert({"id": "c", "assignedTo": "2", "status": "pending", "dueDate": "2025-10-15"})
+    store.tasks.delete("b")
+
+
+def test_sqlite_round_trip_keeps_records_order_and_logins(tmp_path):
+    path = str(tmp_path / "optiwork.db")
+    storage = SQLiteStorage(path, flush_interval=0)
+    store = Store()
+    attach_storage(store, storage)
+    fill(store)
+    storage.close()
+
+    storage = SQLiteStorage(path, flush_interval=0)
+    assert storage.load()["users"][0]["password"].startswith("pbkdf2_sha256$")
+    reloaded = Store()
+    reloaded.load(**storage.load())
+    assert reloaded.tasks.all() == store.tasks.all()
+    assert "password" not in reloaded.users.get("1")
+    assert reloaded.authenticate("kumar@optiwork.com", "secret")[1]
+
+    db = sqlite3.connect(path)
+    assert db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert db.execute("SELECT key FROM tasks WHERE status = 'pending'").fetchall() == [("c",)]
+    storage.close()
+
+
+def test_writes_are_committed_in_batches(tmp_path):
+    path = str(tmp_path / "optiwork.db")
+    storage = SQLiteStorage(path, batch_size=3, flush_interval=0)
+    reader = sqlite3.connect(path)
+    for i in range(5):
+        storage.put("tasks", str(i), {"id": str(i)})
+    # One batch of three is committed, the rest waits for the next flush
+    assert reader.execute("SELECT COUNT(*) FROM tasks").fetchone() == (3,)
+    storage.flush()
+    assert reader.execute("SELECT COUNT(*) FROM tasks").fetchone() == (5,)
+    storage.close()
+
+
+def test_a_failed_commit_keeps_its_rows_pending(tmp_path):
+    path = str(tmp_path / "optiwork.db")
+    storage = SQLiteStorage(path, batch_size=2, flush_interval=0, busy_timeout=0)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    storage.put("tasks", "a", {"id": "a", "status": "pending"})
+    # The batch cannot commit while the other connection writes; the caller is not failed
+    storage.put("tasks", "b", {"id": "b"})
+    storage.put("tasks", "a", {"id": "a", "status": "completed"})
+    other.execute("ROLLBACK")
+    storage.flush()
+    assert [json.loads(d) for (d,) in other.execute("SELECT data FROM tasks ORDER BY key")] == [
+        {"id": "a", "status": "completed"}, {"id": "b"}
+    ]
+    storage.close()
+
+
+def test_seed_data_is_only_loaded_on_first_boot(tmp_path):
+    path = str(tmp_path / "optiwork.db")
+    storage = SQLiteStorage(path, flush_interval=0)
+    store = open_store(storage)
+    seeded = len(store.tasks)
+    store.tasks.insert({"id": "extra", "title": "Kept across restarts"})
+    storage.close()
+
+    storage = SQLiteStorage(path, flush_interval=0)
+    store = open_store(storage)
+    assert len(store.tasks) == seeded + 1
+    assert store.tasks.get("extra")["title"] == "Kept across restarts"
+    storage.close()
+
+
+def test_memory_storage_mirrors_the_store():
+    storage = MemoryStorage()
+    store = Store()
+    attach_storage(store, storage)
+    fill(store)
+    assert [t["id"] for t in storage.load()["tasks"]] == ["a", "c"]
+
+
+def open_worker(path, **options):
+    """One worker process's view of a shared database: storage, store and change feed"""
+    storage = SQLiteStorage(path, flush_interval=0, shared=True, **options)
+    since = storage.last_seq()
+    store = open_store(storage)
+    return storage, store, ChangeFeed(store, storage, since, poll_interval=0)
+
+
+def test_workers_see_each_others_writes(tmp_path):
+    path = str(tmp_path / "optiwork.db")
+    storage_a, store_a, feed_a = open_worker(path)
+    storage_b, store_b, feed_b = open_worker(path)
+    book_b = ReportBook(store_b)
+    task = store_a.tasks.all()[0]
+    before = book_b.report(task["dueDate"])["completed"]
+
+    store_a.tasks.update(task["id"], {"status": "completed", "title": "Done in A"})
+    store_a.tasks.insert({"id": "new", "title": "Created in A", "dueDate": task["dueDate"]})
+    storage_a.flush()
+    assert feed_b.poll() == 2
+    assert store_b.tasks.get(task["id"])["title"] == "Done in A"
+    assert store_b.tasks.get("new")["title"] == "Created in A"
+    assert book_b.report(task["dueDate"])["completed"] == before + (task["status"] != "completed")
+    # Replaying a change does not write it back or echo it to the other worker
+    assert feed_a.poll() == 0
+
+    # Conflicting writes settle on the later commit in both workers
+    store_a.tasks.update("new", {"title": "A"})
+    store_b.tasks.update("new", {"title": "B"})
+    storage_a.flush()
+    storage_b.flush()
+    feed_a.poll()
+    feed_b.poll()
+    assert store_a.tasks.get("new")["title"] == store_b.tasks.get("new")["title"] == "B"
+
+    store_b.tasks.delete("new")
+    storage_b.flush()
+    feed_a.poll()
+    assert store_a.tasks.get("new") is None
+    storage_a.close()
+    storage_b.close()
+
+
+def test_a_poll_that_hits_a_locked_database_is_retried(tmp_path):
+    path = str(tmp_path / "optiwork.db")
+    storage_a, store_a, _ = open_worker(path)
+    storage_b, store_b, feed_b = open_worker(path, busy_timeout=0)
+    store_a.tasks.insert({"id": "from-a", "title": "Created in A"})
+    storage_a.flush()
+    store_b.tasks.insert({"id": "from-b", "title": "Pending in B"})
+
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    with pytest.raises(sqlite3.OperationalError):
+        feed_b.poll()
+    other.execute("ROLLBACK")
+    # Nothing else commits in between; the retry still finds A's write
+    assert feed_b.poll() == 1
+    assert store_b.tasks.get("from-a")["title"] == "Created in A"
+    storage_a.close()
+    storage_b.close()
+
+
+def test_rows_rederived_for_a_new_day_are_not_written(tmp_path):
+    path = str(tmp_path / "optiwork.db")
+    storage_a, store_a, _ = open_worker(path)
+    storage_b, store_b, feed_b = open_worker(path)
+    today = ["2025-10-01"]
+    book_b = ReportBook(store_b, today=lambda: today[0])
+    store_a.tasks.insert({"id": "open", "status": "pending", "dueDate": "2025-10-05"})
+    storage_a.flush()
+    feed_b.poll()
+    seq = storage_b.last_seq()
+
+    today[0] = "2025-10-20"
+    assert book_b.report("2025-10-05")["overdue"] == 1
+    storage_b.flush()
+    # Every worker rolls the day over for itself; none of them logs the result
+    assert storage_b.last_seq() == seq
+    storage_a.close()
+    storage_b.close()
+
+
+def test_worker_behind_the_pruned_log_reloads(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_module, "CHANGE_LOG_ROWS", 2)
+    path = str(tmp_path / "optiwork.db")
+    storage_a, store_a, _ = open_worker(path)
+    storage_b, store_b, feed_b = open_worker(path)
+    for i in range(5):
+        store_a.tasks.insert({"id": f"n{i}", "title": str(i)})
+        storage_a.flush()
+    feed_b.poll()
+    assert store_b.tasks.get("n0")["title"] == "0"
+    assert store_b.tasks.all() == store_a.tasks.all()
+    storage_a.close()
+    storage_b.close()
+
+
+def test_workers_claim_distinct_ids_until_they_close(tmp_path, monkeypatch):
+    path = str(tmp_path / "optiwork.db")
+    first = SQLiteStorage(path, flush_interval=0, shared=True)
+    second = SQLiteStorage(path, flush_interval=0, shared=True)
+    assert (first.claim_worker(), second.claim_worker()) == (0, 1)
+    first.close()
+    third = SQLiteStorage(path, flush_interval=0, shared=True)
+    assert third.claim_worker() == 0
+    # A crashed worker's number is free again once its lease runs out
+    monkeypatch.setattr(storage_module.time, "time", lambda: 10 ** 10)
+    assert SQLiteStorage(path, flush_interval=0, shared=True).claim_worker() == 0
+    second.close()
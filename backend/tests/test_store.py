@@ -0,0 +1,175 @@
+import random
+import sys
+import threading
+
+from query import run_query
+from store import CHUNK_SIZE, ChunkedMap, Collection, Store
+
+
+def make_tasks():
+    tasks = Collection("id", indexes=("assignedTo", "status"))
+    tasks.load([
+        {"id": "1", "assignedTo": "1", "status": "pending"},
+        {"id": "2", "assignedTo": "1", "status": "completed"},
+        {"id": "3", "assignedTo": "2", "status": "pending"},
+    ])
+    return tasks
+
+
+def test_collection_lookups():
+    tasks = make_tasks()
+    assert tasks.get("2")["status"] == "completed"
+    assert tasks.get("missing") is None
+    assert [t["id"] for t in tasks.find("assignedTo", "1")] == ["1", "2"]
+    assert [t["id"] for t in tasks.find("status", "pending")] == ["1", "3"]
+    assert tasks.find("status", "overdue") == []
+
+
+def test_indexes_follow_update_and_delete():
+    tasks = make_tasks()
+    tasks.update("1", {"status": "completed", "assignedTo": "2"})
+    assert [t["id"] for t in tasks.find("status", "pending")] == ["3"]
+    assert [t["id"] for t in tasks.find("assignedTo", "2")] == ["3", "1"]
+
+    tasks.delete("3")
+    assert tasks.find("status", "pending") == []
+    assert [t["id"] for t in tasks.find("assignedTo", "2")] == ["1"]
+    assert len(tasks) == 2
+
+
+def test_load_copies_records_and_resets_indexes():
+    seed = [{"id": "1", "employeeId": "EMP001", "email": None}]
+    store = Store()
+    store.load(users=seed)
+    store.users.update("1", {"employeeId": "EMP999"})
+    assert seed[0]["employeeId"] == "EMP001"
+
+    store.load(users=seed)
+    assert store.users.find_one("employeeId", "EMP001")["id"] == "1"
+    assert store.users.find_one("employeeId", "EMP999") is None
+
+
+def test_change_log_versions_and_compaction():
+    store = Store(log_size=3)
+    store.load(tasks=[{"id": "1", "status": "pending"}])
+    base = store.version
+    assert store.changes_since(base) == {}
+
+    store.tasks.update("1", {"status": "completed"})
+    store.tasks.insert({"id": "2", "status": "pending"})
+    store.tasks.delete("2")
+    assert store.changes_since(base) == {"tasks": {"2": True, "1": False}}
+    assert store.tasks.version == store.version
+
+    # A fourth change pushes the oldest one out of the log
+    store.tasks.insert({"id": "3", "status": "pending"})
+    assert store.changes_since(base) is None
+    assert store.changes_since(base + 1) == {"tasks": {"3": False, "2": True}}
+
+
+def test_chunked_map_behaves_like_a_dict_across_copies():
+    rng = random.Random(7)
+    expected, chunked = {}, ChunkedMap()
+    copies = []
+    for step in range(20_000):
+        key = rng.randrange(3000)
+        if rng.random() < 0.3 and key in expected:
+            del expected[key]
+            del chunked[key]
+        else:
+            expected[key] = step
+            chunked[key] = step
+        if step % 997 == 0:
+            copies.append((dict(expected), chunked.copy()))
+    assert list(chunked.items()) == list(expected.items()) and len(chunked) == len(expected)
+    assert ChunkedMap(expected) == expected
+    # Every copy still holds what the map held when it was taken
+    for frozen, copy in copies:
+        assert list(copy.items()) == list(frozen.items())
+
+
+def test_a_write_after_a_publish_copies_chunks_not_the_collection():
+    tasks = Collection("id", indexes=("status",))
+    tasks.load({"id": str(i), "status": "pending"} for i in range(20 * CHUNK_SIZE))
+    before = tasks.snapshot()
+    tasks.update("5", {"status": "completed"})
+    after = tasks.snapshot()
+    shared = sum(a is b for a, b in zip(before._items._rows, after._items._rows))
+    assert shared == len(before._items._rows) - 1
+    assert before.get("5")["status"] == "pending" and after.get("5")["status"] == "completed"
+    assert len(before.find("status", "pending")) == len(after.find("status", "pending")) + 1
+
+
+def test_snapshots_are_unchanged_by_later_writes():
+    tasks = make_tasks()
+    before = tasks.snapshot()
+    tasks.update("1", {"status": "completed"})
+    tasks.delete("3")
+    assert [t["id"] for t in before.find("status", "pending")] == ["1", "3"]
+    assert [t["id"] for t in tasks.find("status", "pending")] == []
+
+
+def test_concurrent_patch_and_get_never_tear():
+    # Writers keep title == description while moving tasks between statuses;
+    # every page a reader sees must match its filter and that invariant
+    store = Store()
+    statuses = ["pending", "in-progress", "completed"]
+    store.load(tasks=[{"id": f"{i:04d}", "title": "v0", "description": "v0", "status": statuses[i % 3]}
+                      for i in range(2000)])
+    torn, errors = [], []
+
+    def write(seed):
+        rng = random.Random(seed)
+        for n in range(200):
+            version = f"{seed}-{n}"
+            store.tasks.update(f"{rng.randrange(2000):04d}",
+                               {"title": version, "description": version, "status": rng.choice(statuses)})
+
+    def read(seed):
+        rng = random.Random(seed)
+        for _ in range(20):
+            status = rng.choice(statuses)
+            try:
+                page, _ = run_query(store.tasks, {"status": [status]}, limit=100)
+            except Exception as exc:
+                errors.append(exc)
+                continue
+            torn.extend(t for t in page if t["status"] != status or t["title"] != t["description"])
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(100)]
+    threads += [threading.Thread(target=read, args=(i,)) for i in range(200)]
+    # Switch threads far more often than the default 5ms to force interleavings
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == [] and torn == []
+
+
+def test_compact_tasks_read_back_as_equal_independent_dicts():
+    task = {
+        "id": "t1", "title": "Audit", "assignedTo": "2", "status": "pending", "priority": "high",
+        "dueDate": "2025-10-20", "requiredSkills": ["s1", "s2"], "qualityRating": None,
+        "checklist": [{"item": "Check", "done": False}],
+        "feedback": {"supervisorFeedback": {"rating": 4}},
+    }
+    store = Store()
+    store.tasks.load([task])
+    loaded = store.tasks.get("t1")
+    assert loaded == task and list(loaded) == list(task)
+    assert loaded is not task
+
+    loaded["checklist"][0]["done"] = True
+    loaded["requiredSkills"].append("s3")
+    assert store.tasks.get("t1") == task
+
+    store.tasks.update("t1", {"status": "completed", "feedback": None, "extra": 1})
+    assert store.tasks.find("status", "pending") == []
+    updated = store.tasks.find_one("status", "completed")
+    assert updated == {**task, "status": "completed", "feedback": None, "extra": 1}
+    assert store.tasks.all() == [updated]
@@ -86,49 +86,63 @@ useEffect(() => {
   }
 }, [currentUser, appMode]);
 
-// ✅ 3. Fetch initial data with auto-refresh (ONLY ONE - not duplicate!)
+// ✅ 3. Sync data: a full snapshot first, then only what changed every 10 seconds
 useEffect(() => {
-  const fetchInitialData = async () => {
+  let syncVersion = 0;
+  let syncEpoch = '';
+
+  const mergeChanges = <T,>(prev: T[], delta: { upserted: T[]; deleted: string[] }, key: (item: T) => string): T[] => {
+    if (delta.upserted.length === 0 && delta.deleted.length === 0) return prev;
+    const deleted = new Set(delta.deleted);
+    const upserted = new Map(delta.upserted.map(item => [key(item), item]));
+    const merged = prev
+      .filter(item => !deleted.has(key(item)))
+      .map(item => {
+        const updated = upserted.get(key(item));
+        upserted.delete(key(item));
+        return updated ?? item;
+      });
+    return [...merged, ...upserted.values()];
+  };
+
+  const syncData = async () => {
     try {
-      const [
-        usersRes, 
-        tasksRes, 
-        skillsRes, 
-        reportsRes, 
-        analyticsRes, 
-        trainingRes, 
-        skillGapsRes,
-        performanceRes  // ✅ Add performance endpoint
-      ] = await Promise.all([
-        fetch(`${API_URL}/users`),
-        fetch(`${API_URL}/tasks`),
-        fetch(`${API_URL}/skills`),
-        fetch(`${API_URL}/reports`),
-        fetch(`${API_URL}/analytics`),
-        fetch(`${API_URL}/training-suggestions`),
-        fetch(`${API_URL}/skill-gaps`),
-        fetch(`${API_URL}/performance`)  // ✅ Fetch all performance data
-      ]);
-
-      setUsers(await usersRes.json());
-      setTasks(await tasksRes.json());
-      setSkills(await skillsRes.json());
-      setReports(await reportsRes.json());
-      setAnalytics(await analyticsRes.json());
-      setTrainingSuggestions(await trainingRes.json());
-      setSkillGaps(await skillGapsRes.json());
-      setPerformanceData(await performanceRes.json());  // ✅ Set performance data
+      const res = await fetch(`${API_URL}/sync?since=${syncVersion}&epoch=${syncEpoch}`);
+      const data = await res.json();
+
+      if (data.full) {
+        setUsers(data.users.upserted);
+        setTasks(data.tasks.upserted);
+        setSkills(data.skills.upserted);
+        setReports(data.reports.upserted);
+        setPerformanceData(data.performance.upserted);
+        setAnalytics(data.analytics);
+        setTrainingSuggestions(data.trainingSuggestions);
+        setSkillGaps(data.skillGaps);
+      } else {
+        setUsers(prev => mergeChanges(prev, data.users, u => u.id));
+        setTasks(prev => mergeChanges(prev, data.tasks, t => t.id));
+        setSkills(prev => mergeChanges(prev, data.skills, s => s.id));
+        setReports(prev => mergeChanges(prev, data.reports, r => r.date));
+        setPerformanceData(prev => mergeChanges(prev, data.performance, p => p.employeeId));
+        // Sent only when the data behind them changed
+        if (data.analytics) setAnalytics(data.analytics);
+        if (data.skillGaps) setSkillGaps(data.skillGaps);
+      }
+
+      syncVersion = data.version;
+      syncEpoch = data.epoch;
     } catch (err) {
-      console.error("Error fetching initial data:", err);
+      console.error("Error syncing data:", err);
       toast.error("Failed to fetch data from server");
     }
   };
 
-  fetchInitialData();
+  syncData();
   
-  // Auto-refresh every 10 seconds
+  // Poll for changes every 10 seconds
   const interval = setInterval(() => {
-    fetchInitialData();
+    syncData();
   }, 10000);
   
   return () => clearInterval(interval);
@@ -170,7 +184,7 @@ if (isInitializing) {
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({ 
         username: user.employeeId,  // ✅ Correct! Sends "EMP001"
-        password: password || user.password || "demo123"  // ✅ Use actual password
+        password: password || ""  // ✅ Verified server-side against the stored hash
       })
     });
     if (res.ok) {
@@ -518,6 +532,7 @@ if (adminView === 'reports') {
       <ReportsView
         tasks={tasks}
         employees={getEmployees()}
+        reports={reports}
         onBack={() => setAdminView('dashboard')}
       />
       <Toaster />
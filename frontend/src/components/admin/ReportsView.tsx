@@ -1,4 +1,4 @@
-import { Task, User } from '../../types';
+import { DailyReport, Task, User } from '../../types';
 import { Card, CardContent, CardHeader, CardTitle } from '../ui/card';
 import { Button } from '../ui/button';
 import { ArrowLeft, Download, TrendingUp, TrendingDown, Calendar } from 'lucide-react';
@@ -8,90 +8,33 @@ import { Badge } from '../ui/badge';
 interface ReportsViewProps {
   tasks: Task[];
   employees: User[];
+  reports: DailyReport[];
   onBack: () => void;
 }
 
-export function ReportsView({ tasks, employees, onBack }: ReportsViewProps) {
-  
-  // ✅ Calculate today's report from actual tasks
-  const todayReport = (() => {
-    const today = new Date().toISOString().split('T')[0];
-    const todayTasks = tasks.filter(task => task.dueDate === today);
-
-    const totalTasks = todayTasks.length;
-    const completed = todayTasks.filter(t => t.status === 'completed').length;
-    const inProgress = todayTasks.filter(t => t.status === 'in-progress').length;
-    const pending = todayTasks.filter(t => t.status === 'pending').length;
-    const overdue = todayTasks.filter(t => {
-      const dueDate = new Date(t.dueDate);
-      const now = new Date();
-      return t.status !== 'completed' && dueDate < now;
-    }).length;
-
-    const completionRate = totalTasks > 0 ? (completed / totalTasks) * 100 : 0;
-
-    return {
-      date: today,
-      totalTasks,
-      completed,
-      inProgress,
-      pending,
-      overdue,
-      completionRate
-    };
-  })();
-
-  // ✅ Calculate yesterday's report
-  const yesterdayReport = (() => {
-    const yesterday = new Date();
-    yesterday.setDate(yesterday.getDate() - 1);
-    const yesterdayDate = yesterday.toISOString().split('T')[0];
-    const yesterdayTasks = tasks.filter(task => task.dueDate === yesterdayDate);
-
-    const totalTasks = yesterdayTasks.length;
-    const completed = yesterdayTasks.filter(t => t.status === 'completed').length;
-    const completionRate = totalTasks > 0 ? (completed / totalTasks) * 100 : 0;
-
-    return {
-      date: yesterdayDate,
-      totalTasks,
-      completed,
-      completionRate
-    };
-  })();
-
-  // ✅ Calculate last 3 days reports
-  const reportsLast3Days = (() => {
-    const reports = [];
-    for (let i = 0; i < 3; i++) {
-      const date = new Date();
-      date.setDate(date.getDate() - i);
-      const dateStr = date.toISOString().split('T')[0];
-      const dayTasks = tasks.filter(task => task.dueDate === dateStr);
-
-      const totalTasks = dayTasks.length;
-      const completed = dayTasks.filter(t => t.status === 'completed').length;
-      const inProgress = dayTasks.filter(t => t.status === 'in-progress').length;
-      const pending = dayTasks.filter(t => t.status === 'pending').length;
-      const overdue = dayTasks.filter(t => {
-        const dueDate = new Date(t.dueDate);
-        const now = new Date();
-        return t.status !== 'completed' && dueDate < now;
-      }).length;
-      const completionRate = totalTasks > 0 ? (completed / totalTasks) * 100 : 0;
+const isoDaysAgo = (days: number) => {
+  const date = new Date();
+  date.setDate(date.getDate() - days);
+  return date.toISOString().split('T')[0];
+};
+
+export function ReportsView({ tasks, employees, reports, onBack }: ReportsViewProps) {
+
+  // ✅ Daily reports are maintained by the backend as tasks change
+  const reportsByDate = new Map(reports.map(r => [r.date, r]));
+  const reportFor = (date: string): DailyReport => reportsByDate.get(date) ?? {
+    date,
+    totalTasks: 0,
+    completed: 0,
+    inProgress: 0,
+    pending: 0,
+    overdue: 0,
+    completionRate: 0
+  };
 
-      reports.push({
-        date: dateStr,
-        totalTasks,
-        completed,
-        inProgress,
-        pending,
-        overdue,
-        completionRate
-      });
-    }
-    return reports;
-  })();
+  const todayReport = reportFor(isoDaysAgo(0));
+  const yesterdayReport = reportFor(isoDaysAgo(1));
+  const reportsLast3Days = [0, 1, 2].map(days => reportFor(isoDaysAgo(days)));
 
   const completionTrend = todayReport.completionRate - yesterdayReport.completionRate;
 
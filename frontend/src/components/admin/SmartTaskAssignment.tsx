@@ -13,6 +13,10 @@ import { Checkbox } from '../ui/checkbox';
 import { ArrowLeft, Sparkles, CheckCircle, TrendingUp, Clock, Award, Zap } from 'lucide-react';
 import { toast } from 'sonner@2.0.3';
 
+const API_URL = "http://127.0.0.1:8000";
+// Candidates requested from /tasks/match; must stay within the server's MAX_PAGE_SIZE (1000)
+const MATCH_LIMIT = 50;
+
 interface SmartTaskAssignmentProps {
   employees: User[];
   skills: Skill[];
@@ -43,6 +47,8 @@ export function SmartTaskAssignment({
 
   const [showMatches, setShowMatches] = useState(false);
   const [selectedEmployee, setSelectedEmployee] = useState<string>('');
+  // Ranked by the backend (/tasks/match); null falls back to scoring in the browser
+  const [serverMatches, setServerMatches] = useState<EmployeeMatch[] | null>(null);
 
   const calculateEmployeeMatch = (employee: User): EmployeeMatch => {
     const reasons: MatchReason[] = [];
@@ -169,19 +175,36 @@ export function SmartTaskAssignment({
 
   const getEmployeeMatches = (): EmployeeMatch[] => {
     if (!showMatches) return [];
+    if (serverMatches) return serverMatches;
     return employees
       .map(calculateEmployeeMatch)
-      .sort((a, b) => b.matchScore - a.matchScore);
+      .sort((a, b) => b.matchScore - a.matchScore)
+      .slice(0, MATCH_LIMIT);
   };
 
   const matches = getEmployeeMatches();
   const bestMatch = matches[0];
 
-  const handleFindMatches = () => {
+  const handleFindMatches = async () => {
     if (!formData.title || !formData.description) {
       toast.error('Please fill in task details first');
       return;
     }
+    try {
+      const res = await fetch(`${API_URL}/tasks/match`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          requiredSkills: formData.requiredSkills,
+          startTime: formData.startTime,
+          limit: Math.max(Math.min(employees.length, MATCH_LIMIT), 1)
+        })
+      });
+      setServerMatches(res.ok ? await res.json() : null);
+    } catch (err) {
+      console.error('Error fetching matches:', err);
+      setServerMatches(null);
+    }
     setShowMatches(true);
   };
 
@@ -428,7 +451,7 @@ export function SmartTaskAssignment({
                 {/* Other Matches */}
                 <Card>
                   <CardHeader>
-                    <CardTitle>All Candidates ({matches.length})</CardTitle>
+                    <CardTitle>Top Candidates ({matches.length})</CardTitle>
                   </CardHeader>
                   <CardContent className="space-y-3 max-h-[600px] overflow-y-auto">
                     {matches.map((match) => (
@@ -9,7 +9,7 @@ import { Briefcase, ChevronRight, AlertCircle } from 'lucide-react';
 import { ThemeToggle } from '../shared/ThemeToggle';
 
 interface EmployeeLoginProps {
-  onLogin: (user: User) => void;
+  onLogin: (user: User, password: string) => void;
   employees: User[];
 }
 
@@ -35,18 +35,13 @@ const handleSubmit = (e: React.FormEvent) => {
     return;
   }
 
-  // Check password matches
-  if (employee.password && employee.password !== password) {
-    setError('Invalid Password');
-    return;
-  }
-  
-  if (!employee.password && !password) {
+  // Passwords are verified by the server; /users no longer exposes them
+  if (!password) {
     setError('Please enter a password');
     return;
   }
   
-  onLogin(employee); 
+  onLogin(employee, password); 
 };
 
   return (